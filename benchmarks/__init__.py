@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for the Audiobook Reader application.
+Times the text, timing and synthesis hot paths on generated books, with a
+deterministic stand-in for the Kokoro model and an audio output that
+plays into nothing, so the numbers can be compared between versions on
+any machine. Run them with run_benchmarks.py.
+"""
@@ -0,0 +1,276 @@
+"""
+Stand-ins for the benchmarks: generated books, a deterministic fake of the
+Kokoro model, an audio output without a sound device and an engine that
+uses both.
+"""
+
+import os
+import time
+import zlib
+import asyncio
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.audio_output import AudioOutput
+from core.kokoro_onnx_engine import KokoroOnnxEngine
+
+SYLLABLES = ("ka", "lo", "mi", "ren", "tha", "sol", "ve", "dor", "an", "is", "que", "bri", "ton", "el", "mar",
+             "os", "ul", "pen", "dra", "cy", "fe", "gan", "hu", "ix")
+COMMON_WORDS = ("the", "and", "of", "to", "a", "in", "was", "he", "she", "it", "that", "his", "her", "with",
+                "as", "for", "had", "on", "at", "by", "not", "but", "from", "they", "were")
+
+
+def synthetic_book(words: int, seed: int = 0) -> str:
+    """
+    Generate a book of made-up prose.
+
+    Word frequencies follow a Zipf distribution and sentences and paragraphs
+    vary in length like real prose, so paging, chunking and alignment do
+    realistic work. The same arguments always give the same book.
+
+    Args:
+        words: Number of words in the book.
+        seed: Seed of the random generator.
+
+    Returns:
+        The book, with paragraphs separated by blank lines.
+    """
+    rng = np.random.RandomState(seed)
+
+    vocabulary = list(COMMON_WORDS)
+    seen = set(vocabulary)
+    while len(vocabulary) < 3000:
+        word = "".join(rng.choice(SYLLABLES, size=rng.randint(1, 4)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    tokens = [vocabulary[i] for i in rng.choice(len(vocabulary), size=words, p=weights / weights.sum())]
+
+    sentence_lengths = rng.randint(6, 25, size=words // 6 + 1)
+    paragraph_lengths = rng.randint(2, 9, size=len(sentence_lengths) + 1)
+    endings = rng.choice([".", ".", ".", "?", "!"], size=len(sentence_lengths))
+
+    paragraphs = []
+    sentences = []
+    start = 0
+    for length, ending in zip(sentence_lengths, endings):
+        if start >= words:
+            break
+        sentence = tokens[start:start + length]
+        start += length
+        sentence[0] = sentence[0].capitalize()
+        if len(sentence) > 10:
+            sentence[len(sentence) // 2] += ","
+        sentences.append(" ".join(sentence) + ending)
+        if len(sentences) >= paragraph_lengths[len(paragraphs)]:
+            paragraphs.append(" ".join(sentences))
+            sentences = []
+    if sentences:
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+class _Tokenizer:
+    """Phonemizer of the fake model; the text stands in for its phonemes."""
+
+    def phonemize(self, text: str, lang: str = "en-us") -> str:
+        return text
+
+
+class FakeKokoro:
+    """
+    Deterministic stand-in for kokoro_onnx.Kokoro.
+
+    Produces a tone per word with a short pause after it, so the audio has
+    the pauses the timing code looks for, and takes a configurable time per
+    character, spent on the executor like the real model's inference.
+    """
+
+    def __init__(self, seconds_per_char: float = 0.0001, audio_seconds_per_char: float = 0.06,
+                 sample_rate: int = 24000, segment_chars: int = 300, word_gap: float = 0.05,
+                 with_timings: bool = True):
+        """
+        Initialize the fake model.
+
+        Args:
+            seconds_per_char: Synthesis time per character of text.
+            audio_seconds_per_char: Audio produced per character of a word, at speed 1.0.
+            sample_rate: Sample rate of the audio.
+            segment_chars: Maximum characters per segment of create_stream.
+            word_gap: Silence after every word in seconds, at speed 1.0.
+            with_timings: Whether create_stream yields word timings along with the audio.
+        """
+        self.seconds_per_char = seconds_per_char
+        self.audio_seconds_per_char = audio_seconds_per_char
+        self.sample_rate = sample_rate
+        self.segment_chars = segment_chars
+        self.word_gap = word_gap
+        self.with_timings = with_timings
+        self.tokenizer = _Tokenizer()
+        self.calls = 0
+        self.characters = 0
+
+    def timings(self, text: str, speed: float = 1.0) -> List[Dict[str, Union[str, float]]]:
+        """
+        Get the word timings the fake produces for a text, without rendering it.
+
+        Args:
+            text: The text.
+            speed: The speed factor.
+
+        Returns:
+            Timings with word, start and end keys, in seconds from the start of the text.
+        """
+        timings = []
+        time_offset = 0.0
+        for word in text.split():
+            duration = len(word) * self.audio_seconds_per_char / speed
+            timings.append({"word": word, "start": time_offset, "end": time_offset + duration})
+            time_offset += duration + self.word_gap / speed
+        return timings
+
+    def _segments(self, text: str) -> Iterator[str]:
+        """Cut a text into segments at word boundaries, like the model's phoneme batches."""
+        words = text.split()
+        start = 0
+        length = 0
+        for i, word in enumerate(words):
+            if length and length + len(word) > self.segment_chars:
+                yield " ".join(words[start:i])
+                start = i
+                length = 0
+            length += len(word) + 1
+        if start < len(words):
+            yield " ".join(words[start:])
+
+    def _render(self, text: str, speed: float) -> Tuple[np.ndarray, List[Dict[str, Union[str, float]]]]:
+        """Produce the audio and word timings of one segment, taking the configured time."""
+        started_at = time.perf_counter()
+        self.calls += 1
+        self.characters += len(text)
+
+        timings = self.timings(text, speed)
+        gap = np.zeros(int(self.word_gap / speed * self.sample_rate), dtype=np.float32)
+        pieces = []
+        for timing in timings:
+            frames = int((timing["end"] - timing["start"]) * self.sample_rate)
+            frequency = 120 + zlib.crc32(timing["word"].encode("utf-8")) % 240
+            phase = np.arange(frames, dtype=np.float32) * np.float32(2 * np.pi * frequency / self.sample_rate)
+            pieces.append(0.1 * np.sin(phase))
+            pieces.append(gap)
+        samples = np.concatenate(pieces).astype(np.float32) if pieces else np.zeros(0, dtype=np.float32)
+
+        remaining = self.seconds_per_char * len(text) - (time.perf_counter() - started_at)
+        if remaining > 0:
+            time.sleep(remaining)
+        return samples, timings
+
+    async def create_stream(self, phonemes: str, voice: str = "af_sarah", speed: float = 1.0, lang: str = "en-us",
+                            is_phonemes: bool = False, trim: bool = True):
+        """Yield the audio of a text segment by segment, like Kokoro.create_stream."""
+        loop = asyncio.get_running_loop()
+        time_offset = 0.0
+        for segment in self._segments(phonemes):
+            samples, timings = await loop.run_in_executor(None, self._render, segment, speed)
+            if self.with_timings:
+                yield samples, self.sample_rate, [
+                    {"word": timing["word"], "start": timing["start"] + time_offset,
+                     "end": timing["end"] + time_offset}
+                    for timing in timings]
+            else:
+                yield samples, self.sample_rate
+            time_offset += len(samples) / self.sample_rate
+
+    def create(self, phonemes: str, voice: str = "af_sarah", speed: float = 1.0, lang: str = "en-us",
+               is_phonemes: bool = False, trim: bool = True) -> Tuple[np.ndarray, int]:
+        """Render a whole text at once, like Kokoro.create."""
+        pieces = [self._render(segment, speed)[0] for segment in self._segments(phonemes)]
+        samples = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+        return samples, self.sample_rate
+
+
+class NullAudioOutput(AudioOutput):
+    """Audio output that consumes the timeline on a thread instead of a sound device."""
+
+    def __init__(self, sample_rate: int = 24000, blocksize: int = AudioOutput.DEFAULT_BLOCKSIZE,
+                 speedup: float = 200.0):
+        """
+        Initialize the null output.
+
+        Args:
+            sample_rate: Sample rate of the audio that will be appended.
+            blocksize: Frames consumed per block.
+            speedup: How many times faster than real time the audio is consumed.
+        """
+        super().__init__(sample_rate, blocksize)
+        self.speedup = speedup
+        self.blocks_played = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def open(self, sample_rate: Optional[int] = None):
+        """Start consuming audio, at the given sample rate."""
+        if sample_rate and sample_rate != self.sample_rate:
+            self.close()
+            self.sample_rate = sample_rate
+
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="NullAudioOutput", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop consuming audio."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """Call the output callback at the pace of the sped-up device."""
+        outdata = np.zeros((self.blocksize, 1), dtype=np.float32)
+        interval = self.blocksize / self.sample_rate / self.speedup
+        next_block = time.perf_counter()
+        while not self._stop_event.is_set():
+            # Without time info the callback takes the block to be audible at once
+            self._callback(outdata, self.blocksize, None, None)
+            self.blocks_played += 1
+            next_block += interval
+            delay = next_block - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind; do not try to catch up in a burst
+                next_block = time.perf_counter()
+                time.sleep(0)
+
+
+class FakeBackendEngine(KokoroOnnxEngine):
+    """KokoroOnnxEngine running a fake model into a null audio output."""
+
+    def __init__(self, fake: FakeKokoro, temp_dir: str, speedup: float = 200.0, **kwargs):
+        """
+        Initialize the engine.
+
+        Args:
+            fake: The fake model.
+            temp_dir: Directory for the engine's caches and files.
+            speedup: How many times faster than real time the output consumes audio.
+            **kwargs: Further arguments for KokoroOnnxEngine.
+        """
+        self.fake = fake
+        super().__init__(model_path=os.path.join(temp_dir, "fake-model.onnx"), temp_dir=temp_dir, **kwargs)
+        self.audio_output = NullAudioOutput(self.SAMPLE_RATE, speedup=speedup)
+
+    def load_model(self) -> bool:
+        """Put the fake model on the synthesis loop."""
+        with self._load_lock:
+            if self.kokoro is None:
+                self.kokoro = self.synthesis_loop.load(lambda: self.fake)
+        return True
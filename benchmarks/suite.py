@@ -0,0 +1,332 @@
+"""
+The benchmarks. Text and timing benchmarks run on whole generated books;
+engine benchmarks play a fixed excerpt through the fake model, since their
+cost grows with the audio rather than with the book.
+"""
+
+import os
+import sys
+import time
+import platform
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks.fakes import FakeBackendEngine, FakeKokoro, synthetic_book
+from core.kokoro_onnx_engine import KokoroOnnxEngine
+from core.text_chunker import SentenceChunker
+from core.timing_index import WordTimingIndex
+from utils.helpers import split_text_into_chunks, split_text_into_pages
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)  # Words per generated book
+DEFAULT_REPEAT = 3
+DEFAULT_PAGE_SIZE = 5000  # Characters per page, as in the reader
+DEFAULT_TIMING_PAGES = 50  # Pages aligned per book by the direct timings benchmark
+DEFAULT_LOOKUPS = 100_000
+DEFAULT_PLAYBACK_WORDS = 2000
+DEFAULT_SEEKS = 50
+PLAYBACK_TIMEOUT = 300.0  # Seconds a playback benchmark may take before it is abandoned
+
+
+def measure(fn: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> Tuple[Dict[str, float], Any]:
+    """
+    Time a function.
+
+    Args:
+        fn: The function, called without arguments.
+        repeat: Number of runs.
+
+    Returns:
+        Tuple of ({"best", "mean", "repeat"} in seconds, result of the last run).
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started_at)
+    return {"best": min(times), "mean": sum(times) / len(times), "repeat": repeat}, result
+
+
+def bench_pages(book: str, page_size: int = DEFAULT_PAGE_SIZE, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Time paging a book the way the reader does."""
+    stats, pages = measure(lambda: split_text_into_pages(book, page_size), repeat)
+    return {**stats, "pages": len(pages)}
+
+
+def bench_chunkers(book: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Time the sentence chunker used for synthesis and the paragraph chunker of utils.helpers."""
+    sentence_stats, chunks = measure(lambda: SentenceChunker().chunk(book), repeat)
+    paragraph_stats, paragraphs = measure(lambda: split_text_into_chunks(book), repeat)
+    return {
+        "sentence_chunker": {**sentence_stats, "chunks": len(chunks)},
+        "split_text_into_chunks": {**paragraph_stats, "chunks": len(paragraphs)},
+    }
+
+
+def bench_direct_timings(engine: KokoroOnnxEngine, fake: FakeKokoro, pages: Sequence[str],
+                         repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Time turning the model's word timings into aligned timings, page by page."""
+    timings = [fake.timings(page) for page in pages]
+    words = sum(len(page_timings) for page_timings in timings)
+
+    def run():
+        for page, page_timings in zip(pages, timings):
+            engine._process_direct_timings(page_timings, page)
+
+    stats, _ = measure(run, repeat)
+    return {**stats, "pages": len(pages), "words": words,
+            "words_per_second": words / stats["best"] if stats["best"] else 0.0}
+
+
+def bench_highlight_lookup(fake: FakeKokoro, pages: Sequence[str], lookups: int = DEFAULT_LOOKUPS,
+                           seed: int = 0) -> Dict[str, Any]:
+    """
+    Time building the word timing index of a book and looking up the word playing at a time.
+
+    The lookup does what the highlight timer does on every tick: find the
+    word by time and read its entry.
+    """
+    def build() -> WordTimingIndex:
+        index = WordTimingIndex()
+        time_offset = 0.0
+        for page_number, page in enumerate(pages):
+            page_timings = fake.timings(page)
+            for timing in page_timings:
+                timing["start"] += time_offset
+                timing["end"] += time_offset
+            index.append(page_timings, page_number)
+            if page_timings:
+                time_offset = page_timings[-1]["end"]
+        return index
+
+    build_stats, index = measure(build, 1)
+    duration = index[len(index) - 1]["end"] if len(index) else 0.0
+    times = np.random.RandomState(seed).uniform(0.0, duration, size=lookups)
+
+    def look_up():
+        for seconds in times:
+            word_index = index.index_at_time(seconds)
+            index[word_index]
+
+    lookup_stats, _ = measure(look_up, 1)
+    return {
+        "build": {**build_stats, "words": len(index)},
+        "lookup": {**lookup_stats, "lookups": lookups,
+                   "microseconds_per_lookup": lookup_stats["best"] / lookups * 1e6 if lookups else 0.0},
+    }
+
+
+def _play(engine: FakeBackendEngine, text: str, timeout: float = PLAYBACK_TIMEOUT) -> Dict[str, Any]:
+    """Play a text progressively to the end and report the pipeline metrics."""
+    engine.metrics.reset()
+    output = engine.audio_output
+
+    started_at = time.perf_counter()
+    _, playback_thread = engine.synthesize_and_play_progressively(text, "af_sarah", 1.0)
+    playback_thread.join(timeout)
+    wall = time.perf_counter() - started_at
+    finished = output.is_finished
+
+    snapshot = engine.metrics.snapshot()
+    audio_seconds = output.total_frames / output.sample_rate
+    engine.stop()
+    series = snapshot["series"]
+    return {
+        "finished": finished,
+        "wall_seconds": wall,
+        "audio_seconds": audio_seconds,
+        "chunks": len(engine.chunk_start_times),
+        "time_to_first_audio": series.get("time_to_first_audio", {}).get("p50"),
+        "synthesis_latency": series.get("synthesis_latency", {}),
+        "real_time_factor": series.get("real_time_factor", {}),
+        "underruns": snapshot["counters"].get("underruns", 0),
+        "cache_hit_rate": snapshot["cache_hit_rate"],
+    }
+
+
+def _seek(engine: FakeBackendEngine, text: str, seeks: int, seed: int = 0,
+          timeout: float = PLAYBACK_TIMEOUT) -> Dict[str, Any]:
+    """Seek around in a playing text and time how long until the target is played."""
+    output = engine.audio_output
+    engine.synthesize_and_play_progressively(text, "af_sarah", 1.0)
+
+    # Seek within audio the output already holds, like dragging the slider back
+    deadline = time.perf_counter() + timeout
+    while engine.is_playback_active() and output.total_frames < 10 * output.sample_rate:
+        if time.perf_counter() > deadline:
+            break
+        time.sleep(0.01)
+
+    rng = np.random.RandomState(seed)
+    call_times = []
+    audible_times = []
+    for _ in range(seeks):
+        if not engine.is_playback_active():
+            break
+        target = int(rng.uniform(0, max(1, output.total_frames - output.blocksize)))
+        blocks_before = output.blocks_played
+
+        started_at = time.perf_counter()
+        engine.seek(target / output.sample_rate)
+        call_times.append(time.perf_counter() - started_at)
+
+        while ((output.blocks_played == blocks_before or output.position_frames() < target) and
+               time.perf_counter() - started_at < 1.0):
+            time.sleep(0)
+        audible_times.append(time.perf_counter() - started_at)
+
+    engine.stop()
+    if not call_times:
+        return {"skipped": "playback ended before the first seek"}
+    return {
+        "seeks": len(call_times),
+        "call_microseconds": float(np.median(call_times) * 1e6),
+        "to_audio_milliseconds": float(np.median(audible_times) * 1e3),
+        "to_audio_milliseconds_max": float(np.max(audible_times) * 1e3),
+    }
+
+
+def bench_engine(text: str, fake_settings: Optional[Dict[str, Any]] = None, speedup: float = 200.0,
+                 seeks: int = DEFAULT_SEEKS) -> Dict[str, Any]:
+    """
+    Time full progressive playback of a text, cold and from the cache, and seeking in it.
+
+    Args:
+        text: The text to play.
+        fake_settings: Keyword arguments for FakeKokoro.
+        speedup: How many times faster than real time the null output plays.
+        seeks: Number of seeks.
+
+    Returns:
+        Dictionary with playback_cold, playback_cached and seek results.
+    """
+    fake = FakeKokoro(**(fake_settings or {}))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = FakeBackendEngine(fake, temp_dir, speedup)
+        try:
+            cold = _play(engine, text)
+            # Cache entries are written in the background
+            engine.io_executor.submit(lambda: None).result()
+            cached = _play(engine, text)
+            seek = _seek(engine, text, seeks)
+        finally:
+            engine.stop_all_tasks()
+            engine.synthesis_loop.stop()
+            engine.io_executor.shutdown()
+            engine.phoneme_cache.close()
+    return {"playback_cold": cold, "playback_cached": cached, "seek": seek,
+            "model_calls": fake.calls, "model_characters": fake.characters}
+
+
+def bench_book(words: int, repeat: int = DEFAULT_REPEAT, page_size: int = DEFAULT_PAGE_SIZE,
+               timing_pages: int = DEFAULT_TIMING_PAGES, lookups: int = DEFAULT_LOOKUPS,
+               seed: int = 0) -> Dict[str, Any]:
+    """
+    Run the text and timing benchmarks on a generated book.
+
+    Args:
+        words: Number of words in the book.
+        repeat: Runs per benchmark.
+        page_size: Characters per page.
+        timing_pages: Pages aligned by the direct timings benchmark.
+        lookups: Highlight lookups.
+        seed: Seed of the book generator.
+
+    Returns:
+        Dictionary with one entry per benchmark.
+    """
+    generate_stats, book = measure(lambda: synthetic_book(words, seed), 1)
+    pages = split_text_into_pages(book, page_size)
+    fake = FakeKokoro()
+
+    results = {
+        "characters": len(book),
+        "generate": generate_stats,
+        "split_text_into_pages": bench_pages(book, page_size, repeat),
+        "chunkers": bench_chunkers(book, repeat),
+        "highlight_lookup": bench_highlight_lookup(fake, pages, lookups, seed),
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = FakeBackendEngine(fake, temp_dir)
+        try:
+            results["process_direct_timings"] = bench_direct_timings(engine, fake, pages[:timing_pages], repeat)
+        finally:
+            engine.io_executor.shutdown()
+            engine.phoneme_cache.close()
+    return results
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = DEFAULT_REPEAT,
+              playback_words: int = DEFAULT_PLAYBACK_WORDS, speedup: float = 200.0, seeks: int = DEFAULT_SEEKS,
+              fake_settings: Optional[Dict[str, Any]] = None, engine: bool = True, label: Optional[str] = None,
+              progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Run every benchmark.
+
+    Args:
+        sizes: Words per generated book.
+        repeat: Runs per text benchmark.
+        playback_words: Words of the excerpt played by the engine benchmarks.
+        speedup: How many times faster than real time the null output plays.
+        seeks: Number of seeks.
+        fake_settings: Keyword arguments for FakeKokoro.
+        engine: Whether to run the engine benchmarks.
+        label: Name of the version being measured, e.g. a git tag.
+        progress: Optional function called with the name of each benchmark as it starts.
+
+    Returns:
+        The results, ready to be written as JSON.
+    """
+    results: Dict[str, Any] = {
+        "label": label,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {"sizes": list(sizes), "repeat": repeat, "playback_words": playback_words, "speedup": speedup,
+                   "seeks": seeks, "fake": fake_settings or {}},
+        "books": {},
+    }
+    for words in sizes:
+        if progress:
+            progress(f"book of {words} words")
+        results["books"][str(words)] = bench_book(words, repeat)
+
+    if engine:
+        if progress:
+            progress(f"progressive playback of {playback_words} words")
+        results["engine"] = bench_engine(synthetic_book(playback_words, seed=1), fake_settings, speedup, seeks)
+    return results
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """
+    Find the timings that got slower between two runs.
+
+    Compares the best time of every benchmark present in both runs.
+
+    Args:
+        old: Results of the earlier run.
+        new: Results of the later run.
+        tolerance: Slowdown ignored as noise, as a fraction.
+
+    Returns:
+        One line per regression, e.g. "books.10000.chunkers.sentence_chunker: 1.52x slower".
+    """
+    regressions = []
+
+    def walk(old_node: Any, new_node: Any, path: str):
+        if not isinstance(old_node, dict) or not isinstance(new_node, dict):
+            return
+        if "best" in old_node and "best" in new_node:
+            if old_node["best"] > 0 and new_node["best"] > old_node["best"] * (1 + tolerance):
+                regressions.append(f"{path}: {new_node['best'] / old_node['best']:.2f}x slower")
+            return
+        for key in old_node:
+            if key in new_node:
+                walk(old_node[key], new_node[key], f"{path}.{key}" if path else key)
+
+    walk(old, new, "")
+    return regressions
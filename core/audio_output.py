@@ -0,0 +1,589 @@
+"""
+Audio output module for the Audiobook Reader application.
+Plays a growing timeline of audio chunks through one persistent output
+stream, so chunk transitions are gapless and pausing stops at the exact
+sample where playback left off. The playback rate can be changed while
+playing; the audio is then time-stretched block by block in the callback.
+"""
+
+import time
+import bisect
+import threading
+import warnings
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.time_stretch import StreamingTimeStretcher
+
+# Try to import sounddevice, but handle import errors gracefully
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError) as e:
+    warnings.warn(f"Failed to import sounddevice: {str(e)}. Audio output will not be available.")
+    SOUNDDEVICE_AVAILABLE = False
+
+
+_RELEASED = np.zeros(0, dtype=np.float32)  # Stands in for the samples of released chunks
+
+
+class AudioOutput:
+    """Callback-driven output stream playing a timeline of appended chunks."""
+
+    DEFAULT_BLOCKSIZE = 1024  # Frames per callback, about 43 ms at 24 kHz
+    DEFAULT_LATENCY = "low"
+
+    def __init__(self, sample_rate: int = 24000, blocksize: int = DEFAULT_BLOCKSIZE,
+                 latency: Union[str, float] = DEFAULT_LATENCY, device: Optional[Union[int, str]] = None):
+        """
+        Initialize the audio output.
+
+        Args:
+            sample_rate: Sample rate of the audio that will be appended.
+            blocksize: Frames the device asks for per callback. Smaller blocks react
+                       faster to pause and seek, larger ones are more robust.
+            latency: Device latency, either "low", "high" or a value in seconds.
+            device: Output device, or None for the system default.
+        """
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.latency = latency
+        self.device = device
+
+        self._stream = None
+        self._lock = threading.Lock()
+
+        # The timeline: every chunk appended since the last clear(), kept so seeks can go back
+        self._chunks: List[np.ndarray] = []
+        self._chunk_starts: List[int] = []  # Timeline frame at which each chunk starts
+        self._total_frames = 0
+        self._released_chunks = 0  # Leading chunks whose samples were dropped, see release_chunks()
+        self._chunk_index = 0  # Chunk under the play cursor
+        self._chunk_offset = 0  # Frame within that chunk
+        self._pending_seek: Optional[int] = None  # Seek target past the appended audio
+
+        # Playback clock, replaced as a whole by the callback so readers need no lock:
+        # (timeline frame of the block, monotonic time it becomes audible, frames in the block, running, rate)
+        self._clock = (0, 0.0, 0, False, 1.0)
+
+        # Playback rate; anything but 1.0 goes through the streaming time-stretcher
+        self._rate = 1.0
+        self._stretcher = StreamingTimeStretcher()
+        self._stretch_pos: Optional[float] = None  # Timeline frame of the next hop, None to restart
+        self._stretch_hop: Optional[Tuple[float, np.ndarray]] = None  # (timeline frame, samples) being played
+        self._stretch_hop_offset = 0
+
+        self._paused = False
+        self._complete = False  # No more chunks will be appended
+        self._finished = threading.Event()
+
+        self.underruns = 0
+
+        # Seconds from the last clear() until the old audio stopped being audible
+        self.stop_latency: Optional[float] = None
+        self._cleared_at: Optional[float] = None
+
+    def open(self, sample_rate: Optional[int] = None):
+        """
+        Open and start the output stream if it is not running yet.
+
+        Args:
+            sample_rate: Sample rate to play at. Reopens the stream if it differs
+                         from the current one.
+
+        Raises:
+            RuntimeError: If sounddevice is not available.
+        """
+        if not SOUNDDEVICE_AVAILABLE:
+            raise RuntimeError("Cannot open audio output: sounddevice is not available")
+
+        if sample_rate and sample_rate != self.sample_rate:
+            self.close()
+            self.sample_rate = sample_rate
+
+        if self._stream is not None:
+            return
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.blocksize,
+            latency=self.latency,
+            device=self.device,
+            channels=1,
+            dtype="float32",
+            callback=self._callback
+        )
+        self._stream.start()
+
+    def close(self):
+        """Stop and close the output stream."""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except Exception as e:
+            warnings.warn(f"Error closing audio output: {str(e)}")
+        self._stream = None
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info, status):
+        """Fill the next block of the output stream from the timeline."""
+        out = outdata[:, 0]
+        now = time.monotonic()
+
+        # How long until this block reaches the speaker
+        try:
+            delay = max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+        except AttributeError:
+            delay = 0.0
+
+        with self._lock:
+            block_start = self._cursor_frame_locked()
+
+            # The first block after clear() replaces the old audio once it reaches the speaker
+            if self._cleared_at is not None:
+                self.stop_latency = now + delay - self._cleared_at
+                self._cleared_at = None
+
+            if self._paused:
+                out.fill(0)
+                self._clock = (block_start, now + delay, 0, False, self._rate)
+                return
+
+            if self._rate != 1.0:
+                written = self._fill_stretched_locked(out, frames)
+            else:
+                written = 0
+                while written < frames and self._chunk_index < len(self._chunks):
+                    chunk = self._chunks[self._chunk_index]
+                    count = min(frames - written, len(chunk) - self._chunk_offset)
+                    out[written:written + count] = chunk[self._chunk_offset:self._chunk_offset + count]
+                    written += count
+                    self._chunk_offset += count
+
+                    # Move straight on to the next chunk within the same block
+                    if self._chunk_offset >= len(chunk):
+                        self._chunk_index += 1
+                        self._chunk_offset = 0
+
+            self._clock = (block_start, now + delay, written, written > 0, self._rate)
+
+            if written < frames:
+                out[written:].fill(0)
+                if self._complete:
+                    self._finished.set()
+                elif self._chunks:
+                    # Playing, but synthesis has not delivered the next chunk yet
+                    self.underruns += 1
+
+    def _fill_stretched_locked(self, out: np.ndarray, frames: int) -> int:
+        """
+        Fill a block with time-stretched audio. Must be called with the lock held.
+
+        Moves the play cursor to the timeline frame played last, so pausing,
+        seeking and the clock keep working in timeline frames.
+
+        Returns:
+            Number of frames written.
+        """
+        written = 0
+        while written < frames:
+            if self._stretch_hop is None and not self._produce_hop_locked():
+                break
+
+            hop_start, samples = self._stretch_hop
+            count = min(frames - written, len(samples) - self._stretch_hop_offset)
+            out[written:written + count] = samples[self._stretch_hop_offset:self._stretch_hop_offset + count]
+            written += count
+            self._stretch_hop_offset += count
+            self._move_cursor_locked(int(hop_start + self._stretch_hop_offset * self._rate))
+
+            if self._stretch_hop_offset >= len(samples):
+                self._stretch_hop = None
+                self._stretch_hop_offset = 0
+
+        return written
+
+    def _produce_hop_locked(self) -> bool:
+        """
+        Stretch the next hop of the timeline. Must be called with the lock held.
+
+        Returns:
+            True if a hop was produced, False if the timeline is used up or
+            synthesis has not delivered the audio the hop needs yet.
+        """
+        stretcher = self._stretcher
+        step = stretcher.hop_length * self._rate
+
+        if self._stretch_pos is None:
+            # Restart the vocoder a few hops early, so the first hop played has its full overlap
+            stretcher.reset()
+            start = self._cursor_frame_locked()
+            position = start - 3 * step
+            for _ in range(3):
+                stretcher.hop(self._read_source_locked(int(round(position)), stretcher.input_length))
+                position += step
+            self._stretch_pos = position
+
+        position = self._stretch_pos
+        if self._complete and position >= self._total_frames:
+            return False
+        if not self._complete and position + stretcher.input_length > self._total_frames:
+            # The window reaches past the appended audio; wait for synthesis
+            return False
+
+        samples = stretcher.hop(self._read_source_locked(int(round(position)), stretcher.input_length))
+        self._stretch_hop = (position, samples)
+        self._stretch_hop_offset = 0
+        self._stretch_pos = position + step
+        return True
+
+    def _read_source_locked(self, start: int, count: int) -> np.ndarray:
+        """Copy frames of the timeline, zero outside it. Must be called with the lock held."""
+        out = np.zeros(count, dtype=np.float32)
+        position = max(start, self._first_kept_frame_locked())
+        end = min(start + count, self._total_frames)
+        index = bisect.bisect_right(self._chunk_starts, position) - 1
+        while position < end:
+            chunk = self._chunks[index]
+            chunk_start = self._chunk_starts[index]
+            take = min(end, chunk_start + len(chunk)) - position
+            out[position - start:position - start + take] = chunk[position - chunk_start:position - chunk_start + take]
+            position += take
+            index += 1
+        return out
+
+    def _first_kept_frame_locked(self) -> int:
+        """Timeline frame of the first chunk that still has its samples. Must be called with the lock held."""
+        if self._released_chunks < len(self._chunk_starts):
+            return self._chunk_starts[self._released_chunks]
+        return self._total_frames
+
+    def _move_cursor_locked(self, frame: int):
+        """Point the play cursor at a timeline frame. Must be called with the lock held."""
+        frame = max(frame, self._first_kept_frame_locked())
+        if frame < self._total_frames:
+            self._chunk_index = bisect.bisect_right(self._chunk_starts, frame) - 1
+            self._chunk_offset = frame - self._chunk_starts[self._chunk_index]
+        else:
+            self._chunk_index = len(self._chunks)
+            self._chunk_offset = 0
+
+    def _restart_stretch_locked(self):
+        """Drop the stretched audio not played yet. Must be called with the lock held."""
+        self._stretch_pos = None
+        self._stretch_hop = None
+        self._stretch_hop_offset = 0
+
+    def set_rate(self, rate: float):
+        """
+        Change the playback rate without changing the pitch.
+
+        Takes effect with the next block the device asks for, and costs no
+        synthesis: the audio already in the timeline is time-stretched as
+        it is played. Positions stay in timeline frames.
+
+        Args:
+            rate: Speed factor; 2.0 plays twice as fast, 0.5 half as fast.
+        """
+        if rate <= 0:
+            raise ValueError(f"Playback rate must be positive, got {rate}")
+        with self._lock:
+            if abs(rate - 1.0) < 1e-3:
+                rate = 1.0
+            if rate != self._rate:
+                self._rate = rate
+                self._restart_stretch_locked()
+
+    @property
+    def rate(self) -> float:
+        """The playback rate."""
+        return self._rate
+
+    def append(self, samples: np.ndarray) -> int:
+        """
+        Add a chunk to the end of the timeline.
+
+        Args:
+            samples: Mono audio samples at the output sample rate.
+
+        Returns:
+            Index of the chunk in the timeline.
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1)
+        with self._lock:
+            self._chunks.append(samples)
+            self._chunk_starts.append(self._total_frames)
+            self._total_frames += len(samples)
+            self._finished.clear()
+
+            # A seek ahead of synthesis lands as soon as its audio arrives
+            if self._pending_seek is not None and self._pending_seek < self._total_frames:
+                self._seek_locked(self._pending_seek)
+            return len(self._chunks) - 1
+
+    def replace_chunk(self, chunk_index: int, samples: np.ndarray, cursor_offset: Optional[int] = None):
+        """
+        Swap a chunk of the timeline for a new version, e.g. after its text was edited.
+
+        The chunks after it move by the change in length; a play cursor in a
+        later chunk stays on the same sample of that chunk.
+
+        Args:
+            chunk_index: Index of the chunk in the timeline.
+            samples: The new samples of the chunk.
+            cursor_offset: Frame of the new chunk to continue from if the play
+                           cursor is in this chunk. If None, the cursor keeps its
+                           offset, clamped to the new length.
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if chunk_index < self._released_chunks:
+                raise ValueError(f"Chunk {chunk_index} has been released")
+            shift = len(samples) - len(self._chunks[chunk_index])
+            chunk_end = self._chunk_starts[chunk_index] + len(self._chunks[chunk_index])
+
+            self._chunks[chunk_index] = samples
+            for index in range(chunk_index + 1, len(self._chunk_starts)):
+                self._chunk_starts[index] += shift
+            self._total_frames += shift
+
+            if self._pending_seek is not None:
+                if self._pending_seek >= chunk_end:
+                    self._pending_seek += shift
+            elif self._chunk_index == chunk_index:
+                offset = self._chunk_offset if cursor_offset is None else cursor_offset
+                self._chunk_offset = min(max(0, offset), len(samples))
+
+            self._restart_stretch_locked()
+            self._clock = (self._cursor_frame_locked(), time.monotonic(), 0, False, self._rate)
+
+    def release_chunks(self, count: int):
+        """
+        Drop the samples of the first chunks of the timeline to free their memory.
+
+        The chunks keep their index and place on the timeline, so positions
+        and chunk start frames stay valid; seeking into them lands on the
+        first chunk that is still kept instead.
+
+        Args:
+            count: Number of leading chunks to release.
+        """
+        with self._lock:
+            count = min(count, len(self._chunks))
+            for index in range(self._released_chunks, count):
+                self._chunks[index] = _RELEASED
+            if count > self._released_chunks:
+                self._released_chunks = count
+                if self._pending_seek is None and self._cursor_frame_locked() < self._first_kept_frame_locked():
+                    self._move_cursor_locked(self._first_kept_frame_locked())
+                    self._restart_stretch_locked()
+
+    @property
+    def released_chunks(self) -> int:
+        """Number of leading chunks whose samples were released."""
+        return self._released_chunks
+
+    def mark_complete(self):
+        """Signal that no more chunks will be appended."""
+        with self._lock:
+            self._complete = True
+            if self._chunk_index >= len(self._chunks):
+                self._finished.set()
+
+    def clear(self):
+        """Drop the timeline and start over. The stream keeps running, playing silence."""
+        with self._lock:
+            self._chunks = []
+            self._chunk_starts = []
+            self._total_frames = 0
+            self._released_chunks = 0
+            self._chunk_index = 0
+            self._chunk_offset = 0
+            self._pending_seek = None
+            self._paused = False
+            self._complete = False
+            self._finished.clear()
+            self._restart_stretch_locked()
+            self._clock = (0, 0.0, 0, False, self._rate)
+            if self._stream is not None:
+                self._cleared_at = time.monotonic()
+
+    def pause(self):
+        """Pause playback. The cursor stays on the next unplayed sample."""
+        with self._lock:
+            self._paused = True
+
+    def resume(self):
+        """Resume playback from the sample where it was paused."""
+        with self._lock:
+            self._paused = False
+
+    @property
+    def seek_pending(self) -> bool:
+        """Whether the play cursor waits for audio that has not been appended yet."""
+        return self._pending_seek is not None
+
+    @property
+    def paused(self) -> bool:
+        """Whether playback is paused."""
+        return self._paused
+
+    def seek(self, frame: int):
+        """
+        Move the play cursor to a frame of the timeline.
+
+        Finds the chunk holding the frame by binary search over the chunk
+        start table, so the cost does not grow with the length of the page
+        and nothing is re-queued. A frame past the appended audio is held
+        until synthesis delivers it; playback outputs silence meanwhile.
+
+        Args:
+            frame: Frame index into the timeline.
+        """
+        with self._lock:
+            self._seek_locked(max(0, int(frame)))
+
+    def _seek_locked(self, frame: int):
+        """Move the play cursor to a timeline frame. Must be called with the lock held."""
+        frame = max(frame, self._first_kept_frame_locked())
+        self._move_cursor_locked(frame)
+        if frame < self._total_frames:
+            self._pending_seek = None
+            self._finished.clear()
+        else:
+            self._pending_seek = frame
+        self._restart_stretch_locked()
+        self._clock = (frame, time.monotonic(), 0, False, self._rate)
+
+    def seek_to_chunk(self, chunk_index: int, frame_offset: int = 0):
+        """
+        Move the play cursor to a frame of a chunk.
+
+        The chunk does not have to be appended yet; playback outputs silence
+        until it arrives.
+
+        Args:
+            chunk_index: Index of the chunk in the timeline.
+            frame_offset: Frame within the chunk.
+        """
+        with self._lock:
+            chunk_index = max(0, chunk_index)
+            frame_offset = max(0, frame_offset)
+            if chunk_index < len(self._chunks):
+                frame_offset = min(frame_offset, len(self._chunks[chunk_index]))
+                self._seek_locked(self._chunk_starts[chunk_index] + frame_offset)
+            else:
+                self._chunk_index = chunk_index
+                self._chunk_offset = frame_offset
+                self._pending_seek = None
+                self._restart_stretch_locked()
+                self._clock = (self._cursor_frame_locked(), time.monotonic(), 0, False, self._rate)
+
+    def cursor(self) -> Tuple[int, int]:
+        """
+        Get the play cursor.
+
+        Returns:
+            Tuple of (chunk_index, frame_offset) of the next frame to be played.
+        """
+        with self._lock:
+            return self._chunk_index, self._chunk_offset
+
+    def _cursor_frame_locked(self) -> int:
+        """Timeline frame of the play cursor. Must be called with the lock held."""
+        if self._pending_seek is not None:
+            return self._pending_seek
+        if self._chunk_index < len(self._chunk_starts):
+            return self._chunk_starts[self._chunk_index] + self._chunk_offset
+        # Past the last appended chunk, e.g. after seeking ahead of synthesis
+        return self._total_frames
+
+    def position_frames(self) -> int:
+        """
+        Get the timeline frame that is audible right now.
+
+        The clock advances only with frames the device has consumed, and
+        accounts for the device latency reported to the callback. It is
+        cheap and safe to call from any thread. At rates other than 1.0 it
+        advances by rate timeline frames per output frame.
+
+        Returns:
+            Frame index into the timeline.
+        """
+        block_start, audible_at, block_frames, running, rate = self._clock
+        if not running:
+            return block_start
+
+        elapsed = int((time.monotonic() - audible_at) * self.sample_rate)
+        # Before the block is audible the previous one is still playing
+        return max(0, block_start + int(min(elapsed, block_frames) * rate))
+
+    def position(self) -> float:
+        """
+        Get the playback position on the timeline in seconds.
+
+        Returns:
+            Seconds from the start of the first chunk.
+        """
+        return self.position_frames() / self.sample_rate
+
+    def chunk_start_frame(self, chunk_index: int) -> int:
+        """Get the timeline frame at which a chunk starts."""
+        return self._chunk_starts[chunk_index]
+
+    def chunk_at_frame(self, frame: int) -> int:
+        """
+        Find the chunk containing a timeline frame.
+
+        Args:
+            frame: Frame index into the timeline.
+
+        Returns:
+            Index of the chunk, or -1 if the timeline is empty.
+        """
+        return bisect.bisect_right(self._chunk_starts, frame) - 1
+
+    @property
+    def total_frames(self) -> int:
+        """Number of frames in the timeline."""
+        return self._total_frames
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks in the timeline."""
+        return len(self._chunks)
+
+    def chunk_samples(self, chunk_index: int) -> np.ndarray:
+        """Get the samples of a chunk in the timeline; empty for a released chunk."""
+        return self._chunks[chunk_index]
+
+    def chunk_length(self, chunk_index: int) -> int:
+        """Get the number of frames of a chunk in the timeline, also of a released one."""
+        with self._lock:
+            if chunk_index + 1 < len(self._chunk_starts):
+                return self._chunk_starts[chunk_index + 1] - self._chunk_starts[chunk_index]
+            return self._total_frames - self._chunk_starts[chunk_index]
+
+    def buffered_frames(self) -> int:
+        """Number of frames in the timeline that have not been played yet."""
+        with self._lock:
+            return max(0, self._total_frames - self._cursor_frame_locked())
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the whole timeline has been played and no more chunks will come."""
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the whole timeline has been played.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            True if playback finished, False on timeout.
+        """
+        return self._finished.wait(timeout)
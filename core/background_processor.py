@@ -3,13 +3,14 @@ Background processor for pre-processing upcoming pages.
 """
 
 import os
-import time
 import threading
 import queue
 from typing import Dict, List, Callable, Any, Optional
 
 import tempfile
 
+from core.cancellation import CancellationToken
+
 
 class BackgroundProcessor:
     """
@@ -39,9 +40,12 @@ class BackgroundProcessor:
         # Results cache
         self.results_cache = {}
         
+        # Cancelled by cancel_all(); tasks added without a token of their own share it
+        self.token = CancellationToken()
+
         # Worker thread
         self.worker_thread = None
-        self.stop_requested = False
+        self._stop_token = CancellationToken()
         
         # Start the worker thread
         self.start_worker()
@@ -49,29 +53,61 @@ class BackgroundProcessor:
     def start_worker(self):
         """Start the worker thread."""
         if self.worker_thread is None or not self.worker_thread.is_alive():
-            self.stop_requested = False
-            self.worker_thread = threading.Thread(target=self._worker_loop)
+            self._stop_token = CancellationToken()
+            self.worker_thread = threading.Thread(target=self._worker_loop, args=(self._stop_token,))
             self.worker_thread.daemon = True
             self.worker_thread.start()
     
     def stop_worker(self):
         """Stop the worker thread."""
-        self.stop_requested = True
+        self._stop_token.cancel("stop")
+        self.cancel_all("stop")
         if self.worker_thread and self.worker_thread.is_alive():
             self.worker_thread.join(timeout=1.0)
-    
-    def _worker_loop(self):
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether the worker has been asked to stop."""
+        return self._stop_token.is_cancelled
+
+    def cancel_all(self, reason: str = "cancelled"):
+        """
+        Cancel every queued and running task.
+
+        Queued tasks are dropped without running. A running task stops at
+        its next check of its token, and its result is neither cached nor
+        passed to its callback. Tasks added afterwards run normally.
+
+        Args:
+            reason: Why the tasks were cancelled, for log messages.
+        """
+        token, self.token = self.token, CancellationToken()
+        token.cancel(reason)
+
+    def _worker_loop(self, stop_token: CancellationToken):
         """Worker thread loop."""
-        while not self.stop_requested:
+        while not stop_token.is_cancelled:
             try:
                 # Get the next task from the queue with a timeout
-                priority, task_id, processor_func, args, kwargs, callback = self.task_queue.get(timeout=0.5)
-                
+                priority, task_id, processor_func, args, kwargs, callback, token = self.task_queue.get(timeout=0.5)
+
+                # Stale tasks are dropped without running
+                if token.is_cancelled:
+                    print(f"Dropping cancelled task {task_id} ({token.reason})")
+                    self.task_queue.task_done()
+                    continue
+
                 # Process the task
                 try:
                     print(f"Processing task {task_id} with priority {priority}")
                     result = processor_func(*args, **kwargs)
-                    
+
+                    # A task cancelled while it ran has a stale result
+                    if token.is_cancelled:
+                        print(f"Discarding result of cancelled task {task_id} ({token.reason})")
+                        self.task_queue.task_done()
+                        continue
+
                     # Cache the result
                     self.results_cache[task_id] = result
                     
@@ -86,31 +122,53 @@ class BackgroundProcessor:
                 self.task_queue.task_done()
                 
             except queue.Empty:
-                # No tasks in the queue, sleep a bit
-                time.sleep(0.1)
-    
-    def add_task(self, task_id: str, processor_func: Callable, priority: int = 0, 
-                 callback: Optional[Callable] = None, *args, **kwargs):
+                # No tasks in the queue; get() has already waited
+                continue
+
+    def new_token(self) -> CancellationToken:
+        """
+        Create a token for a task, cancelled by cancel_all() or on its own.
+
+        Pass it to add_task() and, if the processor function can stop early,
+        to the function as well.
+
+        Returns:
+            A new cancellation token.
+        """
+        return self.token.child()
+
+    def add_task(self, task_id: str, processor_func: Callable, priority: int = 0,
+                 callback: Optional[Callable] = None, *args, token: Optional[CancellationToken] = None,
+                 **kwargs) -> CancellationToken:
         """
         Add a task to the processing queue.
         
         Args:
             task_id: Unique identifier for the task.
             processor_func: Function to process the task.
-            priority: Priority of the task (lower values = higher priority).
+            priority: Priority of the task (lower values = higher priority), such as a
+                      core.scheduler.Priority class.
             callback: Function to call when the task is complete.
             *args: Arguments to pass to the processor function.
+            token: Cancellation token of the task, from new_token(). If None, the
+                   task is only cancelled by cancel_all().
             **kwargs: Keyword arguments to pass to the processor function.
+
+        Returns:
+            The cancellation token of the task.
         """
+        token = token or self.token
+
         # Check if the task is already in the cache
         if task_id in self.results_cache:
             # Task already processed, call the callback immediately
             if callback:
                 callback(task_id, self.results_cache[task_id])
-            return
+            return token
         
         # Add the task to the queue
-        self.task_queue.put((priority, task_id, processor_func, args, kwargs, callback))
+        self.task_queue.put((priority, task_id, processor_func, args, kwargs, callback, token))
+        return token
     
     def get_result(self, task_id: str) -> Any:
         """
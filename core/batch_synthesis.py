@@ -0,0 +1,204 @@
+"""
+Batch synthesis module for the Audiobook Reader application.
+Packs many short texts into one model call and splits the audio back per
+text at the token boundaries the model reports, so offline and background
+rendering spend their time in inference instead of per-call overhead.
+"""
+
+import time
+import warnings
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 24000  # Kokoro's sample rate
+
+# ONNX tensor types of the model inputs and the numpy types to build them with
+_NUMPY_TYPES = {
+    "tensor(float)": np.float32,
+    "tensor(double)": np.float64,
+    "tensor(int32)": np.int32,
+    "tensor(int64)": np.int64,
+}
+
+
+def plan_batches(lengths: Sequence[int], max_tokens: int, separator_tokens: int = 1) -> List[List[int]]:
+    """
+    Group texts into batches of at most max_tokens tokens.
+
+    Texts are bucketed by length: the longest are placed first and each goes
+    into the first batch with room left, so short texts end up together and
+    long ones run alone. A text longer than max_tokens gets a batch of its own.
+
+    Args:
+        lengths: Token count of each text.
+        max_tokens: Token budget of one model call.
+        separator_tokens: Tokens inserted between two texts in a batch.
+
+    Returns:
+        List of batches, each a list of text indices in ascending order.
+    """
+    batches: List[List[int]] = []
+    used: List[int] = []
+
+    for index in sorted(range(len(lengths)), key=lambda i: (-lengths[i], i)):
+        length = lengths[index]
+        for batch_index, batch in enumerate(batches):
+            if used[batch_index] + separator_tokens + length <= max_tokens:
+                batch.append(index)
+                used[batch_index] += separator_tokens + length
+                break
+        else:
+            batches.append([index])
+            used.append(length)
+
+    # Keep reading order inside a call, so neighbouring texts give each other natural prosody
+    return [sorted(batch) for batch in batches]
+
+
+def split_points(boundaries: Sequence[Tuple[int, int]], edges: np.ndarray, total_samples: int) -> List[Tuple[int, int]]:
+    """
+    Find the sample range of each text in the audio of a packed call.
+
+    Args:
+        boundaries: (first_token, end_token) of each text in the packed token list.
+        edges: Sample offset of every token boundary, the leading pad included,
+               so token i spans edges[i + 1] to edges[i + 2].
+        total_samples: Number of samples in the audio.
+
+    Returns:
+        List of (start_sample, end_sample), one per text.
+    """
+    ranges = []
+    start = 0
+    for position, (_, end_token) in enumerate(boundaries):
+        if position + 1 < len(boundaries):
+            # Cut in the middle of the separator between this text and the next
+            separator = end_token
+            end = int((edges[separator + 1] + edges[separator + 2]) // 2)
+        else:
+            end = total_samples
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+class BatchSynthesizer:
+    """Synthesizes lists of texts with as few model calls as possible."""
+
+    DEFAULT_MAX_TOKENS = 400  # Below the model's 510 token limit, leaving room for the pads
+
+    def __init__(self, kokoro, phonemizer: Optional[Callable[[str], str]] = None,
+                 max_tokens: int = DEFAULT_MAX_TOKENS, lang: str = "en-us"):
+        """
+        Initialize the batch synthesizer.
+
+        Args:
+            kokoro: The Kokoro model.
+            phonemizer: Callable converting text to phonemes, for example one
+                        going through a phoneme cache. If None, uses the model's.
+            max_tokens: Token budget of one model call.
+            lang: The phonemizer language.
+        """
+        self.kokoro = kokoro
+        self.phonemizer = phonemizer or (lambda text: kokoro.tokenizer.phonemize(text, lang))
+        self.max_tokens = max_tokens
+        self.lang = lang
+
+        session = kokoro.sess
+        self._input_types = {i.name: _NUMPY_TYPES.get(i.type, np.float32) for i in session.get_inputs()}
+        self._tokens_input = "input_ids" if "input_ids" in self._input_types else "tokens"
+        # Splitting a packed call needs the per-token durations
+        self.can_pack = "duration" in {o.name for o in session.get_outputs()}
+        space = kokoro.tokenizer.vocab.get(" ")
+        self._separator = [space] if space is not None else []
+
+        # Statistics
+        self.calls = 0
+        self.audio_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def _run(self, tokens: List[int], style: np.ndarray, speed: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the model once on a token list, returning audio and per-token durations."""
+        speed_type = self._input_types.get("speed", np.float32)
+        if np.issubdtype(speed_type, np.integer):
+            speed = max(1, round(speed))
+
+        inputs = {
+            self._tokens_input: np.array([[0, *tokens, 0]], dtype=self._input_types[self._tokens_input]),
+            "style": np.asarray(style, dtype=self._input_types.get("style", np.float32)).reshape(1, -1),
+            "speed": np.array([speed], dtype=speed_type),
+        }
+        audio, duration = self.kokoro.sess.run(None, inputs)[:2]
+        self.calls += 1
+        return np.asarray(audio, dtype=np.float32).ravel(), np.asarray(duration).ravel()
+
+    def _synthesize_single(self, phonemes: str, voice: str, speed: float) -> np.ndarray:
+        """Synthesize one text on its own through the model's regular path."""
+        samples, _ = self.kokoro.create(phonemes, voice=voice, speed=speed, lang=self.lang, is_phonemes=True)
+        self.calls += 1
+        return np.asarray(samples, dtype=np.float32)
+
+    def _synthesize_packed(self, token_lists: List[List[int]], voice: str, speed: float) -> List[np.ndarray]:
+        """Synthesize several texts in one model call and split the audio per text."""
+        tokens: List[int] = []
+        boundaries = []
+        for position, text_tokens in enumerate(token_lists):
+            if position:
+                tokens.extend(self._separator)
+            boundaries.append((len(tokens), len(tokens) + len(text_tokens)))
+            tokens.extend(text_tokens)
+
+        voice_style = self.kokoro.get_voice_style(voice)
+        # The voice holds one style vector per sequence length
+        style = voice_style[min(len(tokens), len(voice_style)) - 1]
+        audio, duration = self._run(tokens, style, speed)
+
+        frames = np.concatenate(([0], np.cumsum(duration)))
+        edges = np.round(frames * (len(audio) / frames[-1])).astype(np.int64)
+        return [audio[start:end] for start, end in split_points(boundaries, edges, len(audio))]
+
+    def synthesize(self, texts: Sequence[str], voice: str = "af_sarah", speed: float = 1.0) -> List[Tuple[np.ndarray, int]]:
+        """
+        Synthesize a list of texts.
+
+        Args:
+            texts: The texts to synthesize.
+            voice: The voice to use.
+            speed: The speed factor.
+
+        Returns:
+            List of (samples, sample_rate), one per text, in the order of texts.
+        """
+        start_time = time.perf_counter()
+
+        phonemes = [self.phonemizer(text) for text in texts]
+        token_lists = [self.kokoro.tokenizer.tokenize(p, limit=None) for p in phonemes]
+        lengths = [len(tokens) for tokens in token_lists]
+
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        separator_tokens = len(self._separator) if self.can_pack else self.max_tokens + 1
+
+        for batch in plan_batches(lengths, self.max_tokens, separator_tokens):
+            if len(batch) > 1:
+                try:
+                    for index, samples in zip(batch, self._synthesize_packed([token_lists[i] for i in batch], voice, speed)):
+                        results[index] = samples
+                    continue
+                except Exception as e:
+                    warnings.warn(f"Packed synthesis failed: {str(e)}. Synthesizing the texts one by one.")
+
+            for index in batch:
+                if lengths[index] == 0:
+                    results[index] = np.zeros(0, dtype=np.float32)
+                else:
+                    results[index] = self._synthesize_single(phonemes[index], voice, speed)
+
+        self.audio_seconds += sum(len(samples) for samples in results) / SAMPLE_RATE
+        self.wall_seconds += time.perf_counter() - start_time
+        return [(samples, SAMPLE_RATE) for samples in results]
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio synthesized per second of wall time."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
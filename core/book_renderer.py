@@ -0,0 +1,279 @@
+"""
+Book renderer module for the Audiobook Reader application.
+Pre-renders a whole book by spreading its chunks over several worker
+processes, each holding its own ONNX Runtime session, and merges the
+results in reading order into the synthesis cache or an audio file.
+"""
+
+import os
+import re
+import time
+import warnings
+import multiprocessing
+import concurrent.futures
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from core.batch_synthesis import BatchSynthesizer
+from core.onnx_session import KOKORO_AVAILABLE, create_kokoro
+from core.synthesis_cache import SynthesisCache
+from core.text_chunker import SentenceChunker
+from core.time_stretch import time_stretch
+from core.timing_estimator import estimate_word_timings_from_audio
+from utils.helpers import split_text_into_pages
+
+SAMPLE_RATE = 24000  # Kokoro's sample rate
+OFFLINE_NICENESS = 10  # Worker processes yield the CPU to playback in the reader
+
+
+# Model of the current worker process, created once by the pool initializer
+_worker_kokoro = None
+_worker_batcher = None
+
+
+def _init_worker(model_path: str, voices_path: str, intra_op_threads: int, optimized_model_dir: Optional[str],
+                 batch: bool = False):
+    """Load the model in a freshly started worker process."""
+    global _worker_kokoro, _worker_batcher
+    # Offline rendering is the least urgent work; the OS scheduler runs it when playback does not need the CPU
+    if hasattr(os, "nice"):
+        try:
+            os.nice(OFFLINE_NICENESS)
+        except OSError as e:
+            print(f"Could not lower the priority of the render worker: {str(e)}")
+    # Parallelism comes from the worker processes, not from running operators side by side
+    _worker_kokoro = create_kokoro(model_path, voices_path, {
+        "intra_op_threads": intra_op_threads,
+        "inter_op_threads": 1,
+        "execution_mode": "sequential"
+    }, optimized_model_dir)
+    _worker_batcher = BatchSynthesizer(_worker_kokoro) if batch else None
+
+
+def _render_job(texts: List[str], voice: str, speed: float) -> List[Tuple[np.ndarray, int, List[Dict[str, Union[str, float]]]]]:
+    """
+    Synthesize a range of chunks in a worker process.
+
+    Args:
+        texts: The chunk texts, in reading order.
+        voice: The voice to use.
+        speed: The speed factor.
+
+    Returns:
+        List of (samples, sample_rate, word_timings) tuples, one per chunk.
+    """
+    if _worker_batcher is not None:
+        audio = _worker_batcher.synthesize(texts, voice, speed)
+    else:
+        audio = [_worker_kokoro.create(text, voice=voice, speed=speed, lang="en-us") for text in texts]
+
+    results = []
+    for text, (samples, sample_rate) in zip(texts, audio):
+        samples = np.asarray(samples, dtype=np.float32)
+        results.append((samples, sample_rate, estimate_word_timings_from_audio(text, samples, sample_rate)))
+    return results
+
+
+class RenderStats:
+    """Throughput figures of a render run."""
+
+    def __init__(self, workers: int, intra_op_threads: int):
+        """
+        Initialize the render statistics.
+
+        Args:
+            workers: Number of worker processes.
+            intra_op_threads: Intra-op threads per worker.
+        """
+        self.workers = workers
+        self.intra_op_threads = intra_op_threads
+        self.chunks = 0
+        self.cached_chunks = 0
+        self.audio_seconds = 0.0  # Audio synthesized during this run
+        self.wall_seconds = 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio synthesized per second of wall time."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        """Get a one-line description of the run."""
+        return (f"Rendered {self.chunks} chunks ({self.cached_chunks} already cached), "
+                f"{self.audio_seconds:.1f}s of audio in {self.wall_seconds:.1f}s "
+                f"with {self.workers} workers x {self.intra_op_threads} threads: "
+                f"{self.realtime_factor:.2f} audio-sec/wall-sec")
+
+
+class BookRenderer:
+    """Renders the chunks of a whole book on a pool of worker processes."""
+
+    def __init__(self, model_path: str, voices_path: str, workers: Optional[int] = None,
+                 intra_op_threads: int = 1, page_size: int = 5000, chunks_per_job: int = 4,
+                 chunker: Optional[SentenceChunker] = None, optimized_model_dir: Optional[str] = None,
+                 batch: bool = False, time_stretch_speed: bool = True):
+        """
+        Initialize the book renderer.
+
+        Args:
+            model_path: Path to the Kokoro model file.
+            voices_path: Path to the voices file.
+            workers: Number of worker processes. If None, fills the CPU cores
+                     given intra_op_threads per worker.
+            intra_op_threads: ONNX Runtime intra-op threads per worker.
+            page_size: Characters per page, matching the reader's paging so the
+                       rendered chunks are the ones playback asks the cache for.
+            chunks_per_job: Number of consecutive chunks sent to a worker at once.
+            chunker: Chunker used to split pages. If None, uses the reader's default.
+            optimized_model_dir: Directory for the optimized model graph shared with
+                                 the reader. If None, every worker optimizes the graph.
+            batch: Whether workers pack the short chunks of a job into shared model
+                   calls. Raises throughput at the cost of a slightly different
+                   prosody where chunks meet.
+            time_stretch_speed: Whether speed is applied by time-stretching, as in the
+                                reader's engine. Chunks are then rendered and cached at
+                                normal speed, which is what playback asks the cache for
+                                at any speed.
+        """
+        self.model_path = model_path
+        self.voices_path = voices_path
+        self.intra_op_threads = max(1, intra_op_threads)
+        self.workers = workers or max(1, (os.cpu_count() or 1) // self.intra_op_threads)
+        self.page_size = page_size
+        self.chunks_per_job = max(1, chunks_per_job)
+        self.chunker = chunker or SentenceChunker()
+        self.optimized_model_dir = optimized_model_dir
+        self.batch = batch
+        self.time_stretch_speed = time_stretch_speed
+
+    def synthesis_speed(self, speed: float) -> float:
+        """
+        Get the speed chunks are rendered and cached at for a requested speed.
+
+        Args:
+            speed: The requested speed factor.
+
+        Returns:
+            1.0 when speed is applied by time-stretching, otherwise speed.
+        """
+        return 1.0 if self.time_stretch_speed else speed
+
+    def plan(self, text: str, speed: float = 1.0) -> List[str]:
+        """
+        Split a book into the chunks playback will request, in reading order.
+
+        Args:
+            text: The full book text.
+            speed: The speed factor.
+
+        Returns:
+            List of chunk texts.
+        """
+        chunks = []
+        for page in split_text_into_pages(text, self.page_size):
+            chunks.extend(span.text for span in self.chunker.chunk(page, speed))
+        return chunks
+
+    def render(self, text: str, voice: str = "af_sarah", speed: float = 1.0,
+               cache: Optional[SynthesisCache] = None, output_path: Optional[str] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> RenderStats:
+        """
+        Render a book.
+
+        Chunks already in the cache are not synthesized again. Results are
+        merged in reading order, so the output file plays the book front to back.
+        With time_stretch_speed, chunks are rendered at normal speed and only
+        the output file is stretched to the requested speed.
+
+        Args:
+            text: The full book text.
+            voice: The voice to use.
+            speed: The speed factor.
+            cache: Synthesis cache to store rendered chunks in.
+            output_path: Optional audio file to write the whole book to.
+            progress_callback: Optional callback receiving (done_chunks, total_chunks).
+
+        Returns:
+            RenderStats describing the run.
+
+        Raises:
+            RuntimeError: If kokoro_onnx is not available.
+        """
+        if not KOKORO_AVAILABLE:
+            raise RuntimeError("Cannot render: kokoro_onnx is not available")
+        if cache is None and output_path is None:
+            raise ValueError("Nothing to render into: pass a cache and/or an output path")
+
+        stats = RenderStats(self.workers, self.intra_op_threads)
+        start_time = time.perf_counter()
+
+        # Chunked, synthesized and keyed at the speed playback asks the cache for
+        output_rate = speed
+        speed = self.synthesis_speed(speed)
+        output_rate /= speed
+        texts = self.plan(text, speed)
+        stats.chunks = len(texts)
+
+        # Group the chunks that still need synthesis into jobs of consecutive chunks
+        pending = [i for i, chunk in enumerate(texts)
+                   if cache is None or cache.make_key(chunk, voice, speed) not in cache]
+        stats.cached_chunks = len(texts) - len(pending)
+        jobs = [pending[i:i + self.chunks_per_job] for i in range(0, len(pending), self.chunks_per_job)]
+        print(f"Rendering {len(pending)} of {len(texts)} chunks in {len(jobs)} jobs on {self.workers} workers")
+
+        output_file = None
+        if output_path:
+            output_file = sf.SoundFile(output_path, mode="w", samplerate=SAMPLE_RATE, channels=1)
+
+        # Spawn rather than fork: forking after ONNX Runtime has started its threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.model_path, self.voices_path, self.intra_op_threads, self.optimized_model_dir,
+                          self.batch)
+            ) as executor:
+                futures = {job[0]: (job, executor.submit(_render_job, [texts[i] for i in job], voice, speed))
+                           for job in jobs}
+
+                rendered = {}
+                for index, chunk in enumerate(texts):
+                    # Collect the job holding this chunk; later jobs keep running meanwhile
+                    if index in futures:
+                        job, future = futures.pop(index)
+                        for job_index, result in zip(job, future.result()):
+                            rendered[job_index] = result
+                            samples, sample_rate, word_timings = result
+                            stats.audio_seconds += len(samples) / sample_rate
+                            if cache is not None:
+                                cache.put(texts[job_index], voice, speed, samples, sample_rate, word_timings)
+
+                    if index in rendered:
+                        samples, sample_rate, _ = rendered.pop(index)
+                    elif output_file is not None:
+                        cached = cache.get(chunk, voice, speed)
+                        if cached is None:
+                            warnings.warn(f"Chunk {index} vanished from the cache, it is missing from the output")
+                            continue
+                        samples, sample_rate, _ = cached
+                    else:
+                        samples = None
+
+                    if output_file is not None and samples is not None:
+                        if output_rate != 1.0:
+                            samples = time_stretch(samples, output_rate)
+                        output_file.write(samples)
+
+                    if progress_callback:
+                        progress_callback(index + 1, len(texts))
+        finally:
+            if output_file is not None:
+                output_file.close()
+
+        stats.wall_seconds = time.perf_counter() - start_time
+        print(stats.summary())
+        return stats
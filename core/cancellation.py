@@ -0,0 +1,128 @@
+"""
+Cancellation module for the Audiobook Reader application.
+A cancellation token belongs to one request, such as playing a text or
+pre-rendering a page. Every thread working on the request holds the same
+token, so cancelling it stops all of them at their next segment boundary,
+and work for a newer request never sees the flag of an older one.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class OperationCancelled(Exception):
+    """Raised by work that notices its token has been cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe, one-way cancellation flag shared by the work of one request."""
+
+    def __init__(self, parent: Optional["CancellationToken"] = None):
+        """
+        Initialize the token.
+
+        Args:
+            parent: Optional token whose cancellation also cancels this one.
+        """
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None  # time.perf_counter() of the cancellation
+
+        if parent is not None:
+            parent.add_callback(lambda: self.cancel(parent.reason))
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """
+        Cancel the token and run its callbacks.
+
+        Args:
+            reason: Why the request was cancelled, for log messages.
+
+        Returns:
+            True if this call cancelled the token, False if it already was.
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self.cancelled_at = time.perf_counter()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        # Outside the lock, so a callback may use the token
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancellation callback: {str(e)}")
+        return True
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether the token has been cancelled."""
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until the token is cancelled or the timeout passes.
+
+        Use instead of time.sleep() in polling loops, so cancelling wakes
+        them at once.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            True if the token is cancelled.
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        """
+        Raise if the token has been cancelled.
+
+        Raises:
+            OperationCancelled: If the token has been cancelled.
+        """
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+
+    def add_callback(self, callback: Callable[[], None]):
+        """
+        Run a function when the token is cancelled, or now if it already is.
+
+        Callbacks run on the thread that cancels the token and must not block.
+
+        Args:
+            callback: Function without arguments.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        """
+        Forget a callback that is no longer needed.
+
+        Args:
+            callback: A function passed to add_callback().
+        """
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def child(self) -> "CancellationToken":
+        """Create a token that is cancelled together with this one, but can also be cancelled alone."""
+        return CancellationToken(self)
+
+    def elapsed(self) -> Optional[float]:
+        """Seconds since the token was cancelled, or None if it has not been."""
+        cancelled_at = self.cancelled_at
+        return None if cancelled_at is None else time.perf_counter() - cancelled_at
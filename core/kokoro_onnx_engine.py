@@ -4,18 +4,32 @@ Uses the Kokoro ONNX model for speech synthesis with timing information.
 """
 
 import os
+import bisect
 import tempfile
 import warnings
 import threading
-import asyncio
-import queue
 import time
-from typing import Dict, List, Tuple, Union, Optional, Generator, Any
+import concurrent.futures
+from typing import Callable, Dict, List, Tuple, Union, Optional, Generator, Any
 
 import numpy as np
 import soundfile as sf
-import sounddevice as sd
 
+from core.audio_output import AudioOutput, SOUNDDEVICE_AVAILABLE
+from core.batch_synthesis import BatchSynthesizer
+from core.cancellation import CancellationToken, OperationCancelled
+from core.onnx_session import SESSION_KEYS, create_kokoro, normalize_session_settings
+from core.phoneme_cache import PhonemeCache
+from core.reorder_buffer import ReorderBuffer
+from core.scheduler import Priority
+from core.synthesis_cache import SynthesisCache
+from core.synthesis_loop import SynthesisLoop
+from core.telemetry import PipelineMetrics, get_logger
+from core.text_aligner import align_word_timings
+from core.text_chunker import SentenceChunker, TextSpan
+from core.text_edits import TextEdit, diff_sentences, map_positions, narrow_edit
+from core.timing_estimator import estimate_word_timings_from_audio, find_pauses
+from core.timing_index import WordTimingIndex
 # Try to import kokoro_onnx, but handle import errors gracefully
 try:
     from kokoro_onnx import Kokoro
@@ -24,14 +38,34 @@ except ImportError as e:
     warnings.warn(f"Failed to import kokoro_onnx: {str(e)}. TTS functionality will be limited.")
     KOKORO_AVAILABLE = False
 
+# Only direct playback uses sounddevice here; AudioOutput warns if it is missing
+if SOUNDDEVICE_AVAILABLE:
+    import sounddevice as sd
+
+logger = get_logger(__name__)
+
 
 class KokoroOnnxEngine:
     """Interface for the Kokoro ONNX TTS engine."""
 
     # Constants
     SAMPLE_RATE = 24000  # Kokoro's sample rate
-
-    def __init__(self, model_path: Optional[str] = None, voices_path: Optional[str] = None, temp_dir: Optional[str] = None):
+    PLAYBACK_BUFFER_SECONDS = 30.0  # Audio handed to the output ahead of the play cursor
+    URGENT_AHEAD_SECONDS = 10.0  # Below this much audio ready ahead of the listener, the next chunk is urgent
+    PRERENDER_CHUNKS_PER_CALL = 4  # Chunks per batch job, so foreground synthesis can slip in between
+    RESTART_LATENCY_WARNING = 1.5  # Seconds from replacing a playing text to queuing the new one before warning
+    CONTINUOUS_LOOKAHEAD_SECONDS = 20.0  # Seconds before the end of a text at which synthesis of the next one starts
+    REWIND_SECONDS = 60.0  # Audio of texts played to the end kept this long for rewinding, then released
+
+    def __init__(self, model_path: Optional[str] = None, voices_path: Optional[str] = None, temp_dir: Optional[str] = None,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = SynthesisCache.DEFAULT_MAX_BYTES,
+                 write_chunk_files: bool = False, output_blocksize: int = AudioOutput.DEFAULT_BLOCKSIZE,
+                 output_latency: Union[str, float] = AudioOutput.DEFAULT_LATENCY,
+                 session_settings: Optional[Dict[str, Any]] = None, optimized_model_dir: Optional[str] = None,
+                 phoneme_db_path: Optional[str] = None, time_stretch_speed: bool = True,
+                 synthesis_ahead_seconds: float = ReorderBuffer.DEFAULT_AHEAD_SECONDS,
+                 continuous_lookahead_seconds: float = CONTINUOUS_LOOKAHEAD_SECONDS,
+                 metrics_log_path: Optional[str] = None):
         """
         Initialize the TTS engine.
 
@@ -39,12 +73,37 @@ class KokoroOnnxEngine:
             model_path: Path to the Kokoro model file. If None, uses the default.
             voices_path: Path to the voices file. If None, uses the default.
             temp_dir: Directory for temporary files. If None, uses the default.
+            cache_dir: Directory for the persistent synthesis cache. If None, uses a
+                       directory inside temp_dir.
+            cache_max_bytes: Size budget of the synthesis cache in bytes.
+            write_chunk_files: Whether to also write each progressive chunk to a WAV file
+                               in the chunks directory. Playback never reads these files.
+            output_blocksize: Frames per audio output callback.
+            output_latency: Audio output latency, "low", "high" or seconds.
+            session_settings: ONNX Runtime session settings, see
+                              core.onnx_session.DEFAULT_SESSION_SETTINGS.
+            optimized_model_dir: Directory for the optimized model graph, reused across
+                                 starts. If None, uses a directory inside temp_dir.
+            phoneme_db_path: SQLite file that keeps phonemized sentences across starts.
+                             If None, uses a file inside temp_dir.
+            time_stretch_speed: Whether to synthesize at normal speed and time-stretch
+                                to the requested one, so every speed shares the cache.
+            synthesis_ahead_seconds: Seconds of synthesized audio that may wait for the
+                                     player before synthesis pauses.
+            continuous_lookahead_seconds: In continuous playback, seconds of the current
+                                          text still to be played when synthesis of
+                                          the next text starts.
+            metrics_log_path: Optional JSON-lines file the pipeline metrics are
+                              appended to, see core.telemetry.PipelineMetrics.
         """
         # Set default paths
         self.model_path = model_path or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models', 'kokoro', 'kokoro-v0_19.onnx')
         self.voices_path = voices_path or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models', 'kokoro', 'voices.json')
         self.temp_dir = temp_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'temp')
         self.chunks_dir = os.path.join(self.temp_dir, 'chunks')
+        self.cache_dir = cache_dir or os.path.join(self.temp_dir, 'synthesis_cache')
+        # Machine-local: the optimized graph may use instructions specific to this CPU
+        self.optimized_model_dir = optimized_model_dir or os.path.join(self.temp_dir, 'onnx_cache')
 
         # Ensure directories exist
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
@@ -52,19 +111,112 @@ class KokoroOnnxEngine:
         os.makedirs(self.chunks_dir, exist_ok=True)
 
         self.kokoro = None
+        self.session_settings = normalize_session_settings(session_settings)
+        self._load_lock = threading.Lock()  # Start-up warm-up and the first Play may race to load
+        self.warm_up_thread = None
         self.current_text = ""
-        self.word_timings = []
-        self.stop_requested = False
-        self.pause_requested = False
+        self._rendered_speeds: Dict[str, float] = {}  # Speed each file from synthesize() was rendered at
+        self.timing_index = WordTimingIndex()  # Word timings of the current text, on its timeline
+        self._session_text = ""  # Text and word timings of the playback session, see _start_session()
+        self._session_index = self.timing_index
+        self._session_rendered_speed = 1.0  # Speed the session's audio was rendered at
+        # Shared by every thread working on the current text; cancelled when it is stopped or replaced
+        self._token = CancellationToken()
+        # Child of the text's token held by its synthesis thread, so synthesis can be stopped and resumed alone
+        self._synthesis_token = CancellationToken()
+        self._synthesis_thread = None
+        self._next_text = None  # Continuous playback's source of following texts
+        self._session_started_at: Optional[float] = None
+        self.restart_latency: Optional[float] = None  # Seconds from replacing a text to queuing its first audio
+        # Time to first audio, synthesis latency, buffer health; see snapshot() for all of it
+        self.metrics = PipelineMetrics(metrics_log_path)
+        self._request_id: Optional[int] = None  # Metrics id of the current text
+        self._pause_requested = False
         self.audio_thread = None
+        self.playback_thread = None
+
+        # Persistent output stream that plays the chunks back to back
+        self.audio_output = AudioOutput(self.SAMPLE_RATE, output_blocksize, output_latency)
+        # Held while the player moves a chunk from the queue to the output, so an
+        # edit finds every synthesized chunk in exactly one of them
+        self._timeline_lock = threading.Lock()
 
         # For progressive playback
-        self.chunk_size = 100  # Smaller chunks for faster initial playback
-        self.audio_queue = queue.Queue()
+        self.chunker = SentenceChunker()  # Short first chunk for fast initial playback, then larger ones
+        self.chunk_spans = []  # TextSpan of each chunk, relative to the text it belongs to
+        self.chunk_start_times = []  # Playback time at which each chunk starts
+        # Continuous playback plays several texts on one timeline, one entry per text
+        self.continuous_lookahead_seconds = continuous_lookahead_seconds
+        self.text_start_times = []  # Playback time at which each text starts
+        self.text_first_chunks = []  # Index of the first chunk of each text
+        self.text_timing_indexes = []  # Word timings of each text, on the shared timeline
+        self._released_texts = 0  # Leading texts whose audio and word timings were released
+        # Synthesized chunks travel to the player in memory, in chunk order, as
+        # (chunk_index, total_chunks, samples, sample_rate, word_timings)
+        self.synthesis_ahead_seconds = synthesis_ahead_seconds
+        self.audio_queue = ReorderBuffer(synthesis_ahead_seconds)
         self.synthesis_complete = False
         self.current_position = 0.0
+        self.write_chunk_files = write_chunk_files
+        self.time_stretch_speed = time_stretch_speed
         self.chunk_files = []  # Keep track of chunk files
 
+        # Disk writes (cache entries, chunk files) run here, off the synthesis path
+        self.io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="KokoroIO")
+
+        # Persistent cache of synthesized chunks, survives restarts
+        self.synthesis_cache = SynthesisCache(self.cache_dir, cache_max_bytes, self.model_path)
+
+        # Phonemized sentences, so repeated text skips grapheme-to-phoneme conversion
+        self.phoneme_cache = PhonemeCache(db_path=phoneme_db_path or os.path.join(self.temp_dir, 'phonemes.sqlite'))
+
+        # Long-lived loop thread that owns the model; all model calls run on it
+        self.synthesis_loop = SynthesisLoop("KokoroSynthesisLoop")
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether the current text has been stopped or replaced."""
+        return self._token.is_cancelled
+
+    @stop_requested.setter
+    def stop_requested(self, value: bool):
+        if value:
+            self._token.cancel("stop")
+        elif self._token.is_cancelled:
+            # Work started from now on gets a fresh token; cancelled work stays cancelled
+            self._token = CancellationToken()
+
+    @property
+    def cancellation_token(self) -> CancellationToken:
+        """Token of the current text, shared by its synthesis and playback threads."""
+        return self._token
+
+    def cancel_latencies(self) -> Dict[str, Optional[float]]:
+        """
+        Get the latencies of the last cancellation.
+
+        Returns:
+            Dictionary with "silence", the seconds from the last stop or restart
+            until the old audio stopped being audible, and "restart", the seconds
+            from replacing a playing text until the first audio of the new one
+            was queued. A value is None until it has been measured.
+        """
+        return {"silence": self.audio_output.stop_latency, "restart": self.restart_latency}
+
+    @property
+    def pause_requested(self) -> bool:
+        """Whether playback is paused."""
+        return self._pause_requested
+
+    @pause_requested.setter
+    def pause_requested(self, value: bool):
+        self._pause_requested = bool(value)
+        # The output stream reacts within one block and keeps its place
+        if self._pause_requested:
+            self.audio_output.pause()
+        else:
+            self.audio_output.resume()
+
     def load_model(self):
         """Load the Kokoro model."""
         if not KOKORO_AVAILABLE:
@@ -72,6 +224,11 @@ class KokoroOnnxEngine:
                          "Please install the required dependencies.")
             return False
 
+        with self._load_lock:
+            return self._load_model_locked()
+
+    def _load_model_locked(self):
+        """Load the Kokoro model. Must be called with the load lock held."""
         if self.kokoro is None:
             # Check if model files exist
             if not os.path.exists(self.model_path):
@@ -86,8 +243,11 @@ class KokoroOnnxEngine:
 
             try:
                 # Load the model
-                self.kokoro = Kokoro(self.model_path, self.voices_path)
-                print("Kokoro model loaded successfully")
+                settings = dict(self.session_settings)
+                start_time = time.perf_counter()
+                self.kokoro = self.synthesis_loop.load(
+                    lambda: create_kokoro(self.model_path, self.voices_path, settings, self.optimized_model_dir))
+                logger.info("Kokoro model loaded successfully in %.2fs", time.perf_counter() - start_time)
                 return True
             except Exception as e:
                 warnings.warn(f"Failed to load Kokoro model: {str(e)}. Using fallback synthesis.")
@@ -96,14 +256,181 @@ class KokoroOnnxEngine:
 
         return True
 
-    def synthesize(self, text: str, voice: str = "af_sarah", speed: float = 1.0) -> Tuple[str, List[Dict[str, Union[str, float]]]]:
+    def set_session_settings(self, settings: Optional[Dict[str, Any]]):
+        """
+        Change the ONNX Runtime session settings.
+
+        A loaded model is dropped when a setting of the session itself
+        differs, and the next synthesis loads it again with the new session.
+
+        Args:
+            settings: Session settings, see core.onnx_session.DEFAULT_SESSION_SETTINGS.
+        """
+        settings = normalize_session_settings(settings)
+        with self._load_lock:
+            rebuild = any(settings[key] != self.session_settings[key] for key in SESSION_KEYS)
+            self.session_settings = settings
+            if rebuild and self.kokoro is not None:
+                logger.info("ONNX session settings changed, the model will be reloaded")
+                self.stop_all_tasks()
+                self.kokoro = None
+                self.synthesis_loop.stop()
+
+    def warm_up(self, voice: str = "af_sarah", speed: float = 1.0) -> bool:
+        """
+        Load the model and run a short utterance through it.
+
+        The first inference of a fresh session pays for memory allocation and
+        kernel selection; doing it here keeps that off the first Play.
+
+        Args:
+            voice: The voice to warm up.
+            speed: The speed factor.
+
+        Returns:
+            True if the model is loaded and warm, False otherwise.
+        """
+        if not self.load_model():
+            return False
+
+        try:
+            start_time = time.perf_counter()
+            phonemes = self._phonemize("Hello there.")
+            self.synthesis_loop.call(self.kokoro.create, phonemes, voice=voice, speed=speed, lang="en-us",
+                                     is_phonemes=True).result()
+            logger.info("Kokoro model warmed up in %.2fs", time.perf_counter() - start_time)
+            return True
+        except Exception as e:
+            warnings.warn(f"Failed to warm up Kokoro model: {str(e)}")
+            return False
+
+    def warm_up_in_background(self, voice: str = "af_sarah", speed: float = 1.0) -> threading.Thread:
+        """
+        Start warm_up() on a background thread.
+
+        Args:
+            voice: The voice to warm up.
+            speed: The speed factor.
+
+        Returns:
+            The warm-up thread.
+        """
+        if self.warm_up_thread is None or not self.warm_up_thread.is_alive():
+            self.warm_up_thread = threading.Thread(target=self.warm_up, args=(voice, speed),
+                                                   name="KokoroWarmUp", daemon=True)
+            self.warm_up_thread.start()
+        return self.warm_up_thread
+
+    def set_speed(self, speed: float) -> bool:
+        """
+        Change the speed of the audio that is playing, without synthesizing it again.
+
+        The audio output time-stretches the synthesized audio as it plays, so
+        the change is heard within one output block. Positions and word
+        timings keep referring to the synthesized audio.
+
+        Args:
+            speed: The new speed factor.
+
+        Returns:
+            True if the speed was changed, False if the audio has to be
+            synthesized again at the new speed.
+        """
+        if not self.time_stretch_speed or not self.is_playback_active():
+            return False
+        self.audio_output.set_rate(speed / self._session_rendered_speed)
+        logger.info("Playback speed set to %sx", speed)
+        return True
+
+    def _synthesis_speed(self, speed: float) -> float:
+        """
+        Get the speed the model synthesizes at for a requested playback speed.
+
+        Args:
+            speed: The requested speed factor.
+
+        Returns:
+            1.0 when speed is applied by time-stretching, otherwise speed.
+        """
+        return 1.0 if self.time_stretch_speed else speed
+
+    def prerender(self, text: str, voice: str = "af_sarah", speed: float = 1.0,
+                  token: Optional[CancellationToken] = None, priority: Priority = Priority.PREFETCH) -> int:
+        """
+        Synthesize the chunks of a text into the synthesis cache in batches.
+
+        Meant for background work, where throughput matters more than the
+        latency of any one chunk. Short chunks share model calls; playing
+        the text afterwards reads every chunk from the cache.
+
+        Args:
+            text: The text to pre-render.
+            voice: The voice to use.
+            speed: The speed factor.
+            token: Optional cancellation token, checked between batch jobs.
+            priority: Priority class of the batch jobs on the model scheduler.
+
+        Returns:
+            Number of chunks synthesized.
+        """
+        if self.synthesis_cache is None or not self.load_model():
+            return 0
+
+        # The same chunking and speed as playback, so the cache keys match
+        speed = self._synthesis_speed(speed)
+        texts = [span.text for span in self.chunker.chunk(text, speed)]
+        pending = [chunk for chunk in texts if self.synthesis_cache.make_key(chunk, voice, speed) not in self.synthesis_cache]
+
+        batcher = BatchSynthesizer(self.kokoro, self._phonemize)
+        done = 0
+        for start in range(0, len(pending), self.PRERENDER_CHUNKS_PER_CALL):
+            if token is not None and token.is_cancelled:
+                logger.info("Pre-rendering cancelled (%s) after %d of %d chunks", token.reason, done, len(pending))
+                return done
+            group = pending[start:start + self.PRERENDER_CHUNKS_PER_CALL]
+            try:
+                results = self.synthesis_loop.call(batcher.synthesize, group, voice, speed,
+                                                   priority=priority, token=token).result()
+            except concurrent.futures.CancelledError:
+                logger.info("Pre-rendering cancelled after %d of %d chunks", done, len(pending))
+                return done
+            for chunk, (samples, sample_rate) in zip(group, results):
+                self.synthesis_cache.put(chunk, voice, speed, samples, sample_rate,
+                                         estimate_word_timings_from_audio(chunk, samples, sample_rate))
+            done += len(group)
+
+        if pending:
+            logger.info("Pre-rendered %d of %d chunks in %d model calls (%.2f audio-sec/wall-sec)",
+                        len(pending), len(texts), batcher.calls, batcher.realtime_factor)
+        return len(pending)
+
+    def _phonemize(self, text: str, lang: str = "en-us") -> str:
+        """
+        Convert text to phonemes for the model, using the phoneme cache.
+
+        Args:
+            text: The text to convert.
+            lang: The phonemizer language.
+
+        Returns:
+            The phoneme string.
+        """
+        return self.phoneme_cache.phonemize(text, lang, self.kokoro.tokenizer.phonemize)
+
+    def synthesize(self, text: str, voice: str = "af_sarah", speed: float = 1.0,
+                   priority: Priority = Priority.PLAYING) -> Tuple[str, List[Dict[str, Union[str, float]]]]:
         """
         Synthesize speech from text.
 
+        This also runs in the background for neighbouring pages, so it leaves
+        the playback session alone; callers build their own WordTimingIndex
+        from the returned timings.
+
         Args:
             text: The text to synthesize.
             voice: The voice to use.
             speed: The speed factor (1.0 is normal speed).
+            priority: Priority class of the model calls on the scheduler.
 
         Returns:
             Tuple of (audio_path, word_timings)
@@ -111,14 +438,57 @@ class KokoroOnnxEngine:
                 - word: The word
                 - start: Start time in seconds
                 - end: End time in seconds
+            The audio is rendered and cached at the synthesis speed, like the chunks
+            of progressive playback; play it at playback_rate(audio_path, speed).
         """
-        # Store the current text
-        self.current_text = text
+        synthesis_speed = self._synthesis_speed(speed)
+        audio_path, word_timings = self._synthesize_file(text, voice, synthesis_speed, priority)
+        self._rendered_speeds[audio_path] = synthesis_speed
+        return audio_path, word_timings
 
+    def playback_rate(self, audio_path: str, speed: float) -> float:
+        """
+        Get the rate to play a file from synthesize() at, to hear it at a speed.
+
+        Args:
+            audio_path: Path returned by synthesize().
+            speed: The requested speed factor.
+
+        Returns:
+            The speed relative to the speed the file was rendered at; 1.0 for
+            files the engine did not render, which are taken to be at speed.
+        """
+        return speed / self._rendered_speeds.get(audio_path, speed)
+
+    def _synthesize_file(self, text: str, voice: str, speed: float,
+                         priority: Priority) -> Tuple[str, List[Dict[str, Union[str, float]]]]:
+        """
+        Synthesize speech from text into an audio file, at the given speed.
+
+        Args:
+            text: The text to synthesize.
+            voice: The voice to use.
+            speed: The speed factor the model synthesizes at.
+            priority: Priority class of the model calls on the scheduler.
+
+        Returns:
+            Tuple of (audio_path, word_timings), see synthesize().
+        """
         # Check if kokoro is available
         if not KOKORO_AVAILABLE:
             return self._dummy_synthesize(text, speed)
 
+        # Text we have already synthesized is served from the cache without loading the model
+        cached = self.synthesis_cache.get(text, voice, speed)
+        if cached is not None:
+            samples, sample_rate, word_timings_list = cached
+            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', dir=self.temp_dir, delete=False)
+            temp_file.close()
+            sf.write(temp_file.name, samples, sample_rate)
+
+            logger.debug("Using cached audio for %d characters of text", len(text))
+            return temp_file.name, word_timings_list
+
         # Load the model if not loaded
         if not self.load_model():
             return self._dummy_synthesize(text, speed)
@@ -126,112 +496,27 @@ class KokoroOnnxEngine:
         try:
             # Try to use create_stream to get direct timing information
             try:
-                print(f"Synthesizing speech with voice: {voice}, speed: {speed} using streaming with direct timings")
+                logger.debug("Synthesizing speech with voice: %s, speed: %s using streaming with direct timings", voice, speed)
 
                 # Create a temporary file for the audio
                 temp_file = tempfile.NamedTemporaryFile(suffix='.wav', dir=self.temp_dir, delete=False)
                 temp_file.close()
 
-                # Create temporary lists to collect all samples and timings
-                all_samples = []
-                all_timings = []
-
-                # Create an event loop for async operations
-                loop = None
-                try:
-                    # Try to get the current event loop
-                    try:
-                        loop = asyncio.get_running_loop()
-                        print("Using existing event loop")
-                    except RuntimeError:
-                        # No running event loop, create a new one
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        print("Created new event loop")
-
-                    # Define the async function to process the stream
-                    sample_rate_container = [self.SAMPLE_RATE]  # Use a container to store the sample rate
-
-                    async def process_stream():
-                        try:
-                            stream = self.kokoro.create_stream(
-                                text, voice=voice, speed=speed, lang="en-us"
-                            )
-
-                            async for result in stream:
-                                # Check if we're being shut down
-                                if self.stop_requested:
-                                    print("Stop requested during stream processing")
-                                    break
-
-                                # Handle both 2-value and 3-value tuples
-                                if len(result) == 3:
-                                    samples, sr, timings = result
-                                elif len(result) == 2:
-                                    samples, sr = result
-                                    timings = []
-                                else:
-                                    print(f"Unexpected result format: {result}")
-                                    continue
-
-                                all_samples.append(samples)
-                                # Store the sample rate for later use
-                                sample_rate_container[0] = sr
-                                if timings:
-                                    all_timings.extend(timings)
-                        except asyncio.CancelledError:
-                            print("Stream processing was cancelled")
-                            raise
-                        except Exception as e:
-                            print(f"Error in process_stream: {str(e)}")
-                            raise
-
-                    # Run the async function
-                    if loop.is_running():
-                        # If the loop is already running, create a task
-                        print("Loop is already running, creating task")
-                        task = asyncio.create_task(process_stream())
-                        # Wait for the task to complete
-                        while not task.done():
-                            time.sleep(0.1)
-                            if self.stop_requested:
-                                print("Stop requested, cancelling task")
-                                task.cancel()
-                                break
-                    else:
-                        # Otherwise, run until complete
-                        print("Running process_stream in event loop")
-                        loop.run_until_complete(process_stream())
-                except Exception as e:
-                    print(f"Error in event loop handling: {str(e)}")
-                    raise
-                finally:
-                    # Only close the loop if we created it
-                    if loop and not loop.is_running():
-                        try:
-                            loop.close()
-                            print("Closed event loop")
-                        except Exception as e:
-                            print(f"Error closing event loop: {str(e)}")
+                # Collect all samples and timings from the stream
+                all_samples, sample_rate, all_timings = self._stream_samples(text, voice, speed, "text", priority=priority)
 
                 # Combine all samples
                 if all_samples:
                     samples = np.concatenate(all_samples)
-                    sample_rate = sample_rate_container[0]
 
                     # Save the audio to a file
                     sf.write(temp_file.name, samples, sample_rate)
 
                     # Process the direct timing information
                     if all_timings:
-                        print(f"Using direct timing information: {len(all_timings)} words")
+                        logger.debug("Using direct timing information: %d words", len(all_timings))
                         word_timings_list = self._process_direct_timings(all_timings, text)
-
-                        # Store both the list and dictionary versions
-                        self.word_timings_list = word_timings_list
-                        self.word_timings = self._convert_word_timings_to_dict(word_timings_list)
-
-                        print(f"Converted word timings to dictionary with {len(self.word_timings)} entries")
+                        self.synthesis_cache.put(text, voice, speed, samples, sample_rate, word_timings_list)
                         return temp_file.name, word_timings_list
                     else:
                         # If no timings, fall back to heuristic method
@@ -241,19 +526,20 @@ class KokoroOnnxEngine:
                     raise Exception("No audio samples collected from stream")
 
             except Exception as stream_error:
-                print(f"Error using create_stream: {str(stream_error)}. Falling back to create method.")
+                logger.warning("Error using create_stream: %s. Falling back to create method.", stream_error)
 
                 # Generate speech using Kokoro's create method
-                print(f"Synthesizing speech with voice: {voice}, speed: {speed} using create method")
+                logger.debug("Synthesizing speech with voice: %s, speed: %s using create method", voice, speed)
 
                 # Create a temporary file for the audio
                 temp_file = tempfile.NamedTemporaryFile(suffix='.wav', dir=self.temp_dir, delete=False)
                 temp_file.close()
 
                 # Generate speech
-                samples, sample_rate = self.kokoro.create(
-                    text, voice=voice, speed=speed, lang="en-us"
-                )
+                samples, sample_rate = self.synthesis_loop.call(
+                    self.kokoro.create, self._phonemize(text), voice=voice, speed=speed, lang="en-us", is_phonemes=True,
+                    priority=priority
+                ).result()
 
                 # Save the audio to a file
                 sf.write(temp_file.name, samples, sample_rate)
@@ -262,19 +548,65 @@ class KokoroOnnxEngine:
                 duration = len(samples) / sample_rate
 
                 # Extract word timings using heuristic method
-                word_timings_list = self._extract_word_timings(text.split(), duration)
-
-                # Store both the list and dictionary versions
-                self.word_timings_list = word_timings_list
-                self.word_timings = self._convert_word_timings_to_dict(word_timings_list)
+                word_timings_list = estimate_word_timings_from_audio(text, samples, sample_rate)
+                self.synthesis_cache.put(text, voice, speed, samples, sample_rate, word_timings_list)
 
-                print(f"Using heuristic word timings, converted to dictionary with {len(self.word_timings)} entries")
+                logger.debug("Using heuristic word timings for %d words", len(word_timings_list))
                 return temp_file.name, word_timings_list
 
         except Exception as e:
             warnings.warn(f"Failed to synthesize speech: {str(e)}. Using fallback synthesis.")
             return self._dummy_synthesize(text, speed)
 
+    def _stream_samples(self, text: str, voice: str, speed: float, label: str,
+                        token: Optional[CancellationToken] = None,
+                        priority: Priority = Priority.PLAYING) -> Tuple[List[np.ndarray], int, List[Dict]]:
+        """
+        Collect the audio and timings produced by create_stream on the synthesis loop.
+
+        Args:
+            text: The text to synthesize.
+            voice: The voice to use.
+            speed: The speed factor.
+            label: Description of the text, used for log messages.
+            token: Optional cancellation token; cancelling it stops the stream at
+                   the next segment boundary.
+            priority: Priority class of the segments on the model scheduler.
+
+        Returns:
+            Tuple of (sample_arrays, sample_rate, timings).
+
+        Raises:
+            OperationCancelled: If the token is cancelled.
+        """
+        all_samples = []
+        all_timings = []
+        sample_rate = self.SAMPLE_RATE
+
+        stream = self.synthesis_loop.stream(self._phonemize(text), token=token, priority=priority, voice=voice,
+                                            speed=speed, lang="en-us", is_phonemes=True)
+        try:
+            for result in stream:
+                # Handle both 2-value and 3-value tuples
+                if len(result) == 3:
+                    samples, sr, timings = result
+                elif len(result) == 2:
+                    samples, sr = result
+                    timings = []
+                else:
+                    logger.warning("Unexpected result format for %s: %s", label, result)
+                    continue
+
+                all_samples.append(samples)
+                sample_rate = sr
+                if timings:
+                    all_timings.extend(timings)
+        finally:
+            # Cancels the stream on the loop if we stopped early
+            stream.close()
+
+        return all_samples, sample_rate, all_timings
+
     def _generate_dummy_audio(self, text: str, speed: float = 1.0) -> Tuple[np.ndarray, List[Dict[str, Union[str, float]]], float]:
         """
         Generate dummy audio and word timings when TTS is not available.
@@ -326,10 +658,6 @@ class KokoroOnnxEngine:
         chunk_path = os.path.join(self.chunks_dir, chunk_filename)
         sf.write(chunk_path, audio, self.SAMPLE_RATE)
 
-        # Store both the list and dictionary versions
-        self.word_timings_list = word_timings
-        self.word_timings = self._convert_word_timings_to_dict(word_timings)
-
         self.chunk_files.append(chunk_path)
 
         return chunk_path, word_timings
@@ -394,80 +722,20 @@ class KokoroOnnxEngine:
         """
         word_timings = []
 
-        # If we have the original text, try to find word positions
-        word_positions = {}
-        if text:
-            # Simple approach to find word positions in the text
-            current_pos = 0
-            for word in text.split():
-                # Find the word in the text starting from current_pos
-                word_pos = text.find(word, current_pos)
-                if word_pos >= 0:
-                    word_positions[word] = word_pos
-                    current_pos = word_pos + len(word)
-
         for timing in kokoro_timings:
             # Kokoro timings have 'word', 'start', and 'end' keys
-            word = timing.get("word", "")
-            start = timing.get("start", 0.0)
-            end = timing.get("end", 0.0)
-
-            timing_info = {
-                "word": word,
-                "start": start,
-                "end": end
-            }
-
-            # Add position information if available
-            if word in word_positions:
-                timing_info["position"] = word_positions[word]
+            word_timings.append({
+                "word": timing.get("word", ""),
+                "start": timing.get("start", 0.0),
+                "end": timing.get("end", 0.0)
+            })
 
-            word_timings.append(timing_info)
+        # Find the characters of the text each word stands for
+        if text:
+            align_word_timings(text, word_timings)
 
         return word_timings
 
-    def _convert_word_timings_to_dict(self, word_timings_list: List[Dict[str, Union[str, float]]]) -> Dict[str, float]:
-        """
-        Convert a list of word timing dictionaries to a position-to-time dictionary.
-        This maintains compatibility with code that expects self.word_timings to be a dictionary.
-
-        Args:
-            word_timings_list: List of dictionaries with word timing information.
-
-        Returns:
-            Dictionary mapping position (as string) to start time (float).
-        """
-        position_to_time = {}
-
-        for timing in word_timings_list:
-            # Only include timings that have position information
-            if "position" in timing:
-                # Convert position to string to ensure consistent key type
-                position = str(timing["position"])
-                start_time = float(timing["start"])
-                position_to_time[position] = start_time
-
-        # If we don't have any positions, create a simple mapping based on index
-        if not position_to_time and word_timings_list:
-            print("Warning: No position information in word timings. Creating simple index-based mapping.")
-            for i, timing in enumerate(word_timings_list):
-                # Estimate position as 6 characters per word
-                estimated_position = i * 6
-                # Convert to string for consistent key type
-                position_to_time[str(estimated_position)] = float(timing["start"])
-
-        # Print some debug information
-        if position_to_time:
-            print(f"Created word timings dictionary with {len(position_to_time)} entries")
-            # Print a few sample entries
-            sample_keys = list(position_to_time.keys())[:5] if len(position_to_time) > 5 else list(position_to_time.keys())
-            print(f"Sample keys: {sample_keys}")
-            print(f"Key types: {[type(k).__name__ for k in sample_keys]}")
-        else:
-            print("Warning: Empty word timings dictionary created")
-
-        return position_to_time
-
     def _process_word_timings(self, words, start_time=0.0, text=None):
         """
         Process word timings from the TTS engine.
@@ -482,37 +750,20 @@ class KokoroOnnxEngine:
         """
         word_timings = []
 
-        # If we have the original text, try to find word positions
-        word_positions = {}
-        if text:
-            # Simple approach to find word positions in the text
-            current_pos = 0
-            for word in text.split():
-                # Find the word in the text starting from current_pos
-                word_pos = text.find(word, current_pos)
-                if word_pos >= 0:
-                    word_positions[word] = word_pos
-                    current_pos = word_pos + len(word)
-
-        for i, word_info in enumerate(words):
-            word = word_info["word"]
-            start = word_info["start"] + start_time
-            end = word_info["end"] + start_time
-
+        for word_info in words:
             timing_info = {
-                "word": word,
-                "start": start,
-                "end": end
+                "word": word_info["word"],
+                "start": word_info["start"] + start_time,
+                "end": word_info["end"] + start_time
             }
-
-            # Add position information if available
-            if word in word_positions:
-                timing_info["position"] = word_positions[word]
-            elif "position" in word_info:
+            if "position" in word_info:
                 timing_info["position"] = word_info["position"]
-
             word_timings.append(timing_info)
 
+        # Find the characters of the text each word stands for
+        if text:
+            align_word_timings(text, word_timings)
+
         return word_timings
 
     def get_word_at_position(self, position: float) -> Dict[str, Union[str, float]]:
@@ -525,10 +776,11 @@ class KokoroOnnxEngine:
         Returns:
             The word timing dictionary or None if not found.
         """
-        for timing in self.word_timings:
-            if timing["start"] <= position <= timing["end"]:
-                return timing
-        return None
+        index = self.timing_index.index_at_time(position)
+        if index < 0:
+            return None
+        timing = self.timing_index[index]
+        return timing if timing["start"] <= position <= timing["end"] else None
 
     def play_audio(self, text: str, voice: str = "af_sarah", speed: float = 1.0, stream: bool = True):
         """
@@ -548,11 +800,11 @@ class KokoroOnnxEngine:
 
         self.audio_thread = threading.Thread(
             target=self._process_audio,
-            args=(text, voice, speed, stream)
+            args=(text, voice, speed, stream, self._token)
         )
         self.audio_thread.start()
 
-    def _process_audio(self, text: str, voice: str, speed: float, stream: bool):
+    def _process_audio(self, text: str, voice: str, speed: float, stream: bool, token: CancellationToken):
         """
         Process and play audio in a separate thread.
 
@@ -561,23 +813,24 @@ class KokoroOnnxEngine:
             voice: The voice to use.
             speed: The speed factor.
             stream: Whether to stream the audio or play it all at once.
+            token: Cancellation token of the request.
         """
         if not self.load_model():
             return
 
         try:
             if stream:
-                asyncio.run(self._play_stream(text, voice, speed))
+                self._play_stream(text, voice, speed, token)
             else:
-                samples, sample_rate = self.kokoro.create(
-                    text, voice=voice, speed=speed, lang="en-us"
-                )
+                samples, sample_rate = self.synthesis_loop.call(
+                    self.kokoro.create, self._phonemize(text), voice=voice, speed=speed, lang="en-us", is_phonemes=True
+                ).result()
                 sd.play(samples, sample_rate)
                 sd.wait()
         except Exception as e:
             warnings.warn(f"Failed to play audio: {str(e)}")
 
-    async def _play_stream(self, text: str, voice: str, speed: float):
+    def _play_stream(self, text: str, voice: str, speed: float, token: CancellationToken):
         """
         Play audio as a stream.
 
@@ -585,62 +838,64 @@ class KokoroOnnxEngine:
             text: The text to synthesize.
             voice: The voice to use.
             speed: The speed factor.
+            token: Cancellation token of the request.
         """
         try:
-            stream = self.kokoro.create_stream(
-                text, voice=voice, speed=speed, lang="en-us"
+            stream = self.synthesis_loop.stream(
+                self._phonemize(text), token=token, voice=voice, speed=speed, lang="en-us", is_phonemes=True
             )
 
             # Handle both 2-value and 3-value tuples
-            async for result in stream:
+            for result in stream:
                 # Handle both 2-value and 3-value tuples
                 if len(result) == 3:
                     samples, sr, timings = result
                     # Print timing information for debugging
                     if timings:
-                        print(f"Received timing information: {len(timings)} words")
+                        logger.debug("Received timing information: %d words", len(timings))
                 elif len(result) == 2:
                     samples, sr = result
                     timings = []
-                    print("No timing information received (2-value tuple)")
+                    logger.debug("No timing information received (2-value tuple)")
                 else:
-                    print(f"Unexpected result format: {result}")
+                    logger.warning("Unexpected result format: %s", result)
                     continue
 
-                while self.pause_requested:
-                    await asyncio.sleep(0.1)
-                if self.stop_requested:
+                while self.pause_requested and not token.wait(0.1):
+                    pass
+                if token.is_cancelled:
+                    stream.close()
                     return
                 sd.play(samples, sr)
                 sd.wait()
+        except OperationCancelled:
+            pass
         except Exception as e:
-            print(f"Error in _play_stream: {str(e)}")
+            logger.error("Error in _play_stream: %s", e)
             # Don't re-raise to avoid crashing the application
 
     def stop_audio(self):
         """Stop audio playback."""
         self.stop_requested = True
-        sd.stop()
+        if SOUNDDEVICE_AVAILABLE:
+            sd.stop()
 
     def stop(self):
         """Stop playback and reset state."""
-        print("Stopping TTS engine playback")
+        logger.debug("Stopping TTS engine playback")
         self.stop_requested = True
         self.pause_requested = False
         self.current_position = 0.0
-        sd.stop()
+        if SOUNDDEVICE_AVAILABLE:
+            sd.stop()
+        self.audio_output.clear()
 
-        # Clear any queued audio
-        if hasattr(self, 'audio_queue'):
-            try:
-                while not self.audio_queue.empty():
-                    self.audio_queue.get_nowait()
-            except Exception as e:
-                print(f"Error clearing audio queue: {str(e)}")
+        # Drop any queued audio
+        self.audio_queue.close()
 
     def toggle_pause(self):
         """Toggle pause state."""
-        print(f"Toggling pause state from {self.pause_requested} to {not self.pause_requested}")
+        logger.debug("Toggling pause state from %s to %s", self.pause_requested, not self.pause_requested)
         self.pause_requested = not self.pause_requested
 
         # If we're unpausing, make sure we're not also stopped
@@ -656,10 +911,11 @@ class KokoroOnnxEngine:
         Args:
             position: Position in seconds.
         """
-        print(f"Setting TTS engine position to {position}s")
-        self.current_position = position
+        logger.debug("Setting TTS engine position to %ss", position)
+        self.seek(position)
 
-    def synthesize_and_play_progressively(self, text: str, voice: str = "af_sarah", speed: float = 1.0, callback=None):
+    def synthesize_and_play_progressively(self, text: str, voice: str = "af_sarah", speed: float = 1.0, callback=None,
+                                          next_text: Optional[Callable[[int], Optional[str]]] = None):
         """
         Synthesize speech from text and start playing as soon as the first chunk is ready.
 
@@ -667,42 +923,123 @@ class KokoroOnnxEngine:
             text: The text to synthesize.
             voice: The voice to use.
             speed: The speed factor (1.0 is normal speed).
-            callback: Optional callback function to call when a chunk is ready.
+            callback: Optional callback function to call when a chunk of the first text is ready.
                      The callback receives (chunk_index, total_chunks, audio_path, word_timings).
+                     audio_path is None unless write_chunk_files is enabled, in which
+                     case the file is written in the background.
+            next_text: Optional function for continuous playback. Called with n = 1, 2, ...
+                       it returns the n-th text after the first one, or None after the last.
+                       Each text is fetched when the one before it is
+                       continuous_lookahead_seconds from its end, and plays right after
+                       it on the same timeline, without a gap.
         """
         # Store the current text
         self.current_text = text
-        self.stop_requested = False
-        self.pause_requested = False
-        self.synthesis_complete = False
-        self.current_position = 0.0
-
-        # Clear the queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._start_session(text)
+        self._request_id = self.metrics.start_request("play")
+        self._session_rendered_speed = self._synthesis_speed(speed)
+        self.audio_output.set_rate(speed / self._session_rendered_speed)
 
         # Clean up old chunk files
         self._clean_chunk_files()
 
         # Start the synthesis thread
+        self._synthesis_token = self._token.child()
+        self._next_text = next_text
         synthesis_thread = threading.Thread(
             target=self._synthesize_chunks,
-            args=(text, voice, speed, callback)
+            args=(text, voice, speed, callback, next_text)
         )
         synthesis_thread.daemon = True
         synthesis_thread.start()
+        self._synthesis_thread = synthesis_thread
 
         # Start the playback thread
-        playback_thread = threading.Thread(
+        playback_thread = self._start_playback_thread()
+
+        return synthesis_thread, playback_thread
+
+    def _start_session(self, text: str = ""):
+        """
+        Reset the playback state for a new text.
+
+        Args:
+            text: The text that will play.
+        """
+        # Threads still working on the previous text drop their work at the next segment boundary
+        replacing = self.is_playback_active()
+        self._token.cancel("replaced")
+        self._token = CancellationToken()
+        # Only a restart measures how long the old text holds up the new one
+        self._session_started_at = time.perf_counter() if replacing else None
+        self.pause_requested = False
+        self.synthesis_complete = False
+        self.current_position = 0.0
+
+        # Start from a fresh queue, so nothing of the previous text can reach the player;
+        # cancelling the text wakes everybody waiting on it
+        self.audio_queue = ReorderBuffer(self.synthesis_ahead_seconds)
+        self._token.add_callback(self.audio_queue.close)
+        self.audio_output.clear()
+        self.timing_index = WordTimingIndex()
+        # The session's own references; an edit works on these, whatever the public attributes hold
+        self._session_text = text
+        self._session_index = self.timing_index
+        self.chunk_spans = []
+        self.chunk_start_times = []
+        self.text_start_times = []
+        self.text_first_chunks = []
+        self.text_timing_indexes = []
+        self._released_texts = 0
+
+    def _start_playback_thread(self) -> threading.Thread:
+        """Start the thread feeding the audio output."""
+        self.playback_thread = threading.Thread(
             target=self._play_chunks
         )
-        playback_thread.daemon = True
-        playback_thread.start()
+        self.playback_thread.daemon = True
+        self.playback_thread.start()
+        return self.playback_thread
 
-        return synthesis_thread, playback_thread
+    def play_audio_file(self, audio_path: str, word_timings: Optional[List[Dict[str, Union[str, float]]]] = None,
+                        speed: float = 1.0) -> threading.Thread:
+        """
+        Play an already synthesized audio file through the engine's output stream.
+
+        Args:
+            audio_path: Path to the audio file.
+            word_timings: Word timings of the audio, used for highlighting.
+            speed: The speed factor to hear it at. A file from synthesize() is
+                   played relative to the speed it was rendered at, see playback_rate().
+
+        Returns:
+            The playback thread.
+        """
+        request_id = self.metrics.start_request("file")
+        samples, sample_rate = sf.read(audio_path, dtype="float32")
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+
+        self._start_session()
+        self._request_id = request_id
+        self._session_rendered_speed = self._rendered_speeds.get(audio_path, speed)
+        self.audio_output.set_rate(speed / self._session_rendered_speed)
+        self.chunk_start_times.append(0.0)
+        word_timings = list(word_timings or [])
+        self.timing_index.append(word_timings)
+        self.text_start_times.append(0.0)
+        self.text_first_chunks.append(0)
+        self.text_timing_indexes.append(self.timing_index)
+
+        self.audio_queue.put(0, (0, 1, samples, sample_rate, word_timings), len(samples) / sample_rate)
+        self.audio_queue.finish(1)
+        self.synthesis_complete = True
+
+        return self._start_playback_thread()
+
+    def is_playback_active(self) -> bool:
+        """Whether the engine is playing, or holding paused, audio for the current text."""
+        return self.playback_thread is not None and self.playback_thread.is_alive()
 
     def _clean_chunk_files(self):
         """Clean up old chunk files."""
@@ -717,7 +1054,47 @@ class KokoroOnnxEngine:
                 except Exception as e:
                     warnings.warn(f"Failed to remove chunk file {file}: {str(e)}")
 
-    def _synthesize_chunks(self, text: str, voice: str, speed: float, callback=None):
+    def _queue_chunk(self, audio_queue: ReorderBuffer, item: Tuple, token: CancellationToken) -> bool:
+        """
+        Hand a synthesized chunk to the player, waiting while enough audio is ready ahead of it.
+
+        Args:
+            audio_queue: The queue of the synthesis run producing the chunk.
+            item: The (chunk_index, total_chunks, samples, sample_rate, word_timings) tuple.
+            token: Cancellation token of the synthesis run.
+
+        Returns:
+            True if the chunk was queued, False if playback was stopped or restarted.
+        """
+        chunk_index, _, samples, sample_rate, _ = item
+        # Cancelling the token wakes this wait
+        return audio_queue.put(chunk_index, item, len(samples) / sample_rate, token=token) and not token.is_cancelled
+
+    def _write_chunk_file(self, chunk_index: int, samples: np.ndarray, sample_rate: int, prefix: str = "chunk") -> Optional[str]:
+        """
+        Write a chunk to the chunks directory in the background, if chunk files are enabled.
+
+        Args:
+            chunk_index: Index of the chunk.
+            samples: The audio samples.
+            sample_rate: The sample rate of the audio.
+            prefix: File name prefix.
+
+        Returns:
+            Path the chunk is being written to, or None if chunk files are disabled.
+        """
+        if not self.write_chunk_files:
+            return None
+
+        chunk_filename = f"{prefix}_{chunk_index:04d}_{int(time.time())}.wav"
+        chunk_path = os.path.join(self.chunks_dir, chunk_filename)
+        self.chunk_files.append(chunk_path)
+        self.io_executor.submit(sf.write, chunk_path, samples, sample_rate)
+        return chunk_path
+
+    def _synthesize_chunks(self, text: str, voice: str, speed: float, callback=None,
+                           next_text: Optional[Callable[[int], Optional[str]]] = None,
+                           resume: Optional[Tuple[int, float]] = None):
         """
         Synthesize text in chunks and add them to the queue.
 
@@ -725,348 +1102,507 @@ class KokoroOnnxEngine:
             text: The text to synthesize.
             voice: The voice to use.
             speed: The speed factor.
-            callback: Optional callback function.
+            callback: Optional callback function, called for the chunks of the first text.
+            next_text: Optional function returning the n-th following text, see
+                       synthesize_and_play_progressively().
+            resume: Optional (chunk index, start time) to continue the first text from,
+                    with the chunks already in chunk_spans, after synthesis was stopped
+                    for an edit.
         """
-        if not self.load_model():
-            # Use fallback synthesis
-            audio_path, word_timings = self._dummy_synthesize(text, speed)
-            self.audio_queue.put((0, 1, audio_path, word_timings))
-            if callback:
-                callback(0, 1, audio_path, word_timings)
-            self.synthesis_complete = True
+        audio_queue = self.audio_queue
+        token = self._synthesis_token
+        # The lists of this session; a newer session replaces them rather than clearing them
+        text_start_times = self.text_start_times
+        text_first_chunks = self.text_first_chunks
+        text_timing_indexes = self.text_timing_indexes
+        session_index = self._session_index
+
+        # Chunks are cut and cached at the synthesis speed, so changing speed reuses them;
+        # the audio output plays them at the requested speed
+        synthesis_speed = self._synthesis_speed(speed)
+        model_loaded = self.load_model()
+
+        sequence = 0  # Chunk index on the shared timeline
+        time_offset = 0.0 if resume is None else resume[1]
+        text_number = 0
+        while text is not None:
+            # The first text fills the index highlighting already holds, so it works during synthesis
+            timing_index = session_index if text_number == 0 else WordTimingIndex()
+            if resume is None or text_number > 0:
+                text_start_times.append(time_offset)
+                text_first_chunks.append(sequence)
+                text_timing_indexes.append(timing_index)
+
+            if resume is not None and text_number == 0:
+                sequence, time_offset, completed = self._synthesize_text_chunks(
+                    text, voice, synthesis_speed, audio_queue, token, timing_index, sequence, time_offset,
+                    chunks=self.chunk_spans, resume_from=resume[0])
+            elif model_loaded:
+                sequence, time_offset, completed = self._synthesize_text_chunks(
+                    text, voice, synthesis_speed, audio_queue, token, timing_index, sequence, time_offset,
+                    callback if text_number == 0 else None)
+            else:
+                sequence, time_offset, completed = self._queue_dummy_text(
+                    text, synthesis_speed, audio_queue, token, timing_index, sequence, time_offset,
+                    callback if text_number == 0 else None)
+            if not completed or next_text is None:
+                break
+
+            # Fetch the next text only shortly before it is needed, so it carries the latest edits
+            while (not token.is_cancelled and
+                   time_offset - self.position() > self.continuous_lookahead_seconds):
+                token.wait(0.1)
+            if token.is_cancelled:
+                break
+
+            text_number += 1
+            text = next_text(text_number)
+            if text is not None:
+                logger.info("Continuing with text %d at %.2fs", text_number + 1, time_offset)
+
+        # A cancelled run must not overwrite the state of the one replacing it
+        if token.is_cancelled:
             return
 
-        # Split text into chunks
-        words = text.split()
-        chunks = []
-        for i in range(0, len(words), self.chunk_size):
-            chunk = ' '.join(words[i:i+self.chunk_size])
-            chunks.append(chunk)
+        logger.info("Final word timing index has %d entries", sum(len(index) for index in text_timing_indexes))
+        logger.info(self.phoneme_cache.summary())
+        if self.synthesis_loop.scheduler is not None:
+            logger.info(self.synthesis_loop.scheduler.summary())
+        logger.info(self.metrics_summary())
+
+        # Mark synthesis as complete
+        audio_queue.finish(sequence)
+        self.synthesis_complete = True
+
+    def _queue_dummy_text(self, text: str, speed: float, audio_queue: ReorderBuffer, token: CancellationToken,
+                          timing_index: WordTimingIndex, first_chunk: int, time_offset: float,
+                          callback=None) -> Tuple[int, float, bool]:
+        """
+        Queue fallback audio for a whole text when the model cannot be loaded.
+
+        Args:
+            text: The text.
+            speed: The synthesis speed factor.
+            audio_queue: The queue of the synthesis run.
+            token: Cancellation token of the synthesis run.
+            timing_index: Index to add the word timings of the text to.
+            first_chunk: Chunk index of the text on the shared timeline.
+            time_offset: Playback time at which the text starts.
+            callback: Optional callback function.
+
+        Returns:
+            Tuple of (next chunk index, time after the text, whether the text was queued).
+        """
+        dummy_audio, dummy_timings, _ = self._generate_dummy_audio(text, speed)
+        dummy_audio = dummy_audio.astype(np.float32)
+        for timing in dummy_timings:
+            timing["start"] += time_offset
+            timing["end"] += time_offset
+        audio_path = self._write_chunk_file(first_chunk, dummy_audio, self.SAMPLE_RATE, "chunk_dummy")
+
+        if not self._queue_chunk(audio_queue, (first_chunk, first_chunk + 1, dummy_audio, self.SAMPLE_RATE, dummy_timings),
+                                 token):
+            return first_chunk, time_offset, False
+        self.chunk_start_times.append(time_offset)
+        timing_index.append(dummy_timings, first_chunk)
+        if callback:
+            callback(0, 1, audio_path, dummy_timings)
+        return first_chunk + 1, time_offset + len(dummy_audio) / self.SAMPLE_RATE, True
+
+    def _synthesize_text_chunks(self, text: str, voice: str, speed: float, audio_queue: ReorderBuffer,
+                                token: CancellationToken, timing_index: WordTimingIndex, first_chunk: int,
+                                time_offset: float, callback=None, chunks: Optional[List[TextSpan]] = None,
+                                resume_from: int = 0) -> Tuple[int, float, bool]:
+        """
+        Synthesize the chunks of one text and queue them after the audio before it.
+
+        Args:
+            text: The text.
+            voice: The voice to use.
+            speed: The synthesis speed factor.
+            audio_queue: The queue of the synthesis run.
+            token: Cancellation token of the synthesis run.
+            timing_index: Index to add the word timings of the text to; times are on the
+                          shared timeline, positions relative to the text.
+            first_chunk: Chunk index of the first chunk of the text on the shared timeline.
+            time_offset: Playback time at which the text starts.
+            callback: Optional callback function, called with chunk indexes within the text.
+            chunks: The chunks of the text, if it has been split already.
+            resume_from: Index within the text of the first chunk to synthesize;
+                         time_offset is where that chunk starts.
+
+        Returns:
+            Tuple of (next chunk index, time after the text, whether every chunk was queued).
+        """
+        if chunks is None:
+            # Split text into sentence-aligned chunks that carry their offsets into the text
+            chunks = self.chunker.chunk(text, speed)
+            self.chunk_spans.extend(chunks)
 
         total_chunks = len(chunks)
-        all_word_timings = []
-        time_offset = 0.0
 
-        for i, chunk in enumerate(chunks):
-            if self.stop_requested:
-                break
+        for i in range(resume_from, total_chunks):
+            chunk = chunks[i]
+            if token.is_cancelled:
+                return first_chunk + i, time_offset, False
 
+            started_at = time.perf_counter()
+            cached = None
             try:
                 # Generate speech for this chunk
-                print(f"Synthesizing chunk {i+1}/{total_chunks}")
+                logger.debug("Synthesizing chunk %d/%d", i + 1, total_chunks)
 
-                # Create a file for the audio in the chunks directory
-                chunk_filename = f"chunk_{i:04d}_{int(time.time())}.wav"
-                chunk_path = os.path.join(self.chunks_dir, chunk_filename)
-                self.chunk_files.append(chunk_path)
+                # Reuse previously synthesized audio for this text if we have it
+                cached = self.synthesis_cache.get(chunk.text, voice, speed) if self.synthesis_cache is not None else None
+                if cached is not None:
+                    samples, sample_rate, word_timings = cached
+                    logger.debug("Using cached audio for chunk %d/%d", i + 1, total_chunks)
+                else:
+                    samples, sample_rate, word_timings = self._synthesize_chunk_audio(chunk.text, voice, speed, i,
+                                                                                      token, self._chunk_priority())
+                    samples = np.asarray(samples, dtype=np.float32)
+                    if self.synthesis_cache is not None:
+                        # Store chunk-relative timings; the list below is shifted in place
+                        self.io_executor.submit(self.synthesis_cache.put, chunk.text, voice, speed, samples,
+                                                sample_rate, [dict(timing) for timing in word_timings])
 
-                # Try to use create_stream to get direct timing information
-                try:
-                    # Create a temporary list to collect all samples and timings
-                    all_samples = []
-                    all_timings = []
+                chunk_path = self._write_chunk_file(first_chunk + i, samples, sample_rate)
 
-                    # Create an event loop for async operations
-                    loop = None
-                    try:
-                        # Try to get the current event loop
-                        try:
-                            loop = asyncio.get_running_loop()
-                            print(f"Using existing event loop for chunk {i+1}")
-                        except RuntimeError:
-                            # No running event loop, create a new one
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            print(f"Created new event loop for chunk {i+1}")
-
-                        # Define the async function to process the stream
-                        sample_rate_container = [self.SAMPLE_RATE]  # Use a container to store the sample rate
-
-                        async def process_stream():
-                            try:
-                                stream = self.kokoro.create_stream(
-                                    chunk, voice=voice, speed=speed, lang="en-us"
-                                )
-
-                                async for result in stream:
-                                    # Check if we're being shut down
-                                    if self.stop_requested:
-                                        print(f"Stop requested during stream processing for chunk {i+1}")
-                                        break
-
-                                    # Handle both 2-value and 3-value tuples
-                                    if len(result) == 3:
-                                        samples, sr, timings = result
-                                    elif len(result) == 2:
-                                        samples, sr = result
-                                        timings = []
-                                    else:
-                                        print(f"Unexpected result format: {result}")
-                                        continue
-
-                                    all_samples.append(samples)
-                                    # Store the sample rate for later use
-                                    sample_rate_container[0] = sr
-                                    if timings:
-                                        all_timings.extend(timings)
-                            except asyncio.CancelledError:
-                                print(f"Stream processing was cancelled for chunk {i+1}")
-                                raise
-                            except Exception as e:
-                                print(f"Error in process_stream for chunk {i+1}: {str(e)}")
-                                raise
-
-                        # Run the async function
-                        if loop.is_running():
-                            # If the loop is already running, create a task
-                            print(f"Loop is already running for chunk {i+1}, creating task")
-                            task = asyncio.create_task(process_stream())
-                            # Wait for the task to complete
-                            while not task.done():
-                                time.sleep(0.1)
-                                if self.stop_requested:
-                                    print(f"Stop requested, cancelling task for chunk {i+1}")
-                                    task.cancel()
-                                    break
-                        else:
-                            # Otherwise, run until complete
-                            print(f"Running process_stream in event loop for chunk {i+1}")
-                            loop.run_until_complete(process_stream())
-                    except Exception as e:
-                        print(f"Error in event loop handling for chunk {i+1}: {str(e)}")
-                        raise
-                    finally:
-                        # Only close the loop if we created it
-                        if loop and not loop.is_running():
-                            try:
-                                loop.close()
-                                print(f"Closed event loop for chunk {i+1}")
-                            except Exception as e:
-                                print(f"Error closing event loop for chunk {i+1}: {str(e)}")
-
-                    # Combine all samples
-                    if all_samples:
-                        samples = np.concatenate(all_samples)
-                        sample_rate = sample_rate_container[0]  # Get the sample rate from the container
-
-                        # Save the audio to a file
-                        sf.write(chunk_path, samples, sample_rate)
-
-                        # Calculate duration
-                        duration = len(samples) / sample_rate
-
-                        # Process the direct timing information
-                        if all_timings:
-                            print(f"Using direct timing information for chunk {i+1}: {len(all_timings)} words")
-                            word_timings = self._process_direct_timings(all_timings, chunk)
-                        else:
-                            # Fallback to heuristic timing if no direct timings
-                            print(f"No direct timing information for chunk {i+1}, using heuristic")
-                            chunk_words = chunk.split()
-                            word_timings = self._extract_word_timings(chunk_words, duration)
-                    else:
-                        # If no samples were collected, fall back to create method
-                        raise Exception("No audio samples collected from stream")
+            except OperationCancelled:
+                # Stale work: neither cached nor played
+                logger.debug("Synthesis of chunk %d/%d cancelled (%s)", i + 1, total_chunks, token.reason)
+                return first_chunk + i, time_offset, False
 
-                except Exception as stream_error:
-                    print(f"Error using create_stream: {str(stream_error)}. Falling back to create method.")
-                    # Fallback to the create method
-                    samples, sample_rate = self.kokoro.create(
-                        chunk, voice=voice, speed=speed, lang="en-us"
-                    )
+            except Exception as e:
+                warnings.warn(f"Failed to synthesize chunk {i}: {str(e)}")
+                # Use fallback for this chunk
+                dummy_audio, word_timings, _ = self._generate_dummy_audio(chunk.text, speed)
+                samples = dummy_audio.astype(np.float32)
+                sample_rate = self.SAMPLE_RATE
+                chunk_path = self._write_chunk_file(first_chunk + i, samples, sample_rate, "chunk_dummy")
+            latency = time.perf_counter() - started_at
+
+            # Adjust timings based on offset, and positions from the chunk to the whole text
+            for timing in word_timings:
+                timing["start"] += time_offset
+                timing["end"] += time_offset
+                if "position" in timing:
+                    timing["position"] += chunk.start
+                if "position_end" in timing:
+                    timing["position_end"] += chunk.start
+
+            # Hand the audio to the player; this waits while playback is far enough behind
+            item = (first_chunk + i, first_chunk + total_chunks, samples, sample_rate, word_timings)
+            if not self._queue_chunk(audio_queue, item, token):
+                return first_chunk + i, time_offset, False
+            self.metrics.record_chunk(self._request_id, len(samples) / sample_rate, latency, cached is not None,
+                                      len(chunk.text))
+
+            # Update the global word timings; only queued chunks count, so synthesis can resume after them
+            self.chunk_start_times.append(time_offset)
+            timing_index.append(word_timings, first_chunk + i)
+
+            # Update the time offset from the true sample count, so timings stay on the output timeline
+            time_offset += len(samples) / sample_rate
+
+            # Call the callback if provided
+            if callback:
+                callback(i, total_chunks, chunk_path, word_timings)
 
-                    # Save the audio to a file
-                    sf.write(chunk_path, samples, sample_rate)
+        return first_chunk + total_chunks, time_offset, True
 
-                    # Calculate duration
-                    duration = len(samples) / sample_rate
+    def text_at_time(self, position: float) -> int:
+        """
+        Find which of the texts played in sequence is playing at a position.
 
-                    # Extract word timings using heuristic method
-                    chunk_words = chunk.split()
-                    word_timings = self._extract_word_timings(chunk_words, duration)
+        Args:
+            position: Position in seconds on the playback timeline.
 
-                # Adjust timings based on offset
-                for timing in word_timings:
-                    timing["start"] += time_offset
-                    timing["end"] += time_offset
+        Returns:
+            Index of the text, 0 for the first one.
+        """
+        return max(0, bisect.bisect_right(self.text_start_times, position) - 1)
 
-                # Add to the queue
-                self.audio_queue.put((i, total_chunks, chunk_path, word_timings))
+    def text_timing_index(self, text_index: int) -> WordTimingIndex:
+        """
+        Get the word timings of one of the texts played in sequence.
 
-                # Update the global word timings
-                all_word_timings.extend(word_timings)
+        Args:
+            text_index: Index of the text, 0 for the first one.
 
-                # Update the time offset
-                duration = word_timings[-1]["end"] - time_offset if word_timings else 0
-                time_offset += duration
+        Returns:
+            Its timing index, with times on the playback timeline and positions
+            relative to the text; empty if the text has not been reached yet.
+        """
+        if 0 <= text_index < len(self.text_timing_indexes):
+            return self.text_timing_indexes[text_index]
+        return WordTimingIndex()
 
-                # Call the callback if provided
-                if callback:
-                    callback(i, total_chunks, chunk_path, word_timings)
+    def _chunk_priority(self) -> Priority:
+        """
+        Get the priority class of the next chunk of the text being played.
 
-            except Exception as e:
-                warnings.warn(f"Failed to synthesize chunk {i}: {str(e)}")
-                # Use fallback for this chunk
-                # Create a file for the audio in the chunks directory
-                chunk_filename = f"chunk_dummy_{i:04d}_{int(time.time())}.wav"
-                chunk_path = os.path.join(self.chunks_dir, chunk_filename)
-                self.chunk_files.append(chunk_path)
+        Returns:
+            SEEK while the listener waits at a position that has not been
+            synthesized, PLAYING while little audio is ready ahead of the
+            listener, and PREFETCH once enough is.
+        """
+        output = self.audio_output
+        if output.seek_pending:
+            return Priority.SEEK
+        ahead = output.buffered_frames() / output.sample_rate + self.audio_queue.buffered_seconds
+        return Priority.PLAYING if ahead < self.URGENT_AHEAD_SECONDS else Priority.PREFETCH
+
+    def _synthesize_chunk_audio(self, chunk: str, voice: str, speed: float, chunk_index: int,
+                                token: Optional[CancellationToken] = None,
+                                priority: Priority = Priority.PLAYING) -> Tuple[np.ndarray, int, List[Dict[str, Union[str, float]]]]:
+        """
+        Run the model on a single chunk of text.
 
-                # Generate dummy audio
-                dummy_audio, dummy_timings, dummy_duration = self._generate_dummy_audio(chunk, speed)
+        Args:
+            chunk: The chunk text.
+            voice: The voice to use.
+            speed: The speed factor.
+            chunk_index: Index of the chunk, used for log messages.
+            token: Optional cancellation token of the synthesis run.
+            priority: Priority class of the model calls on the scheduler.
 
-                # Save to file
-                sf.write(chunk_path, dummy_audio, self.SAMPLE_RATE)
+        Returns:
+            Tuple of (samples, sample_rate, word_timings) with timings relative to the chunk start.
 
-                # Adjust timings based on offset
-                for timing in dummy_timings:
-                    timing["start"] += time_offset
-                    timing["end"] += time_offset
+        Raises:
+            OperationCancelled: If the token is cancelled before the chunk is complete.
+        """
+        # Try to use create_stream to get direct timing information
+        try:
+            # Collect all samples and timings from the stream
+            all_samples, sample_rate, all_timings = self._stream_samples(chunk, voice, speed, f"chunk {chunk_index+1}",
+                                                                         token, priority)
 
-                # Add to the queue
-                self.audio_queue.put((i, total_chunks, chunk_path, dummy_timings))
+            # Combine all samples
+            if all_samples:
+                samples = np.concatenate(all_samples)
 
-                # Update the global word timings
-                all_word_timings.extend(dummy_timings)
+                # Calculate duration
+                duration = len(samples) / sample_rate
 
-                # Update the time offset
-                time_offset += dummy_duration
+                # Process the direct timing information
+                if all_timings:
+                    logger.debug("Using direct timing information for chunk %d: %d words", chunk_index + 1,
+                                 len(all_timings))
+                    word_timings = self._process_direct_timings(all_timings, chunk)
+                else:
+                    # Fallback to heuristic timing if no direct timings
+                    logger.debug("No direct timing information for chunk %d, using heuristic", chunk_index + 1)
+                    word_timings = estimate_word_timings_from_audio(chunk, samples, sample_rate)
+            else:
+                # If no samples were collected, fall back to create method
+                raise Exception("No audio samples collected from stream")
 
-                # Call the callback if provided
-                if callback:
-                    callback(i, total_chunks, chunk_path, dummy_timings)
+        except OperationCancelled:
+            raise
 
-        # Store the complete word timings (both list and dictionary versions)
-        self.word_timings_list = all_word_timings
-        self.word_timings = self._convert_word_timings_to_dict(all_word_timings)
+        except Exception as stream_error:
+            logger.warning("Error using create_stream: %s. Falling back to create method.", stream_error)
+            # Fallback to the create method
+            try:
+                samples, sample_rate = self.synthesis_loop.call(
+                    self.kokoro.create, self._phonemize(chunk), voice=voice, speed=speed, lang="en-us", is_phonemes=True,
+                    priority=priority, token=token
+                ).result()
+            except concurrent.futures.CancelledError:
+                raise OperationCancelled(token.reason if token is not None else None)
+            if token is not None:
+                token.raise_if_cancelled()
 
-        print(f"Final word timings dictionary has {len(self.word_timings)} entries")
+            # Calculate duration
+            duration = len(samples) / sample_rate
 
-        # Mark synthesis as complete
-        self.synthesis_complete = True
+            # Extract word timings using heuristic method
+            word_timings = estimate_word_timings_from_audio(chunk, samples, sample_rate)
+
+        return samples, sample_rate, word_timings
 
     def _play_chunks(self):
-        """Play audio chunks from the queue."""
-        current_chunk = 0
-        chunk_start_time = 0.0
+        """Feed synthesized chunks to the audio output until the text has been played."""
+        audio_queue = self.audio_queue
+        token = self._token
+        started_at = self._session_started_at
+        request_id = self._request_id
+        output = self.audio_output
+
+        while not token.is_cancelled:
+            self.current_position = self.position()
+            self._sample_buffer(output, audio_queue)
+            self._release_played_texts(output)
+
+            if output.is_finished:
+                break
 
-        while not (self.synthesis_complete and self.audio_queue.empty()) and not self.stop_requested:
-            try:
-                # Get the next chunk from the queue
-                chunk_index, total_chunks, audio_path, word_timings = self.audio_queue.get(timeout=0.5)
+            if audio_queue.is_done:
+                output.mark_complete()
+                token.wait(0.05)
+                continue
 
-                # Skip chunks that are out of order
-                if chunk_index < current_chunk:
+            # Leave the rest in the synthesis queue so synthesis does not run too far ahead
+            if output.buffered_frames() > self.PLAYBACK_BUFFER_SECONDS * output.sample_rate:
+                token.wait(0.05)
+                continue
+
+            with self._timeline_lock:
+                # Wait for exactly the next chunk; the timeout keeps the position current
+                item = audio_queue.get(timeout=0.05)
+                if item is None:
                     continue
+                chunk_index, total_chunks, samples, sample_rate, word_timings = item
 
-                # Wait for the correct chunk
-                while chunk_index > current_chunk and not self.stop_requested:
-                    # Put the chunk back in the queue
-                    self.audio_queue.put((chunk_index, total_chunks, audio_path, word_timings))
-                    # Wait a bit
-                    time.sleep(0.1)
-                    # Try to get the correct chunk
-                    chunk_index, total_chunks, audio_path, word_timings = self.audio_queue.get(timeout=0.5)
-
-                # Play the audio
-                if not self.stop_requested:
-                    print(f"Playing chunk {chunk_index+1}/{total_chunks}")
-
-                    # Load the audio
-                    audio, sr = sf.read(audio_path)
-
-                    # Calculate chunk duration
-                    chunk_duration = len(audio) / sr
-
-                    # Set the start time for this chunk
-                    chunk_start_time = word_timings[0]["start"] if word_timings else 0.0
-
-                    # Play the audio
-                    sd.play(audio, sr)
-
-                    # Start time for tracking position
-                    start_time = time.time()
-
-                    # Wait for the audio to finish
-                    while sd.get_stream().active and not self.stop_requested:
-                        # Update current position
-                        if not self.pause_requested:
-                            elapsed = time.time() - start_time
-                            self.current_position = chunk_start_time + elapsed
-
-                        # Handle pause
-                        if self.pause_requested:
-                            # Save position before pausing
-                            pause_time = time.time()
-                            elapsed_before_pause = pause_time - start_time
-
-                            # Stop playback
-                            sd.stop()
-
-                            # Wait while paused
-                            while self.pause_requested and not self.stop_requested:
-                                time.sleep(0.1)
-
-                            # Resume if not stopped
-                            if not self.stop_requested:
-                                # Calculate remaining audio
-                                remaining_time = chunk_duration - elapsed_before_pause
-                                if remaining_time > 0:
-                                    # Calculate position to resume from
-                                    resume_pos = int(elapsed_before_pause * sr)
-                                    if resume_pos < len(audio):
-                                        # Play remaining audio
-                                        sd.play(audio[resume_pos:], sr)
-                                        # Update start time for correct position tracking
-                                        start_time = time.time() - elapsed_before_pause
-
-                        time.sleep(0.1)
-
-                    # Update the current chunk
-                    current_chunk = chunk_index + 1
-
-            except queue.Empty:
-                # No chunks available yet, wait a bit
-                time.sleep(0.1)
-            except Exception as e:
-                warnings.warn(f"Error playing chunk: {str(e)}")
-                time.sleep(0.1)
+                # Skip chunks from a text that has been replaced in the meantime
+                if token.is_cancelled:
+                    break
 
-    def find_chunk_for_position(self, position: float) -> int:
+                try:
+                    output.open(sample_rate)
+                    output.append(samples)
+                except Exception as e:
+                    warnings.warn(f"Error playing chunk: {str(e)}")
+                    break
+
+            logger.debug("Queued chunk %d/%d for playback", chunk_index + 1, total_chunks)
+            self.metrics.first_audio(request_id)
+            if started_at is not None:
+                self._record_restart_latency(time.perf_counter() - started_at)
+                started_at = None
+
+    def _release_played_texts(self, output: AudioOutput):
         """
-        Find the chunk index containing the given position.
+        Free the audio and word timings of texts played to the end more than REWIND_SECONDS ago.
+
+        Continuous reading keeps every text on one timeline; without this its
+        memory would grow with the whole reading session. The texts keep their
+        start times, so positions on the timeline stay valid.
+
+        Args:
+            output: The audio output.
+        """
+        text_start_times = self.text_start_times
+        text_first_chunks = self.text_first_chunks
+        text_timing_indexes = self.text_timing_indexes
+        while (self._released_texts + 1 < min(len(text_start_times), len(text_first_chunks)) and
+               self.current_position - text_start_times[self._released_texts + 1] > self.REWIND_SECONDS):
+            with self._timeline_lock:
+                output.release_chunks(text_first_chunks[self._released_texts + 1])
+                text_timing_indexes[self._released_texts].clear()
+            logger.debug("Released the audio of text %d", self._released_texts + 1)
+            self._released_texts += 1
+
+    def _record_restart_latency(self, latency: float):
+        """
+        Keep the time from replacing a playing text until the first audio of the new one was queued.
+
+        The old text's synthesis gives up the model at the next segment
+        boundary, so this stays within about one segment of synthesis plus
+        the first chunk of the new text.
+
+        Args:
+            latency: Seconds from the start of the new session to its first queued audio.
+        """
+        self.restart_latency = latency
+        logger.info("First audio of the new text queued %.0f ms after replacing the old one", latency * 1000)
+        if latency > self.RESTART_LATENCY_WARNING:
+            warnings.warn(f"Restarting playback took {latency:.2f}s, more than {self.RESTART_LATENCY_WARNING:.1f}s")
+
+    def _sample_buffer(self, output: AudioOutput, audio_queue: ReorderBuffer):
+        """
+        Record how much audio is ready ahead of the listener and how much work is waiting.
+
+        Args:
+            output: The audio output.
+            audio_queue: The queue of the synthesis run.
+        """
+        scheduler = self.synthesis_loop.scheduler
+        self.metrics.record_buffer(
+            output.buffered_frames() / output.sample_rate + audio_queue.buffered_seconds,
+            len(audio_queue),
+            sum(scheduler.pending().values()) if scheduler is not None else 0,
+            output.underruns)
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the pipeline metrics, see core.telemetry.PipelineMetrics.snapshot().
+
+        Returns:
+            Dictionary with counters, gauges and latency summaries, plus the
+            phoneme cache statistics.
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot["phoneme_cache"] = self.phoneme_cache.stats()
+        return snapshot
+
+    def metrics_summary(self) -> str:
+        """Get a one-line description of the pipeline metrics."""
+        snapshot = self.metrics.snapshot()
+        series = snapshot["series"]
+
+        def describe(name: str, unit: str, scale: float = 1.0, digits: int = 0) -> str:
+            stats = series.get(name, {})
+            if "p50" not in stats:
+                return "n/a"
+            return f"{stats['p50'] * scale:.{digits}f}{unit} p50/{stats['p95'] * scale:.{digits}f}{unit} p95"
+
+        return (f"Pipeline: first audio {describe('time_to_first_audio', ' ms', 1000)}, "
+                f"chunk synthesis {describe('synthesis_latency', ' ms', 1000)}, "
+                f"real-time factor {describe('real_time_factor', 'x', digits=2)}, "
+                f"{snapshot['cache_hit_rate']:.0%} cache hits, "
+                f"{snapshot['counters'].get('underruns', 0):.0f} underruns")
+
+    def position(self) -> float:
+        """
+        Get the playback position in seconds from the start of the current text.
+
+        The clock counts the frames the output device has consumed, so it does
+        not drift from the audio. Cheap and safe to call from any thread.
+
+        Returns:
+            Position in seconds.
+        """
+        return self.audio_output.position()
+
+    def seek(self, position: float) -> bool:
+        """
+        Continue playback from a position in the current text.
+
+        Playback resumes at the exact sample, also inside a chunk. The output
+        keeps the chunks played, so this only moves its play cursor; nothing is
+        synthesized or queued again. A position ahead of synthesis starts
+        playing as soon as its audio arrives; one in a text released after
+        continuous reading moved on lands on the earliest audio still kept.
 
         Args:
             position: Position in seconds.
 
         Returns:
-            Chunk index or -1 if not found.
+            True if successful, False otherwise.
         """
-        # Check if we have word timings
-        if not self.word_timings:
-            return -1
+        if position < 0:
+            return False
 
-        # Find the word at the given position
-        word_index = -1
-        for i, timing in enumerate(self.word_timings):
-            if timing["start"] <= position <= timing["end"]:
-                word_index = i
-                break
+        self.audio_output.seek(int(round(position * self.audio_output.sample_rate)))
+        self.current_position = position
+        return True
 
-        if word_index == -1:
-            # If not found, find the closest word before the position
-            for i, timing in enumerate(self.word_timings):
-                if timing["start"] > position:
-                    if i > 0:
-                        word_index = i - 1
-                    break
+    def find_chunk_for_position(self, position: float) -> int:
+        """
+        Find the chunk index containing the given position.
 
-        if word_index == -1:
-            return -1
+        Args:
+            position: Position in seconds.
 
-        # Calculate which chunk this word belongs to
-        chunk_index = word_index // self.chunk_size
-        return chunk_index
+        Returns:
+            Chunk index or -1 if not found.
+        """
+        if not self.chunk_start_times or position < 0:
+            return -1
+        return bisect.bisect_right(self.chunk_start_times, position) - 1
 
     def rewind_to_chunk(self, chunk_index: int) -> bool:
         """
@@ -1078,45 +1614,342 @@ class KokoroOnnxEngine:
         Returns:
             True if successful, False otherwise.
         """
-        # Stop current playback
-        self.pause_requested = True
+        if chunk_index < 0 or chunk_index >= max(self.audio_output.chunk_count, len(self.chunk_spans)):
+            return False
 
-        # Wait a bit for playback to stop
-        time.sleep(0.2)
+        if chunk_index < len(self.chunk_start_times):
+            return self.seek(self.chunk_start_times[chunk_index])
 
-        # Clear the queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Not synthesized yet, so its start time is unknown
+        self.audio_output.seek_to_chunk(chunk_index)
+        return True
 
-        # Find the chunk file
-        chunk_files = [f for f in self.chunk_files if f.endswith('.wav')]
-        if not chunk_files or chunk_index >= len(chunk_files):
+    def apply_edit(self, new_text: str, voice: str = "af_sarah", speed: float = 1.0) -> bool:
+        """
+        Bring the text being played up to date with an edit, synthesizing only what changed.
+
+        The edited text is compared with the played one sentence by sentence.
+        In chunks that have been synthesized, each changed sentence is
+        synthesized on its own and spliced into the audio of its chunk,
+        cut in the pauses around it; chunks not synthesized yet just pick up
+        the new text. Every later chunk and word timing moves by the change
+        in length. The play position and pause state are kept.
+
+        Args:
+            new_text: The edited text.
+            voice: The voice to use.
+            speed: The speed factor.
+
+        Returns:
+            True if the edit was applied, False if the text has to be synthesized
+            again from the start: nothing is playing, playback has moved on to a
+            following text, the model is not loaded, or an edit reaches into
+            another chunk that has been synthesized.
+        """
+        if not self.is_playback_active() or self.kokoro is None or len(self.text_start_times) > 1:
+            return False
+        if new_text == self._session_text:
+            return True
+
+        # Stop synthesis at its next segment boundary, so the chunks below hold still
+        token = self._token
+        self._synthesis_token.cancel("edited")
+        if self._synthesis_thread is not None:
+            self._synthesis_thread.join()
+        if token.is_cancelled:
             return False
 
-        # Add the chunks from the specified index to the queue
-        for i, chunk_file in enumerate(chunk_files[chunk_index:]):
-            # Get the word timings for this chunk
-            chunk_word_timings = []
-            chunk_start = chunk_index * self.chunk_size
-            chunk_end = min(chunk_start + self.chunk_size, len(self.word_timings))
+        synthesis_speed = self._synthesis_speed(speed)
+        try:
+            applied = self._splice_edits(new_text, voice, synthesis_speed, token)
+        except OperationCancelled:
+            return False
 
-            if chunk_start < len(self.word_timings):
-                chunk_word_timings = self.word_timings[chunk_start:chunk_end]
+        # Continue synthesis after the last queued chunk, with the new text if the edit was applied
+        if not self.synthesis_complete:
+            output = self.audio_output
+            time_offset = output.total_frames / output.sample_rate + self.audio_queue.buffered_seconds
+            self._synthesis_token = token.child()
+            self._synthesis_thread = threading.Thread(
+                target=self._synthesize_chunks,
+                args=(self._session_text, voice, speed, None, self._next_text,
+                      (len(self.chunk_start_times), time_offset)),
+                daemon=True
+            )
+            self._synthesis_thread.start()
+        return applied
 
-            # Add to the queue
-            self.audio_queue.put((chunk_index + i, len(chunk_files), chunk_file, chunk_word_timings))
+    def _splice_edits(self, new_text: str, voice: str, speed: float, token: CancellationToken) -> bool:
+        """
+        Apply an edit to the stopped synthesis of the current text.
 
-        # Resume playback
-        self.pause_requested = False
+        Args:
+            new_text: The edited text.
+            voice: The voice to use.
+            speed: The synthesis speed factor.
+            token: Cancellation token of the current text.
+
+        Returns:
+            True if the edit was applied, False if it cannot be without starting over.
+
+        Raises:
+            OperationCancelled: If the text is stopped while sentences are synthesized.
+        """
+        old_text = self._session_text
+        edits = diff_sentences(old_text, new_text)
+        chunks = self.chunk_spans
+        synthesized = len(self.chunk_start_times)
+        if not chunks:
+            return False
+
+        # Each chunk owns the text from its start to the next chunk's start; an edit belongs
+        # to the chunk owning its start, and a later chunk starting inside it gives those words up.
+        # A sentence the chunker cut at a clause is narrowed to the changed words first.
+        chunk_starts = np.array([chunk.start for chunk in chunks], dtype=np.int64)
+
+        def ceded(edit: TextEdit) -> np.ndarray:
+            return np.flatnonzero((chunk_starts > edit.old_start) & (chunk_starts < edit.old_end))
+
+        for number, edit in enumerate(edits):
+            crossed = ceded(edit)
+            if len(crossed) and crossed[0] < synthesized:
+                edits[number] = edit = narrow_edit(edit, old_text, new_text)
+                crossed = ceded(edit)
+                if len(crossed) and crossed[0] < synthesized:
+                    logger.info("Edit spans chunks that were synthesized separately; synthesizing the text again")
+                    return False
+
+        owners = np.maximum(np.searchsorted(chunk_starts, [edit.old_start for edit in edits], side="right") - 1, 0)
+        edits_by_chunk: Dict[int, List[TextEdit]] = {}
+        for edit, owner in zip(edits, owners):
+            edits_by_chunk.setdefault(int(owner), []).append(edit)
+
+        # Synthesize the changed sentences of synthesized chunks first, while playback carries on
+        splices = {}
+        for chunk_index, chunk_edits in edits_by_chunk.items():
+            if chunk_index < synthesized:
+                splices[chunk_index] = self._plan_splice(chunk_index, chunk_edits, new_text, voice, speed, token)
+                if splices[chunk_index] is None:
+                    return False
+        token.raise_if_cancelled()
+
+        with self._timeline_lock:
+            timing_index = self._session_index
+            timing_index.map_positions(lambda positions: map_positions(edits, positions))
+
+            # Back to front, so the word rows of earlier chunks keep their place
+            for chunk_index in sorted(splices, reverse=True):
+                self._apply_splice(chunk_index, splices[chunk_index])
+
+            self.chunk_spans = self._edited_spans(chunks, edits, owners, new_text, synthesized)
+            self._session_text = new_text
+            self.current_text = new_text
+
+        logger.info("Applied %d edits, re-synthesizing sentences in %d chunks", len(edits), len(splices))
         return True
 
+    def _plan_splice(self, chunk_index: int, edits: List[TextEdit], new_text: str, voice: str, speed: float,
+                     token: CancellationToken) -> Optional[Dict[str, Any]]:
+        """
+        Synthesize the edited sentences of a chunk and find where they go in its audio.
+
+        Args:
+            chunk_index: Index of the chunk.
+            edits: The edits owned by the chunk, in text order.
+            new_text: The edited text.
+            voice: The voice to use.
+            speed: The synthesis speed factor.
+            token: Cancellation token of the current text.
+
+        Returns:
+            Dictionary with the old samples, the cuts as (start frame, end frame,
+            new samples, new word timings) and the old positions of the chunk's
+            words; None if the chunk's audio cannot be found.
+
+        Raises:
+            OperationCancelled: If the text is stopped meanwhile.
+        """
+        with self._timeline_lock:
+            item = self.audio_queue.peek(chunk_index)
+            if item is not None:
+                samples, sample_rate = item[2], item[3]
+            elif chunk_index < self.audio_output.chunk_count:
+                samples, sample_rate = self.audio_output.chunk_samples(chunk_index), self.audio_output.sample_rate
+            else:
+                return None
+
+        timing_index = self._session_index
+        rows = np.flatnonzero(timing_index.chunk_ids == chunk_index)
+        positions = timing_index.char_starts[rows].copy()
+        chunk_time = self.chunk_start_times[chunk_index]
+        word_starts = timing_index.starts[rows] - chunk_time
+        word_ends = timing_index.ends[rows] - chunk_time
+        pauses = find_pauses(samples, sample_rate)
+
+        def cut(after_word: int, before_word: int) -> int:
+            """Frame between two words of the chunk, in the pause between them if there is one."""
+            if after_word < 0:
+                return 0
+            if before_word >= len(rows):
+                return len(samples)
+            low, high = word_ends[after_word], word_starts[before_word]
+            middle = (low + high) / 2
+            centers = pauses.mean(axis=1) if len(pauses) else np.zeros(0)
+            inside = centers[(centers >= low) & (centers <= high)]
+            if len(inside):
+                middle = float(inside[np.argmin(np.abs(inside - middle))])
+            return int(round(middle * sample_rate))
+
+        cuts = []
+        for edit in edits:
+            first = int(np.searchsorted(positions, edit.old_start, side="left"))
+            stop = int(np.searchsorted(positions, edit.old_end, side="left"))
+            start_frame = cut(first - 1, first)
+            end_frame = start_frame if stop == first else cut(stop - 1, stop)
+
+            # The replacement without the whitespace around it
+            replacement = new_text[edit.new_start:edit.new_end]
+            offset = edit.new_start + len(replacement) - len(replacement.lstrip())
+            replacement = replacement.strip()
+            new_samples = np.zeros(0, dtype=np.float32)
+            new_timings = []
+            if replacement:
+                logger.debug("Re-synthesizing edited text in chunk %d: %r", chunk_index + 1, replacement[:60])
+                cached = self.synthesis_cache.get(replacement, voice, speed) if self.synthesis_cache is not None else None
+                if cached is not None:
+                    new_samples, new_rate, new_timings = cached
+                else:
+                    new_samples, new_rate, new_timings = self._synthesize_chunk_audio(
+                        replacement, voice, speed, chunk_index, token, Priority.SEEK)
+                    new_samples = np.asarray(new_samples, dtype=np.float32)
+                    if self.synthesis_cache is not None:
+                        self.io_executor.submit(self.synthesis_cache.put, replacement, voice, speed, new_samples,
+                                                new_rate, [dict(timing) for timing in new_timings])
+                if new_rate != sample_rate:
+                    return None
+                for timing in new_timings:
+                    timing["position"] = timing.get("position", 0) + offset
+                    if "position_end" in timing:
+                        timing["position_end"] += offset
+            cuts.append((start_frame, end_frame, new_samples, new_timings))
+
+        return {"samples": samples, "sample_rate": sample_rate, "cuts": cuts,
+                "positions": positions, "edits": edits}
+
+    def _apply_splice(self, chunk_index: int, splice: Dict[str, Any]):
+        """
+        Put the re-synthesized sentences into a chunk and move everything after them.
+
+        Must be called with the timeline lock held, after the word positions
+        have been moved to the new text.
+
+        Args:
+            chunk_index: Index of the chunk.
+            splice: The result of _plan_splice() for the chunk.
+        """
+        samples, sample_rate, cuts = splice["samples"], splice["sample_rate"], splice["cuts"]
+        old_positions, edits = splice["positions"], splice["edits"]
+        chunk_time = self.chunk_start_times[chunk_index]
+        timing_index = self._session_index
+        rows = np.flatnonzero(timing_index.chunk_ids == chunk_index)
+
+        # Words outside every edit keep their audio, moved by the length change of the edits before them
+        old_starts = np.array([edit.old_start for edit in edits])
+        old_ends = np.array([edit.old_end for edit in edits])
+        edit_before = np.searchsorted(old_ends, old_positions, side="right")
+        kept = (edit_before >= len(edits)) | (old_positions < old_starts[np.minimum(edit_before, len(edits) - 1)])
+        frame_shifts = np.concatenate(([0], np.cumsum([len(new) - (end - start) for start, end, new, _ in cuts])))
+
+        pieces = []
+        timings = []
+        previous_end = 0
+        for number, (start_frame, end_frame, new_samples, new_timings) in enumerate(cuts):
+            pieces.append(samples[previous_end:start_frame])
+            for row in rows[kept & (edit_before == number)]:
+                timing = timing_index[int(row)]
+                timings.append(self._shifted_timing(timing, frame_shifts[number] / sample_rate))
+            pieces.append(new_samples)
+            new_start = chunk_time + (start_frame + frame_shifts[number]) / sample_rate
+            for timing in new_timings:
+                timing["start"] += new_start
+                timing["end"] += new_start
+                timings.append(timing)
+            previous_end = end_frame
+        pieces.append(samples[previous_end:])
+        for row in rows[kept & (edit_before == len(cuts))]:
+            timings.append(self._shifted_timing(timing_index[int(row)], frame_shifts[-1] / sample_rate))
+
+        new_samples = np.concatenate(pieces).astype(np.float32)
+        shift = float(frame_shifts[-1]) / sample_rate
+        timing_index.replace_chunk(chunk_index, timings, shift)
+        for index in range(chunk_index + 1, len(self.chunk_start_times)):
+            self.chunk_start_times[index] += shift
+
+        # The chunk is either still waiting for the player or already in the output
+        item = self.audio_queue.peek(chunk_index)
+        if item is not None:
+            self.audio_queue.replace(chunk_index, (item[0], item[1], new_samples, sample_rate, timings),
+                                     len(new_samples) / sample_rate)
+            return
+
+        cursor_chunk, cursor_offset = self.audio_output.cursor()
+        if cursor_chunk == chunk_index:
+            # A cursor in an edited sentence continues at the start of its new version
+            for start_frame, end_frame, new, _ in reversed(cuts):
+                if cursor_offset >= end_frame:
+                    cursor_offset += len(new) - (end_frame - start_frame)
+                elif cursor_offset > start_frame:
+                    cursor_offset = start_frame
+            self.audio_output.replace_chunk(chunk_index, new_samples, cursor_offset)
+        else:
+            self.audio_output.replace_chunk(chunk_index, new_samples)
+
+    @staticmethod
+    def _shifted_timing(timing: Dict[str, Union[str, float]], seconds: float) -> Dict[str, Union[str, float]]:
+        """Copy a word timing of the index, moved in time."""
+        timing = dict(timing)
+        timing.pop("chunk", None)
+        timing["start"] += seconds
+        timing["end"] += seconds
+        return timing
+
+    def _edited_spans(self, chunks: List[TextSpan], edits: List[TextEdit], owners: np.ndarray, new_text: str,
+                      synthesized: int) -> List[TextSpan]:
+        """
+        Move the chunk spans to the edited text.
+
+        Args:
+            chunks: The chunk spans in the old text.
+            edits: The edits.
+            owners: Index of the chunk owning each edit.
+            new_text: The edited text.
+            synthesized: Number of chunks synthesized so far.
+
+        Returns:
+            The chunk spans in the new text. Chunks not synthesized yet that lost
+            all their words are left out.
+        """
+        starts = map_positions(edits, np.array([chunk.start for chunk in chunks]))
+        ends = map_positions(edits, np.array([chunk.end for chunk in chunks]))
+        for edit, owner in zip(edits, owners):
+            starts[owner] = min(starts[owner], edit.new_start)
+            ends[owner] = max(ends[owner], edit.new_end)
+
+        spans = []
+        for index, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            text = new_text[start:end]
+            start += len(text) - len(text.lstrip())
+            end = max(start, end - (len(text) - len(text.rstrip())))
+            if start == end and index >= synthesized:
+                continue
+            spans.append(TextSpan(new_text[start:end], start, end, len(spans)))
+        return spans
+
     def clear_all_cache(self):
         """
         Clear all cached audio files and reset state.
-        This removes all files in the chunks directory and resets the engine state.
+        This removes all files in the chunks directory, empties the persistent
+        synthesis cache and resets the engine state.
         """
         # Stop any ongoing processes
         self.stop_requested = True
@@ -1125,14 +1958,14 @@ class KokoroOnnxEngine:
         self.current_position = 0.0
 
         # Clear the queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.audio_queue.close()
+
+        # Drop the chunks kept for rewinding
+        self.audio_output.clear()
 
         # Clear the chunk files list
         self.chunk_files = []
+        self._rendered_speeds.clear()
 
         # Remove all files in the chunks directory
         try:
@@ -1141,12 +1974,21 @@ class KokoroOnnxEngine:
                     file_path = os.path.join(self.chunks_dir, file)
                     try:
                         os.remove(file_path)
-                        print(f"Removed cached file: {file_path}")
+                        logger.info("Removed cached file: %s", file_path)
                     except Exception as e:
                         warnings.warn(f"Failed to remove file {file_path}: {str(e)}")
         except Exception as e:
             warnings.warn(f"Error clearing cache: {str(e)}")
 
+        # Clear the persistent synthesis cache
+        try:
+            self.synthesis_cache.clear()
+        except Exception as e:
+            warnings.warn(f"Error clearing synthesis cache: {str(e)}")
+
+        # Clear the phonemized sentences
+        self.phoneme_cache.clear()
+
         # Also clear the temp directory
         try:
             for file in os.listdir(self.temp_dir):
@@ -1154,7 +1996,7 @@ class KokoroOnnxEngine:
                     file_path = os.path.join(self.temp_dir, file)
                     try:
                         os.remove(file_path)
-                        print(f"Removed temp file: {file_path}")
+                        logger.info("Removed temp file: %s", file_path)
                     except Exception as e:
                         warnings.warn(f"Failed to remove file {file_path}: {str(e)}")
         except Exception as e:
@@ -1162,7 +2004,7 @@ class KokoroOnnxEngine:
 
     def stop_all_tasks(self):
         """Stop all async tasks and clean up resources."""
-        print("Stopping all TTS engine tasks")
+        logger.info("Stopping all TTS engine tasks")
 
         # Stop any ongoing processes
         self.stop_requested = True
@@ -1170,46 +2012,21 @@ class KokoroOnnxEngine:
 
         # Stop any audio playback
         try:
-            import sounddevice as sd
-            sd.stop()
+            if SOUNDDEVICE_AVAILABLE:
+                sd.stop()
+            self.audio_output.close()
+            self.audio_output.clear()
         except Exception as e:
-            print(f"Error stopping sounddevice: {str(e)}")
+            logger.warning("Error stopping sounddevice: %s", e)
 
-        # Clear any queued audio
-        if hasattr(self, 'audio_queue'):
-            try:
-                while not self.audio_queue.empty():
-                    self.audio_queue.get_nowait()
-            except Exception as e:
-                print(f"Error clearing audio queue: {str(e)}")
+        # Drop any queued audio
+        self.audio_queue.close()
 
-        # Cancel any pending asyncio tasks
+        # Cancel anything still running on the synthesis loop
         try:
-            # Try to get the current event loop safely
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # No running event loop, create a new one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            # Cancel all pending tasks
-            try:
-                for task in asyncio.all_tasks(loop):
-                    if not task.done():
-                        print(f"Cancelling task: {task.get_name()}")
-                        task.cancel()
-            except RuntimeError as e:
-                print(f"Error getting tasks: {str(e)}")
-
-            # Close the loop if we created it
-            if loop.is_running():
-                print("Event loop is running, not closing it")
-            else:
-                print("Closing event loop")
-                loop.close()
+            self.synthesis_loop.cancel_all()
         except Exception as e:
-            print(f"Error handling asyncio tasks: {str(e)}")
+            logger.warning("Error cancelling synthesis tasks: %s", e)
 
     def unload_model(self):
         """Unload the model to free memory and clean up resources."""
@@ -1218,7 +2035,8 @@ class KokoroOnnxEngine:
 
         # Set the model to None to free memory
         if self.kokoro is not None:
-            print("Unloading Kokoro model")
+            logger.info("Unloading Kokoro model")
             self.kokoro = None
+            self.synthesis_loop.stop()
 
-        print("TTS model unloaded successfully")
+        logger.info("TTS model unloaded successfully")
@@ -14,6 +14,13 @@ from collections import deque
 import numpy as np
 import soundfile as sf
 
+from core.phoneme_cache import PhonemeCache
+from core.telemetry import get_logger
+from core.text_chunker import split_sentences
+from core.time_stretch import time_stretch
+from core.timing_estimator import estimate_word_timings_from_audio
+from core.timing_index import WordTimingIndex
+
 # Try to import kokoro, but handle import errors gracefully
 try:
     from kokoro import KPipeline
@@ -23,6 +30,43 @@ except ImportError as e:
     warnings.warn(f"Failed to import kokoro: {str(e)}. TTS functionality will be limited.")
     KOKORO_AVAILABLE = False
 
+logger = get_logger(__name__)
+
+MAX_PHONEME_TOKENS = 510  # KPipeline.generate_from_tokens raises above this
+
+
+def split_phonemes(phonemes: str, max_tokens: int = MAX_PHONEME_TOKENS) -> List[str]:
+    """
+    Cut a phoneme string into pieces the pipeline accepts.
+
+    The pipeline takes one token per phoneme character, so pieces are cut
+    at the spaces between words to at most max_tokens characters. A word
+    longer than that on its own is cut wherever it has to be.
+
+    Args:
+        phonemes: The phoneme string.
+        max_tokens: Maximum tokens per piece.
+
+    Returns:
+        The non-empty pieces, in order.
+    """
+    pieces = []
+    current = ""
+    for word in phonemes.split():
+        while len(word) > max_tokens:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_tokens])
+            word = word[max_tokens:]
+        if current and len(current) + 1 + len(word) > max_tokens:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
 
 class TextChunk:
     """Represents a chunk of text with its associated audio and timing data."""
@@ -79,12 +123,14 @@ class KokoroPipelineEngine:
     MAX_CACHE_CHUNKS = 10  # Maximum number of chunks to keep in cache
     SAMPLE_RATE = 24000  # Kokoro's sample rate
 
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(self, temp_dir: Optional[str] = None, phoneme_db_path: Optional[str] = None):
         """
         Initialize the TTS engine.
 
         Args:
             temp_dir: Directory for temporary files. If None, uses the default.
+            phoneme_db_path: SQLite file that keeps phonemized sentences across starts.
+                             If None, uses a file inside temp_dir.
         """
         self.temp_dir = temp_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'temp')
 
@@ -93,10 +139,14 @@ class KokoroPipelineEngine:
 
         self.pipeline = None
 
+        # Phonemized sentences; the pipeline's G2P differs from espeak, so it keeps its own store
+        self.phoneme_cache = PhonemeCache(db_path=phoneme_db_path or os.path.join(self.temp_dir, 'pipeline_phonemes.sqlite'))
+
         # Cache for processed chunks
         self.chunk_cache = deque(maxlen=self.MAX_CACHE_CHUNKS)
         self.current_text = ""
         self.chunks = []
+        self.timing_index = WordTimingIndex()  # Word timings of all chunks, on the timeline of the text
         self.combined_audio_path = None
 
     def load_model(self):
@@ -294,6 +344,8 @@ class KokoroPipelineEngine:
             all_audio_paths.append(audio_path)
             all_word_timings.extend(chunk.word_timings)
 
+        self._rebuild_timing_index()
+
         # Combine all audio files into one
         combined_audio_path = self._combine_audio_files(all_audio_paths)
         self.combined_audio_path = combined_audio_path
@@ -339,6 +391,7 @@ class KokoroPipelineEngine:
         # Store as a single chunk for consistency
         self.chunks = [TextChunk(text, 0)]
         self.chunks[0].set_audio_data(temp_file.name, word_timings, duration)
+        self._rebuild_timing_index()
 
         return temp_file.name, word_timings
 
@@ -368,23 +421,24 @@ class KokoroPipelineEngine:
 
             # Process the text with Kokoro
             all_audio = []
-            word_positions = []
-            word_count = 0
-
-            # Use the pipeline to generate audio
-            generator = self.pipeline(text, voice=voice)
 
-            for i, (gs, ps, audio) in enumerate(generator):
-                # Collect audio segments
-                all_audio.append(audio)
-
-                # Extract words from this segment
-                segment_text = text.split()[word_count:word_count + len(gs)]
-                word_count += len(gs)
+            if hasattr(self.pipeline, "generate_from_tokens"):
+                # Phonemize through the cache and let the pipeline start from the phonemes, a sentence
+                # at a time, since a whole chunk can be more tokens than the pipeline accepts
+                for start, end in split_sentences(text):
+                    phonemes = self.phoneme_cache.phonemize(text[start:end], self.pipeline.lang_code, self._g2p)
+                    for piece in split_phonemes(phonemes):
+                        for result in self.pipeline.generate_from_tokens(piece, voice=voice):
+                            if result.audio is not None:
+                                all_audio.append(result.audio.numpy() if hasattr(result.audio, "numpy") else result.audio)
+                logger.debug("Phoneme cache: %s", self.phoneme_cache.summary())
+            else:
+                # Use the pipeline to generate audio
+                generator = self.pipeline(text, voice=voice)
 
-                # Store word positions
-                for word in segment_text:
-                    word_positions.append(word)
+                for i, (gs, ps, audio) in enumerate(generator):
+                    # Collect audio segments
+                    all_audio.append(audio)
 
             # Combine all audio segments
             if all_audio:
@@ -392,9 +446,8 @@ class KokoroPipelineEngine:
 
                 # Apply speed adjustment if needed
                 if speed != 1.0:
-                    # Simple resampling for speed adjustment
-                    indices = np.round(np.linspace(0, len(combined_audio) - 1, int(len(combined_audio) / speed))).astype(int)
-                    combined_audio = combined_audio[indices]
+                    # Time-stretch so the voice keeps its pitch
+                    combined_audio = time_stretch(combined_audio, speed)
 
                 # Save the combined audio
                 sf.write(temp_file.name, combined_audio, self.SAMPLE_RATE)
@@ -402,8 +455,8 @@ class KokoroPipelineEngine:
                 # Calculate duration
                 duration = len(combined_audio) / self.SAMPLE_RATE
 
-                # Extract word timings
-                word_timings = self._extract_word_timings(word_positions, duration)
+                # Estimate word timings from the pauses in the audio
+                word_timings = estimate_word_timings_from_audio(text, combined_audio, self.SAMPLE_RATE)
 
                 return temp_file.name, word_timings, duration
             else:
@@ -414,6 +467,21 @@ class KokoroPipelineEngine:
             warnings.warn(f"Failed to synthesize speech: {str(e)}. Using fallback synthesis.")
             return self._dummy_synthesize_chunk(text, speed)
 
+    def _g2p(self, text: str, lang: str) -> str:
+        """
+        Convert text to phonemes with the pipeline's own G2P.
+
+        Args:
+            text: The text to convert.
+            lang: The pipeline language code.
+
+        Returns:
+            The phoneme string.
+        """
+        result = self.pipeline.g2p(text)
+        # The English G2P also returns its tokens; only the phonemes are cached
+        return result[0] if isinstance(result, tuple) else result
+
     def _dummy_synthesize_chunk(self, text: str, speed: float) -> Tuple[str, List[Dict[str, Union[str, float]]], float]:
         """
         Create a dummy audio file for a chunk when TTS is not available.
@@ -608,6 +676,8 @@ class KokoroPipelineEngine:
             chunk.adjust_timings(current_time)
             current_time += chunk.duration
 
+        self._rebuild_timing_index()
+
     def get_chunk_for_position(self, position: float) -> Optional[TextChunk]:
         """
         Get the chunk that contains the given position in the audio.
@@ -633,22 +703,18 @@ class KokoroPipelineEngine:
         Returns:
             The word timing dictionary or None if not found.
         """
-        for timing in self._get_all_word_timings():
-            if timing["start"] <= position <= timing["end"]:
-                return timing
-        return None
-
-    def _get_all_word_timings(self) -> List[Dict[str, Union[str, float]]]:
-        """
-        Get all word timings from all chunks.
+        index = self.timing_index.index_at_time(position)
+        if index < 0:
+            return None
+        timing = self.timing_index[index]
+        return timing if timing["start"] <= position <= timing["end"] else None
 
-        Returns:
-            List of all word timing dictionaries.
-        """
-        all_timings = []
+    def _rebuild_timing_index(self):
+        """Rebuild the word timing index from the word timings of all chunks."""
+        timing_index = WordTimingIndex()
         for chunk in self.chunks:
-            all_timings.extend(chunk.word_timings)
-        return all_timings
+            timing_index.append(chunk.word_timings, chunk.chunk_id)
+        self.timing_index = timing_index
 
     def unload_model(self):
         """Unload the model to free memory."""
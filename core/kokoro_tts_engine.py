@@ -15,6 +15,9 @@ from collections import deque
 import numpy as np
 import soundfile as sf
 
+from core.timing_estimator import estimate_word_timings_from_audio
+from core.timing_index import WordTimingIndex
+
 # Try to import kokoro_onnx, but handle import errors gracefully
 try:
     from kokoro_onnx import Kokoro
@@ -102,6 +105,7 @@ class KokoroTTSEngine:
         self.chunk_cache = deque(maxlen=self.MAX_CACHE_CHUNKS)
         self.current_text = ""
         self.chunks = []
+        self.timing_index = WordTimingIndex()  # Word timings of all chunks, on the timeline of the text
         self.combined_audio_path = None
 
     def load_model(self):
@@ -289,6 +293,8 @@ class KokoroTTSEngine:
             all_audio_paths.append(audio_path)
             all_word_timings.extend(chunk.word_timings)
 
+        self._rebuild_timing_index()
+
         # Combine all audio files into one
         combined_audio_path = self._combine_audio_files(all_audio_paths)
         self.combined_audio_path = combined_audio_path
@@ -334,6 +340,7 @@ class KokoroTTSEngine:
         # Store as a single chunk for consistency
         self.chunks = [TextChunk(text, 0)]
         self.chunks[0].set_audio_data(temp_file.name, word_timings, duration)
+        self._rebuild_timing_index()
 
         return temp_file.name, word_timings
 
@@ -373,8 +380,8 @@ class KokoroTTSEngine:
         # Calculate duration
         duration = len(samples) / sample_rate
 
-        # Extract word timings
-        word_timings = self._extract_word_timings(text, duration)
+        # Estimate word timings from the pauses in the audio
+        word_timings = estimate_word_timings_from_audio(text, samples, sample_rate)
 
         return temp_file.name, word_timings, duration
 
@@ -575,6 +582,8 @@ class KokoroTTSEngine:
             chunk.adjust_timings(current_time)
             current_time += chunk.duration
 
+        self._rebuild_timing_index()
+
     def get_chunk_for_position(self, position: float) -> Optional[TextChunk]:
         """
         Get the chunk that contains the given position in the audio.
@@ -600,22 +609,18 @@ class KokoroTTSEngine:
         Returns:
             The word timing dictionary or None if not found.
         """
-        for timing in self._get_all_word_timings():
-            if timing["start"] <= position <= timing["end"]:
-                return timing
-        return None
-
-    def _get_all_word_timings(self) -> List[Dict[str, Union[str, float]]]:
-        """
-        Get all word timings from all chunks.
+        index = self.timing_index.index_at_time(position)
+        if index < 0:
+            return None
+        timing = self.timing_index[index]
+        return timing if timing["start"] <= position <= timing["end"] else None
 
-        Returns:
-            List of all word timing dictionaries.
-        """
-        all_timings = []
+    def _rebuild_timing_index(self):
+        """Rebuild the word timing index from the word timings of all chunks."""
+        timing_index = WordTimingIndex()
         for chunk in self.chunks:
-            all_timings.extend(chunk.word_timings)
-        return all_timings
+            timing_index.append(chunk.word_timings, chunk.chunk_id)
+        self.timing_index = timing_index
 
     def unload_model(self):
         """Unload the model to free memory."""
@@ -0,0 +1,227 @@
+"""
+ONNX session module for the Audiobook Reader application.
+Builds the ONNX Runtime session behind the Kokoro model from user-facing
+settings: thread counts, graph optimization level and execution mode.
+The optimized graph can be kept in a sidecar file so later starts skip
+graph optimization.
+"""
+
+import os
+import glob
+import hashlib
+import warnings
+from typing import Any, Dict, Optional
+
+from core.synthesis_cache import model_fingerprint
+from core.voice_bank import VoiceBank, ensure_voice_bank
+
+# Try to import onnxruntime and kokoro_onnx, but handle import errors gracefully
+try:
+    import onnxruntime as ort
+    from kokoro_onnx import Kokoro
+    KOKORO_AVAILABLE = True
+except ImportError as e:
+    warnings.warn(f"Failed to import kokoro_onnx: {str(e)}. ONNX sessions will not be available.")
+    KOKORO_AVAILABLE = False
+
+
+# Settings as stored under "onnx_settings" in the application state
+DEFAULT_SESSION_SETTINGS: Dict[str, Any] = {
+    "intra_op_threads": 0,  # 0 lets ONNX Runtime use every core
+    "inter_op_threads": 0,
+    "graph_optimization": "all",  # "disabled", "basic", "extended" or "all"
+    "execution_mode": "sequential",  # "sequential" or "parallel"
+    "warm_up": True,  # Load and warm the model in the background at start-up
+    "batch_background": False  # Pre-render nearby pages with packed multi-chunk model calls
+}
+
+# The settings that shape the session itself; the others only change how it is used
+SESSION_KEYS = ("intra_op_threads", "inter_op_threads", "graph_optimization", "execution_mode")
+
+GRAPH_OPTIMIZATION_LEVELS = ["disabled", "basic", "extended", "all"]
+EXECUTION_MODES = ["sequential", "parallel"]
+
+
+def normalize_session_settings(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fill in defaults and replace invalid values in session settings.
+
+    Args:
+        settings: Settings to normalize, possibly partial or None.
+
+    Returns:
+        A complete settings dictionary.
+    """
+    normalized = dict(DEFAULT_SESSION_SETTINGS)
+    normalized.update(settings or {})
+
+    for key in ("intra_op_threads", "inter_op_threads"):
+        try:
+            normalized[key] = max(0, int(normalized[key]))
+        except (TypeError, ValueError):
+            normalized[key] = DEFAULT_SESSION_SETTINGS[key]
+
+    if normalized["graph_optimization"] not in GRAPH_OPTIMIZATION_LEVELS:
+        normalized["graph_optimization"] = DEFAULT_SESSION_SETTINGS["graph_optimization"]
+    if normalized["execution_mode"] not in EXECUTION_MODES:
+        normalized["execution_mode"] = DEFAULT_SESSION_SETTINGS["execution_mode"]
+    normalized["warm_up"] = bool(normalized["warm_up"])
+    normalized["batch_background"] = bool(normalized["batch_background"])
+
+    return normalized
+
+
+def create_session_options(settings: Optional[Dict[str, Any]] = None) -> "ort.SessionOptions":
+    """
+    Create ONNX Runtime session options from settings.
+
+    Args:
+        settings: Session settings, see DEFAULT_SESSION_SETTINGS.
+
+    Returns:
+        The session options.
+    """
+    settings = normalize_session_settings(settings)
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = settings["intra_op_threads"]
+    options.inter_op_num_threads = settings["inter_op_threads"]
+    options.graph_optimization_level = {
+        "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    }[settings["graph_optimization"]]
+    options.execution_mode = {
+        "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+        "parallel": ort.ExecutionMode.ORT_PARALLEL
+    }[settings["execution_mode"]]
+    return options
+
+
+def optimized_model_path(model_path: str, settings: Optional[Dict[str, Any]] = None,
+                         optimized_dir: Optional[str] = None) -> str:
+    """
+    Get the sidecar path of the optimized graph of a model.
+
+    The name carries a key built from the model fingerprint, the ONNX Runtime
+    version and the optimization level, so a changed model or runtime never
+    picks up a sidecar written for another one.
+
+    Args:
+        model_path: Path to the original model file.
+        settings: Session settings, see DEFAULT_SESSION_SETTINGS.
+        optimized_dir: Directory for the sidecar. If None, uses the model's directory.
+
+    Returns:
+        Path of the sidecar file.
+    """
+    settings = normalize_session_settings(settings)
+    identity = f"{model_fingerprint(model_path)}|{ort.__version__}|{settings['graph_optimization']}"
+    key = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(optimized_dir or os.path.dirname(model_path), f"{stem}.{key}.optimized.onnx")
+
+
+def _remove_stale_sidecars(sidecar_path: str, model_path: str):
+    """Remove sidecars of the same model written for another model version or runtime."""
+    stem = glob.escape(os.path.splitext(os.path.basename(model_path))[0])
+    pattern = os.path.join(os.path.dirname(sidecar_path), f"{stem}.*.optimized.onnx")
+    for path in glob.glob(pattern):
+        if path != sidecar_path:
+            try:
+                os.remove(path)
+                print(f"Removed stale optimized model: {path}")
+            except OSError as e:
+                warnings.warn(f"Failed to remove stale optimized model {path}: {str(e)}")
+
+
+def create_session(model_path: str, settings: Optional[Dict[str, Any]] = None,
+                   optimized_dir: Optional[str] = None) -> "ort.InferenceSession":
+    """
+    Create an ONNX Runtime session for a model.
+
+    With an optimized_dir, the first session saves its optimized graph there
+    and later sessions load it with graph optimization turned off. A sidecar
+    that fails to load is removed and the original model is used instead.
+
+    Args:
+        model_path: Path to the model file.
+        settings: Session settings, see DEFAULT_SESSION_SETTINGS.
+        optimized_dir: Directory for the optimized graph sidecar. If None,
+                       the graph is optimized on every start.
+
+    Returns:
+        The inference session.
+    """
+    settings = normalize_session_settings(settings)
+    providers = ["CPUExecutionProvider"]
+
+    if optimized_dir is None or settings["graph_optimization"] == "disabled":
+        return ort.InferenceSession(model_path, sess_options=create_session_options(settings), providers=providers)
+
+    sidecar_path = optimized_model_path(model_path, settings, optimized_dir)
+
+    if os.path.exists(sidecar_path):
+        # The sidecar is already optimized; optimizing it again would only cost time
+        options = create_session_options(dict(settings, graph_optimization="disabled"))
+        try:
+            session = ort.InferenceSession(sidecar_path, sess_options=options, providers=providers)
+            print(f"Loaded optimized model from {sidecar_path}")
+            return session
+        except Exception as e:
+            warnings.warn(f"Failed to load optimized model {sidecar_path}: {str(e)}. Using the original model.")
+            try:
+                os.remove(sidecar_path)
+            except OSError:
+                pass
+
+    # Write under a private name first, so a concurrent start never reads a half-written sidecar
+    os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+    temp_path = f"{sidecar_path[:-len('.onnx')]}.{os.getpid()}.tmp.onnx"
+    options = create_session_options(settings)
+    options.optimized_model_filepath = temp_path
+    session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+    try:
+        os.replace(temp_path, sidecar_path)
+        print(f"Saved optimized model to {sidecar_path}")
+        _remove_stale_sidecars(sidecar_path, model_path)
+    except OSError as e:
+        warnings.warn(f"Failed to save optimized model {sidecar_path}: {str(e)}")
+
+    return session
+
+
+def create_kokoro(model_path: str, voices_path: str, settings: Optional[Dict[str, Any]] = None,
+                  optimized_dir: Optional[str] = None) -> "Kokoro":
+    """
+    Create a Kokoro model with its own ONNX Runtime session.
+
+    A voices.json file is converted to a voice bank on first use, and the
+    model reads its style vectors from the memory-mapped bank.
+
+    Args:
+        model_path: Path to the Kokoro model file.
+        voices_path: Path to the voices file or voice bank.
+        settings: Session settings, see DEFAULT_SESSION_SETTINGS.
+        optimized_dir: Directory for the optimized graph sidecar, see create_session().
+
+    Returns:
+        The Kokoro model.
+
+    Raises:
+        RuntimeError: If kokoro_onnx is not available.
+    """
+    if not KOKORO_AVAILABLE:
+        raise RuntimeError("Cannot create session: kokoro_onnx is not available")
+
+    session = create_session(model_path, settings, optimized_dir)
+    bank_path = ensure_voice_bank(voices_path)
+    kokoro = Kokoro.from_session(session, bank_path)
+
+    # Kokoro opens the bank with np.load; swap in the memory-mapped view and release that handle
+    if hasattr(kokoro.voices, "close"):
+        kokoro.voices.close()
+    kokoro.voices = VoiceBank(bank_path)
+    return kokoro
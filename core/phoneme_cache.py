@@ -0,0 +1,212 @@
+"""
+Phoneme cache module for the Audiobook Reader application.
+Memoizes grapheme-to-phoneme conversion per sentence, so the chapter
+headers, names and dialogue tags a book repeats are phonemized only once.
+Keeps a bounded LRU in memory and, optionally, a SQLite store on disk.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Union
+
+from core.synthesis_cache import normalize_text
+from core.text_chunker import split_sentences
+
+
+class PhonemeCache:
+    """LRU cache of normalized text segment to phoneme string."""
+
+    DEFAULT_MAX_ENTRIES = 20000
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None):
+        """
+        Initialize the phoneme cache.
+
+        Args:
+            max_entries: Number of segments kept in memory.
+            db_path: Optional SQLite file that keeps phonemes across restarts.
+        """
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0  # Time spent phonemizing the misses
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS phonemes (key TEXT PRIMARY KEY, phonemes TEXT NOT NULL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                warnings.warn(f"Failed to open phoneme store {db_path}: {str(e)}. Using the in-memory cache only.")
+                self._db = None
+
+    @staticmethod
+    def make_key(segment: str, lang: str) -> str:
+        """
+        Build the cache key of a text segment.
+
+        Args:
+            segment: The text segment.
+            lang: The phonemizer language.
+
+        Returns:
+            The cache key.
+        """
+        return f"{lang}\n{normalize_text(segment)}"
+
+    def get(self, segment: str, lang: str) -> Optional[str]:
+        """
+        Look up the phonemes of a text segment.
+
+        Args:
+            segment: The text segment.
+            lang: The phonemizer language.
+
+        Returns:
+            The phoneme string, or None if the segment is not cached.
+        """
+        key = self.make_key(segment, lang)
+        with self._lock:
+            phonemes = self._entries.get(key)
+            if phonemes is not None:
+                self._entries.move_to_end(key)
+                return phonemes
+
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute("SELECT phonemes FROM phonemes WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                warnings.warn(f"Failed to read phoneme store: {str(e)}")
+                return None
+            if row is None:
+                return None
+
+            self._remember_locked(key, row[0])
+            return row[0]
+
+    def put(self, segment: str, lang: str, phonemes: str):
+        """
+        Store the phonemes of a text segment.
+
+        Args:
+            segment: The text segment.
+            lang: The phonemizer language.
+            phonemes: The phoneme string.
+        """
+        key = self.make_key(segment, lang)
+        with self._lock:
+            self._remember_locked(key, phonemes)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO phonemes (key, phonemes) VALUES (?, ?)", (key, phonemes))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    warnings.warn(f"Failed to write phoneme store: {str(e)}")
+
+    def _remember_locked(self, key: str, phonemes: str):
+        """Add an entry to the in-memory LRU. Must be called with the lock held."""
+        self._entries[key] = phonemes
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def phonemize(self, text: str, lang: str, phonemizer: Callable[[str, str], str]) -> str:
+        """
+        Phonemize a text sentence by sentence, using the cache where possible.
+
+        Args:
+            text: The text to phonemize.
+            lang: The phonemizer language.
+            phonemizer: Callable taking (text, lang) and returning phonemes,
+                        used for the sentences that are not cached.
+
+        Returns:
+            The phoneme string of the whole text.
+        """
+        parts = []
+        for start, end in split_sentences(text):
+            segment = text[start:end]
+            phonemes = self.get(segment, lang)
+            if phonemes is None:
+                start_time = time.perf_counter()
+                phonemes = phonemizer(segment, lang)
+                elapsed = time.perf_counter() - start_time
+                self.put(segment, lang, phonemes)
+                with self._lock:
+                    self.misses += 1
+                    self.miss_seconds += elapsed
+            else:
+                with self._lock:
+                    self.hits += 1
+            if phonemes:
+                parts.append(phonemes)
+        return " ".join(parts)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of segment lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        """Estimated phonemizer time saved, from the average cost of a miss."""
+        return self.hits * self.miss_seconds / self.misses if self.misses else 0.0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get the cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, miss_seconds, seconds_saved and entries.
+        """
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "miss_seconds": self.miss_seconds,
+            "seconds_saved": self.seconds_saved,
+            "entries": entries
+        }
+
+    def summary(self) -> str:
+        """Get a one-line description of the cache effectiveness."""
+        return (f"Phoneme cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate), "
+                f"about {self.seconds_saved:.2f}s of phonemization saved")
+
+    def clear(self):
+        """Remove every cached segment, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM phonemes")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    warnings.warn(f"Failed to clear phoneme store: {str(e)}")
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        """Number of segments kept in memory."""
+        return len(self._entries)
@@ -0,0 +1,183 @@
+"""
+Reorder buffer module for the Audiobook Reader application.
+Hands synthesized chunks to the player strictly in order, whatever order
+they are produced in, and holds producers back once enough audio is ready
+ahead of playback, so memory stays bounded and nobody polls.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from core.cancellation import CancellationToken
+
+
+class ReorderBuffer:
+    """Bounded buffer of sequence-numbered items, consumed in sequence order."""
+
+    DEFAULT_AHEAD_SECONDS = 20.0
+
+    def __init__(self, ahead_seconds: float = DEFAULT_AHEAD_SECONDS, first_sequence: int = 0):
+        """
+        Initialize the buffer.
+
+        Args:
+            ahead_seconds: Seconds of audio the buffer may hold before producers
+                           have to wait.
+            first_sequence: Sequence number of the first item the consumer takes.
+        """
+        self.ahead_seconds = ahead_seconds
+        self._condition = threading.Condition()
+        self._items: Dict[int, Tuple[Any, float]] = {}
+        self._next = first_sequence
+        self._buffered_seconds = 0.0
+        self._end: Optional[int] = None  # Sequence number after the last item, once known
+        self._closed = False
+
+    def put(self, sequence: int, item: Any, seconds: float, timeout: Optional[float] = None,
+            token: Optional[CancellationToken] = None) -> bool:
+        """
+        Add an item, waiting while the buffer already holds enough audio.
+
+        The item the consumer is waiting for never waits, so items produced
+        out of order cannot fill the buffer and starve it. An item older than
+        the consumer's position is dropped.
+
+        Args:
+            sequence: Sequence number of the item.
+            item: The item.
+            seconds: Duration of the audio in the item.
+            timeout: Maximum time to wait in seconds, or None to wait as long as needed.
+            token: Optional cancellation token of the producer; cancelling it ends the wait.
+
+        Returns:
+            True if the item was added, False if the buffer was closed, the
+            token cancelled, the timeout passed or the item was stale.
+        """
+        def cancelled() -> bool:
+            return token is not None and token.is_cancelled
+
+        if token is not None:
+            token.add_callback(self._wake)
+        try:
+            with self._condition:
+                ready = self._condition.wait_for(
+                    lambda: (self._closed or cancelled() or sequence <= self._next or
+                             self._buffered_seconds < self.ahead_seconds),
+                    timeout)
+                if not ready or self._closed or cancelled() or sequence < self._next or sequence in self._items:
+                    return False
+
+                self._items[sequence] = (item, seconds)
+                self._buffered_seconds += seconds
+                self._condition.notify_all()
+                return True
+        finally:
+            if token is not None:
+                token.remove_callback(self._wake)
+
+    def replace(self, sequence: int, item: Any, seconds: float) -> bool:
+        """
+        Swap an item that is still waiting in the buffer for a new version.
+
+        Args:
+            sequence: Sequence number of the item.
+            item: The new item.
+            seconds: Duration of the audio in the new item.
+
+        Returns:
+            True if the item was replaced, False if it is not in the buffer.
+        """
+        with self._condition:
+            if sequence not in self._items:
+                return False
+            _, old_seconds = self._items[sequence]
+            self._items[sequence] = (item, seconds)
+            self._buffered_seconds = max(0.0, self._buffered_seconds - old_seconds + seconds)
+            self._condition.notify_all()
+            return True
+
+    def peek(self, sequence: int) -> Optional[Any]:
+        """
+        Look at an item waiting in the buffer without taking it.
+
+        Args:
+            sequence: Sequence number of the item.
+
+        Returns:
+            The item, or None if it is not in the buffer.
+        """
+        with self._condition:
+            entry = self._items.get(sequence)
+            return None if entry is None else entry[0]
+
+    def _wake(self):
+        """Wake every waiting producer and consumer to check their conditions again."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the next item in sequence, waiting until it arrives.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait as long as needed.
+
+        Returns:
+            The item, or None if the timeout passed, the buffer was closed or
+            every item has been taken.
+        """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: self._closed or self._next in self._items or self.is_done, timeout)
+            if not ready or self._closed or self._next not in self._items:
+                return None
+
+            item, seconds = self._items.pop(self._next)
+            self._next += 1
+            self._buffered_seconds = max(0.0, self._buffered_seconds - seconds)
+            # Room for producers, and maybe the end has been reached
+            self._condition.notify_all()
+            return item
+
+    def finish(self, end_sequence: int):
+        """
+        Signal that no items from end_sequence on will be added.
+
+        Args:
+            end_sequence: Sequence number after the last item.
+        """
+        with self._condition:
+            self._end = end_sequence
+            self._condition.notify_all()
+
+    def close(self):
+        """Wake every waiting producer and consumer and refuse further items."""
+        with self._condition:
+            self._closed = True
+            self._items.clear()
+            self._buffered_seconds = 0.0
+            self._condition.notify_all()
+
+    @property
+    def is_done(self) -> bool:
+        """Whether every item up to the end has been taken."""
+        return self._end is not None and self._next >= self._end
+
+    @property
+    def closed(self) -> bool:
+        """Whether the buffer has been closed."""
+        return self._closed
+
+    @property
+    def next_sequence(self) -> int:
+        """Sequence number of the item the consumer takes next."""
+        return self._next
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Seconds of audio waiting in the buffer."""
+        return self._buffered_seconds
+
+    def __len__(self) -> int:
+        """Number of items waiting in the buffer."""
+        return len(self._items)
@@ -0,0 +1,233 @@
+"""
+Scheduler module for the Audiobook Reader application.
+All model work runs through one priority scheduler. Every job carries a
+priority class, so the audio the listener is about to hear never waits
+behind pre-fetching, and since long syntheses are submitted one segment
+at a time, more urgent work overtakes them at the next segment boundary.
+"""
+
+import heapq
+import itertools
+import contextlib
+import threading
+import concurrent.futures
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.cancellation import CancellationToken
+
+
+class Priority(IntEnum):
+    """Priority classes of model work, most urgent first."""
+
+    PLAYING = 0  # Audio the listener is about to hear
+    SEEK = 1  # Audio at a position the listener jumped to
+    NEXT_PAGE = 2  # The page after the one being read
+    PREFETCH = 3  # Synthesis further ahead, and nearby pages
+    OFFLINE = 4  # Whole-book rendering
+
+
+# Priority and cancellation token of the work submitted from the current context.
+# asyncio tasks copy the context, so setting it in a coroutine also covers the
+# executor jobs the model library starts from that coroutine.
+_current_job: ContextVar[Tuple[Priority, Optional[CancellationToken]]] = ContextVar(
+    "synthesis_job", default=(Priority.PLAYING, None))
+
+
+def set_job_context(priority: Priority, token: Optional[CancellationToken] = None):
+    """
+    Set the priority and token of jobs submitted from the current context.
+
+    Args:
+        priority: Priority class of the work.
+        token: Optional cancellation token; its jobs are dropped once it is cancelled.
+    """
+    _current_job.set((Priority(priority), token))
+
+
+class _Job:
+    """A queued call with its future."""
+
+    __slots__ = ("future", "fn", "args", "kwargs", "priority", "token", "on_cancel")
+
+    def __init__(self, future: concurrent.futures.Future, fn: Callable, args: tuple, kwargs: dict,
+                 priority: Priority, token: Optional[CancellationToken]):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.token = token
+        self.on_cancel = None
+
+
+class PriorityScheduler(concurrent.futures.ThreadPoolExecutor):
+    """
+    Executor that runs the most urgent queued job first, oldest first within a class.
+
+    A ThreadPoolExecutor only so asyncio accepts it as the default executor
+    of an event loop; it keeps its own queue and worker threads.
+    """
+
+    def __init__(self, max_workers: int = 1, name: str = "SynthesisScheduler"):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Number of jobs that run at the same time. The model is
+                         not safe to use concurrently, so this is normally 1.
+            name: Name prefix of the worker threads.
+        """
+        self._queue: List[Tuple[int, int, _Job]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._reserved: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+        self.completed: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.dropped: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+        self._threads = [threading.Thread(target=self._worker, name=f"{name}Worker{i}", daemon=True)
+                         for i in range(max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Queue a call with the priority and token of the current context.
+
+        Args:
+            fn: The function to run.
+            *args: Arguments to pass to the function.
+            **kwargs: Keyword arguments to pass to the function.
+
+        Returns:
+            A future resolving to the function's result.
+        """
+        priority, token = _current_job.get()
+        return self.submit_job(priority, token, fn, *args, **kwargs)
+
+    def submit_job(self, priority: Priority, token: Optional[CancellationToken], fn: Callable, /,
+                   *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Queue a call with an explicit priority and token.
+
+        Args:
+            priority: Priority class of the call.
+            token: Optional cancellation token; cancelling it drops the call if it
+                   has not started.
+            fn: The function to run.
+            *args: Arguments to pass to the function.
+            **kwargs: Keyword arguments to pass to the function.
+
+        Returns:
+            A future resolving to the function's result.
+
+        Raises:
+            RuntimeError: If the scheduler has been shut down.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        job = _Job(future, fn, args, kwargs, Priority(priority), token)
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new jobs after shutdown")
+            heapq.heappush(self._queue, (job.priority, next(self._sequence), job))
+            self._condition.notify()
+
+        if token is not None:
+            # Stale work gives up its place at once, not when it reaches the front
+            job.on_cancel = future.cancel
+            token.add_callback(job.on_cancel)
+        return future
+
+    @contextlib.contextmanager
+    def reserve(self, priority: Priority) -> Iterator[None]:
+        """
+        Hold back less urgent jobs while a job made of several segments runs.
+
+        Between two segments of a stream the next one has not been submitted
+        yet; without a reservation a queued prefetch job would slip into
+        that gap every time.
+
+        Args:
+            priority: Priority class of the stream.
+        """
+        priority = Priority(priority)
+        with self._condition:
+            self._reserved[priority] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reserved[priority] -= 1
+                self._condition.notify_all()
+
+    def _runnable_locked(self) -> bool:
+        """Whether the front job may run now. Must be called with the condition held."""
+        priority, _, job = self._queue[0]
+        if self._shutdown or job.future.cancelled():
+            return True
+        # Nothing less urgent than a reserved class runs until its stream ends
+        return not any(self._reserved[reserved] for reserved in Priority if reserved < priority)
+
+    def _worker(self):
+        """Run queued jobs until shutdown."""
+        while True:
+            with self._condition:
+                while not (self._queue and self._runnable_locked()):
+                    if self._shutdown and not self._queue:
+                        return
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._queue)
+
+            if job.token is not None:
+                job.token.remove_callback(job.on_cancel)
+
+            if (job.token is not None and job.token.is_cancelled) or not job.future.set_running_or_notify_cancel():
+                job.future.cancel()
+                self.dropped[job.priority] += 1
+                continue
+
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+            self.completed[job.priority] += 1
+
+    def pending(self) -> Dict[Priority, int]:
+        """Get the number of queued jobs of every priority class."""
+        counts = {priority: 0 for priority in Priority}
+        with self._condition:
+            for priority, _, job in self._queue:
+                if not job.future.cancelled():
+                    counts[priority] += 1
+        return counts
+
+    def summary(self) -> str:
+        """Get a one-line description of the work done per priority class."""
+        return "Scheduler: " + ", ".join(
+            f"{priority.name.lower()} {self.completed[priority]} run/{self.dropped[priority]} dropped"
+            for priority in Priority)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """
+        Stop the worker threads once the queue is empty.
+
+        Args:
+            wait: Whether to wait for the worker threads to finish.
+            cancel_futures: Whether to cancel the jobs that have not started.
+        """
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for _, _, job in self._queue:
+                    job.future.cancel()
+            self._condition.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
@@ -11,6 +11,10 @@ from typing import Dict, List, Tuple, Union
 import numpy as np
 import soundfile as sf
 
+from core.time_stretch import time_stretch
+from core.timing_estimator import estimate_word_timings_from_audio
+from core.timing_index import WordTimingIndex
+
 # Try to import kokoro, but handle import errors gracefully
 try:
     from kokoro import KPipeline
@@ -39,7 +43,7 @@ class SimpleKokoroEngine:
         
         self.pipeline = None
         self.current_text = ""
-        self.word_timings = []
+        self.timing_index = WordTimingIndex()
     
     def load_model(self):
         """Load the Kokoro model."""
@@ -97,8 +101,6 @@ class SimpleKokoroEngine:
             
             # Process the text with Kokoro
             all_audio = []
-            word_positions = []
-            word_count = 0
             
             # Use the pipeline to generate audio
             generator = self.pipeline(text, voice=voice)
@@ -106,14 +108,6 @@ class SimpleKokoroEngine:
             for i, (gs, ps, audio) in enumerate(generator):
                 # Collect audio segments
                 all_audio.append(audio)
-                
-                # Extract words from this segment
-                segment_text = text.split()[word_count:word_count + len(gs)]
-                word_count += len(gs)
-                
-                # Store word positions
-                for word in segment_text:
-                    word_positions.append(word)
             
             # Combine all audio segments
             if all_audio:
@@ -121,9 +115,8 @@ class SimpleKokoroEngine:
                 
                 # Apply speed adjustment if needed
                 if speed != 1.0:
-                    # Simple resampling for speed adjustment
-                    indices = np.round(np.linspace(0, len(combined_audio) - 1, int(len(combined_audio) / speed))).astype(int)
-                    combined_audio = combined_audio[indices]
+                    # Time-stretch so the voice keeps its pitch
+                    combined_audio = time_stretch(combined_audio, speed)
                 
                 # Save the combined audio
                 sf.write(temp_file.name, combined_audio, self.SAMPLE_RATE)
@@ -131,9 +124,9 @@ class SimpleKokoroEngine:
                 # Calculate duration
                 duration = len(combined_audio) / self.SAMPLE_RATE
                 
-                # Extract word timings
-                word_timings = self._extract_word_timings(word_positions, duration)
-                self.word_timings = word_timings
+                # Estimate word timings from the pauses in the audio
+                word_timings = estimate_word_timings_from_audio(text, combined_audio, self.SAMPLE_RATE)
+                self.timing_index = WordTimingIndex(word_timings)
                 
                 return temp_file.name, word_timings
             else:
@@ -180,7 +173,7 @@ class SimpleKokoroEngine:
             })
             current_time += word_duration
         
-        self.word_timings = word_timings
+        self.timing_index = WordTimingIndex(word_timings)
         
         return temp_file.name, word_timings
     
@@ -235,10 +228,11 @@ class SimpleKokoroEngine:
         Returns:
             The word timing dictionary or None if not found.
         """
-        for timing in self.word_timings:
-            if timing["start"] <= position <= timing["end"]:
-                return timing
-        return None
+        index = self.timing_index.index_at_time(position)
+        if index < 0:
+            return None
+        timing = self.timing_index[index]
+        return timing if timing["start"] <= position <= timing["end"] else None
     
     def unload_model(self):
         """Unload the model to free memory."""
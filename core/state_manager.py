@@ -56,7 +56,8 @@ class StateManager:
             "edited_files": {},  # Map of original file path to edited file path
             "tts_settings": {
                 "voice": "default",
-                "speed": 1.0
+                "speed": 1.0,
+                "continuous": False  # Read on across pages
             },
             "stt_settings": {
                 "model": "base",
@@ -0,0 +1,287 @@
+"""
+Synthesis cache module for the Audiobook Reader application.
+Stores synthesized PCM together with its word timings on disk so that
+replaying text we have already heard does not run the TTS model again.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+import warnings
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.text_aligner import align_word_timings
+
+
+def model_fingerprint(model_path: Optional[str]) -> str:
+    """
+    Build a cheap identity string for a model file.
+
+    Hashing a multi-hundred-megabyte model on every launch is too slow, so the
+    file name, size and modification time stand in for its content.
+
+    Args:
+        model_path: Path to the model file.
+
+    Returns:
+        Fingerprint string for the model.
+    """
+    if not model_path:
+        return ""
+    try:
+        stat = os.stat(model_path)
+        return f"{os.path.basename(model_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return os.path.basename(model_path)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before it is used as part of a cache key.
+
+    Args:
+        text: The text to normalize.
+
+    Returns:
+        The text in NFC form with runs of whitespace collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _text_digest(text: str) -> str:
+    """Identify the exact text of an entry, which its word positions refer to."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SynthesisCache:
+    """Content-addressed, size-bounded disk cache of synthesized audio."""
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+    FILE_SUFFIX = ".npz"
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, model_path: Optional[str] = None):
+        """
+        Initialize the synthesis cache.
+
+        Args:
+            cache_dir: Directory for the cache entries.
+            max_bytes: Size budget for the cache. The least recently used
+                       entries are evicted once it is exceeded.
+            model_path: Path to the model file the audio was synthesized with.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.model_id = model_fingerprint(model_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Maps key -> entry size in bytes, ordered from least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the in-memory LRU index from the files on disk."""
+        found = []
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if filename.endswith(".tmp"):
+                # Left over from an interrupted write
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not filename.endswith(self.FILE_SUFFIX):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, filename[:-len(self.FILE_SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def make_key(self, text: str, voice: str, speed: float) -> str:
+        """
+        Build the cache key for a piece of text.
+
+        Args:
+            text: The text that was synthesized.
+            voice: The voice used.
+            speed: The speed factor used.
+
+        Returns:
+            Hex digest identifying the synthesis request.
+        """
+        payload = json.dumps([normalize_text(text), voice, round(float(speed), 3), self.model_id])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, key + self.FILE_SUFFIX)
+
+    def get(self, text: str, voice: str, speed: float) -> Optional[Tuple[np.ndarray, int, List[Dict[str, Union[str, float]]]]]:
+        """
+        Look up synthesized audio for the given text.
+
+        The key ignores whitespace differences, so an entry may have been
+        stored for text spaced differently; its word positions are then
+        aligned to the text asked for.
+
+        Args:
+            text: The text to look up.
+            voice: The voice used.
+            speed: The speed factor used.
+
+        Returns:
+            Tuple of (samples, sample_rate, word_timings), or None on a miss.
+        """
+        key = self.make_key(text, voice, speed)
+        path = self._path_for(key)
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                samples = data["audio"]
+                sample_rate = int(data["sample_rate"])
+                word_timings = json.loads(str(data["timings"]))
+                stored_digest = str(data["text_digest"]) if "text_digest" in data.files else None
+        except Exception as e:
+            warnings.warn(f"Dropping unreadable cache entry {path}: {str(e)}")
+            self._discard(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Persist the recency so LRU order survives a restart
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        if stored_digest != _text_digest(text) and any("position" in timing for timing in word_timings):
+            align_word_timings(text, word_timings)
+
+        with self._lock:
+            self.hits += 1
+        return samples, sample_rate, word_timings
+
+    def put(self, text: str, voice: str, speed: float, samples: np.ndarray, sample_rate: int,
+            word_timings: List[Dict[str, Union[str, float]]]) -> Optional[str]:
+        """
+        Store synthesized audio and its word timings.
+
+        Args:
+            text: The text that was synthesized.
+            voice: The voice used.
+            speed: The speed factor used.
+            samples: The audio samples.
+            sample_rate: The sample rate of the audio.
+            word_timings: Word timings relative to the start of the audio.
+
+        Returns:
+            Path of the cache entry, or None if it could not be written.
+        """
+        key = self.make_key(text, voice, speed)
+        path = self._path_for(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        try:
+            # Write to a temporary file and rename it so a crash never leaves a half-written entry
+            with open(temp_path, "wb") as f:
+                np.savez(
+                    f,
+                    audio=np.asarray(samples, dtype=np.float32),
+                    sample_rate=np.int64(sample_rate),
+                    timings=np.array(json.dumps(word_timings)),
+                    text_digest=np.array(_text_digest(text))
+                )
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            warnings.warn(f"Failed to write cache entry {path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            evicted = self._evict_locked()
+
+        for evicted_key in evicted:
+            try:
+                os.remove(self._path_for(evicted_key))
+            except OSError:
+                pass
+
+        return path
+
+    def _evict_locked(self) -> List[str]:
+        """
+        Drop least recently used entries until the cache fits its budget.
+        Must be called with the lock held.
+
+        Returns:
+            List of evicted keys whose files should be removed.
+        """
+        evicted = []
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _discard(self, key: str):
+        """Remove a single entry from the index and the disk."""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            keys = list(self._entries.keys())
+            self._entries.clear()
+            self._total_bytes = 0
+
+        for key in keys:
+            try:
+                os.remove(self._path_for(key))
+            except OSError as e:
+                warnings.warn(f"Failed to remove cache entry {key}: {str(e)}")
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cache entries in bytes."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
@@ -0,0 +1,226 @@
+"""
+Synthesis loop module for the Audiobook Reader application.
+Runs one long-lived asyncio event loop on a dedicated thread that owns the
+TTS model, so callers on other threads never create or close event loops.
+Model calls run one at a time on a priority scheduler.
+"""
+
+import asyncio
+import queue
+import threading
+import concurrent.futures
+from typing import Any, Callable, Coroutine, Iterator, Optional
+
+from core.cancellation import CancellationToken, OperationCancelled
+from core.scheduler import Priority, PriorityScheduler, set_job_context
+
+
+# Marks the end of a stream in the hand-off queue
+_END_OF_STREAM = object()
+# Marks a stream whose token was cancelled
+_CANCELLED = object()
+
+
+class SynthesisLoop:
+    """A dedicated thread running the asyncio loop used for all model work."""
+
+    def __init__(self, name: str = "SynthesisLoop"):
+        """
+        Initialize the synthesis loop.
+
+        Args:
+            name: Name of the loop thread.
+        """
+        self.name = name
+        self.model = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Model calls run one at a time, most urgent first, so the model is never used concurrently
+        self._executor: Optional[PriorityScheduler] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the loop thread if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            self._started.clear()
+            self._loop = asyncio.new_event_loop()
+            self._executor = PriorityScheduler(max_workers=1, name=self.name)
+            self._loop.set_default_executor(self._executor)
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+        self._started.wait()
+
+    def _run(self):
+        """Run the event loop until stop() is called."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            # Give cancelled tasks a chance to clean up before closing the loop
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            A future resolving to the coroutine's result.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    @property
+    def scheduler(self) -> Optional[PriorityScheduler]:
+        """The scheduler running the model calls, or None before start()."""
+        return self._executor
+
+    def call(self, fn: Callable, *args, priority: Priority = Priority.PLAYING,
+             token: Optional[CancellationToken] = None, **kwargs) -> concurrent.futures.Future:
+        """
+        Run a blocking callable, such as a model call, on the model worker.
+
+        Args:
+            fn: The function to run.
+            *args: Arguments to pass to the function.
+            priority: Priority class of the call.
+            token: Optional cancellation token; the call is dropped if it is
+                   cancelled before the call starts.
+            **kwargs: Keyword arguments to pass to the function.
+
+        Returns:
+            A future resolving to the function's result. It is cancelled if the
+            call is dropped.
+        """
+        async def run():
+            set_job_context(priority, token)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+
+        return self.submit(run())
+
+    def load(self, factory: Callable[[], Any]) -> Any:
+        """
+        Create the model on the model worker and keep it on the loop.
+
+        Args:
+            factory: Callable returning the model instance.
+
+        Returns:
+            The created model.
+        """
+        self.model = self.call(factory).result()
+        return self.model
+
+    def stream(self, text: str, token: Optional[CancellationToken] = None, priority: Priority = Priority.PLAYING,
+               **kwargs) -> Iterator[Any]:
+        """
+        Iterate over the results of the model's create_stream from any thread.
+
+        Results are handed over as soon as the loop receives them. Closing the
+        iterator early (for example by breaking out of a for loop) cancels the
+        stream on the loop.
+
+        Args:
+            text: The text to synthesize.
+            token: Optional cancellation token. Cancelling it wakes the reader at
+                   once and cancels the stream, so the model stops after the
+                   segment it is working on.
+            priority: Priority class of the stream. Every segment is scheduled
+                      on its own, so more urgent work runs between segments.
+            **kwargs: Keyword arguments for create_stream.
+
+        Yields:
+            The items produced by create_stream.
+
+        Raises:
+            OperationCancelled: If the token is cancelled.
+        """
+        if self.model is None:
+            raise RuntimeError("No model loaded on the synthesis loop")
+
+        results: "queue.Queue[Any]" = queue.Queue()
+        model = self.model
+
+        scheduler = self._executor
+
+        async def pump():
+            set_job_context(priority, token)
+            try:
+                with scheduler.reserve(priority):
+                    async for item in model.create_stream(text, **kwargs):
+                        results.put(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(_END_OF_STREAM)
+
+        def on_cancel():
+            results.put(_CANCELLED)
+
+        future = self.submit(pump())
+        if token is not None:
+            token.add_callback(on_cancel)
+        try:
+            while True:
+                item = results.get()
+                if item is _CANCELLED:
+                    raise OperationCancelled(token.reason)
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+            if token is not None:
+                token.remove_callback(on_cancel)
+
+    def cancel_all(self):
+        """Cancel every task currently scheduled on the loop."""
+        if not self.is_running:
+            return
+
+        def cancel_tasks():
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+
+        self._loop.call_soon_threadsafe(cancel_tasks)
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the loop thread and release the model worker.
+
+        Args:
+            timeout: Seconds to wait for the loop thread to finish.
+        """
+        with self._lock:
+            if not self.is_running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            thread = self._thread
+
+        thread.join(timeout)
+        self._executor.shutdown(wait=False)
+        self.model = None
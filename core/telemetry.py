@@ -0,0 +1,319 @@
+"""
+Telemetry module for the Audiobook Reader application.
+Records how the synthesis pipeline keeps up with playback: time to first
+audio, synthesis latency and real-time factor per chunk, audio buffered
+ahead, underruns, cache hits and queue depths. The numbers are available
+in-process and, optionally, as a JSON-lines log, so chunk sizes and thread
+counts can be tuned per host. Also provides rate-limited loggers for
+messages logged from hot paths.
+"""
+
+import json
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import numpy as np
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let each message through at most once per interval.
+
+    Messages count as the same when they come from the same logger at the
+    same level with the same format string, whatever their arguments, so a
+    per-chunk message logs once per interval rather than once per chunk.
+    Errors always pass.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """
+        Initialize the filter.
+
+        Args:
+            interval: Minimum seconds between two messages of the same kind.
+        """
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._seen: Dict[tuple, list] = {}  # Message kind -> [last time let through, number held back since]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether a record is logged.
+
+        Args:
+            record: The log record.
+
+        Returns:
+            True if the record is logged, False if it is held back.
+        """
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.interval:
+                seen[1] += 1
+                return False
+            suppressed = seen[1] if seen is not None else 0
+            self._seen[key] = [now, 0]
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+def get_logger(name: str, interval: float = 1.0) -> logging.Logger:
+    """
+    Get a logger whose messages below error level are rate limited.
+
+    Args:
+        name: Name of the logger, normally the module's __name__.
+        interval: Minimum seconds between two messages of the same kind.
+
+    Returns:
+        The logger.
+    """
+    logger = logging.getLogger(name)
+    if not any(isinstance(existing, RateLimitFilter) for existing in logger.filters):
+        logger.addFilter(RateLimitFilter(interval))
+    return logger
+
+
+class PipelineMetrics:
+    """Thread-safe counters, gauges and latency samples of the synthesis pipeline."""
+
+    DEFAULT_WINDOW = 512  # Latest samples kept per series for percentiles
+    BUFFER_EVENT_INTERVAL = 1.0  # Minimum seconds between two buffer events in the log
+
+    def __init__(self, log_path: Optional[str] = None, window: int = DEFAULT_WINDOW,
+                 buffer_event_interval: float = BUFFER_EVENT_INTERVAL):
+        """
+        Initialize the metrics.
+
+        Args:
+            log_path: Optional JSON-lines file every event is appended to.
+            window: Number of latest samples kept per series.
+            buffer_event_interval: Minimum seconds between two buffer events in the log;
+                                   the gauges are updated on every sample.
+        """
+        self.log_path = log_path
+        self.window = window
+        self.buffer_event_interval = buffer_event_interval
+        self._lock = threading.Lock()
+        self._log_file = None
+        self._request_ids = itertools.count(1)
+        self.reset()
+
+    def reset(self):
+        """Forget every value recorded so far."""
+        with self._lock:
+            self.counters: Dict[str, float] = {}
+            self.gauges: Dict[str, float] = {}
+            self._series: Dict[str, Deque[float]] = {}
+            self._series_counts: Dict[str, int] = {}
+            self._requests: Dict[int, tuple] = {}  # Request id -> (kind, start time), until its first audio
+            self._last_buffer_event = None
+
+    def increment(self, name: str, amount: float = 1):
+        """
+        Add to a counter.
+
+        Args:
+            name: Name of the counter.
+            amount: Amount to add.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float):
+        """
+        Set a gauge to its current value.
+
+        Args:
+            name: Name of the gauge.
+            value: The value.
+        """
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        """
+        Add a sample to a series.
+
+        Args:
+            name: Name of the series.
+            value: The sample.
+        """
+        with self._lock:
+            self._observe_locked(name, value)
+
+    def _observe_locked(self, name: str, value: float):
+        """Add a sample to a series. Must be called with the lock held."""
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = deque(maxlen=self.window)
+        series.append(value)
+        self._series_counts[name] = self._series_counts.get(name, 0) + 1
+
+    def start_request(self, kind: str = "play") -> int:
+        """
+        Note the start of a playback request.
+
+        A request replaces the one before it, so a request still waiting for
+        its first audio is counted as abandoned.
+
+        Args:
+            kind: What was requested, e.g. "play" or "file".
+
+        Returns:
+            Id of the request, for first_audio().
+        """
+        request_id = next(self._request_ids)
+        with self._lock:
+            if self._requests:
+                self.counters["requests_abandoned"] = self.counters.get("requests_abandoned", 0) + len(self._requests)
+                self._requests.clear()
+            self._requests[request_id] = (kind, time.perf_counter())
+            self.counters[f"requests_{kind}"] = self.counters.get(f"requests_{kind}", 0) + 1
+        self._emit("request", request=request_id, kind=kind)
+        return request_id
+
+    def first_audio(self, request_id: int) -> Optional[float]:
+        """
+        Note that the first audio of a request reached the audio output.
+
+        Only the first call per request counts.
+
+        Args:
+            request_id: Id returned by start_request().
+
+        Returns:
+            Seconds from the request to its first audio, or None if already noted.
+        """
+        with self._lock:
+            request = self._requests.pop(request_id, None)
+            if request is None:
+                return None
+            kind, started_at = request
+            latency = time.perf_counter() - started_at
+            self._observe_locked("time_to_first_audio", latency)
+        self._emit("first_audio", request=request_id, kind=kind, seconds=latency)
+        return latency
+
+    def record_chunk(self, request_id: Optional[int], audio_seconds: float, latency: float, cached: bool,
+                     characters: int = 0):
+        """
+        Note a chunk that is ready for playback.
+
+        Args:
+            request_id: Id of the request the chunk belongs to.
+            audio_seconds: Duration of the chunk's audio.
+            latency: Seconds it took to synthesize or load the chunk.
+            cached: Whether the chunk came from the synthesis cache.
+            characters: Length of the chunk's text.
+        """
+        with self._lock:
+            self.counters["cache_hits" if cached else "cache_misses"] = (
+                self.counters.get("cache_hits" if cached else "cache_misses", 0) + 1)
+            self.counters["audio_seconds_ready"] = self.counters.get("audio_seconds_ready", 0) + audio_seconds
+            if not cached:
+                self._observe_locked("synthesis_latency", latency)
+                if audio_seconds > 0:
+                    # Below 1 synthesis runs faster than playback
+                    self._observe_locked("real_time_factor", latency / audio_seconds)
+        self._emit("chunk", request=request_id, audio_seconds=audio_seconds, latency=latency, cached=cached,
+                   characters=characters)
+
+    def record_buffer(self, ahead_seconds: float, queue_depth: int, scheduler_depth: int, underruns: int):
+        """
+        Sample the health of the playback buffer.
+
+        Args:
+            ahead_seconds: Seconds of audio ready ahead of the play cursor.
+            queue_depth: Chunks waiting between synthesis and the player.
+            scheduler_depth: Model jobs waiting on the scheduler.
+            underruns: Underruns of the audio output so far.
+        """
+        now = time.monotonic()
+        with self._lock:
+            new_underruns = underruns - self.gauges.get("underruns", 0)
+            self.gauges["buffered_ahead_seconds"] = ahead_seconds
+            self.gauges["queue_depth"] = queue_depth
+            self.gauges["scheduler_depth"] = scheduler_depth
+            self.gauges["underruns"] = underruns
+            if new_underruns > 0:
+                self.counters["underruns"] = self.counters.get("underruns", 0) + new_underruns
+            due = self._last_buffer_event is None or now - self._last_buffer_event >= self.buffer_event_interval
+            if due or new_underruns > 0:
+                self._last_buffer_event = now
+            else:
+                return
+        self._emit("buffer", ahead_seconds=ahead_seconds, queue_depth=queue_depth,
+                   scheduler_depth=scheduler_depth, underruns=underruns)
+
+    def summary(self, name: str) -> Dict[str, float]:
+        """
+        Summarize a series.
+
+        Args:
+            name: Name of the series.
+
+        Returns:
+            Dictionary with count (all samples ever) and mean, p50, p95 and max
+            of the latest samples; only the count if there are none.
+        """
+        with self._lock:
+            samples = np.array(self._series.get(name, ()), dtype=np.float64)
+            count = self._series_counts.get(name, 0)
+        if not len(samples):
+            return {"count": count}
+        p50, p95 = np.percentile(samples, [50, 95])
+        return {"count": count, "mean": float(samples.mean()), "p50": float(p50), "p95": float(p95),
+                "max": float(samples.max())}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get every metric at once.
+
+        Returns:
+            Dictionary with counters, gauges, series summaries and cache_hit_rate.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            names = list(self._series)
+        lookups = counters.get("cache_hits", 0) + counters.get("cache_misses", 0)
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "series": {name: self.summary(name) for name in names},
+            "cache_hit_rate": counters.get("cache_hits", 0) / lookups if lookups else 0.0,
+        }
+
+    def _emit(self, event: str, **fields):
+        """Append an event to the JSON-lines log, if there is one."""
+        if self.log_path is None:
+            return
+        line = json.dumps({"time": time.time(), "event": event, **fields})
+        with self._lock:
+            try:
+                if self._log_file is None:
+                    self._log_file = open(self.log_path, 'a', encoding='utf-8', buffering=1)
+                self._log_file.write(line + "\n")
+            except OSError as e:
+                logging.getLogger(__name__).warning("Could not write metrics to %s: %s", self.log_path, e)
+                self.log_path = None
+
+    def close(self):
+        """Close the JSON-lines log."""
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
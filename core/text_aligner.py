@@ -0,0 +1,133 @@
+"""
+Text aligner module for the Audiobook Reader application.
+Finds the exact characters of the text that each word reported by the
+speech engine stands for, walking the text and the words once, so repeated
+words, punctuation and spacing no longer throw highlighting off.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Tuple, Union
+
+LOOKAHEAD_TOKENS = 8  # Text tokens searched ahead when a word does not continue at the cursor
+
+_TOKEN_PATTERN = re.compile(r'\S+')
+
+
+def _normalize(text: str) -> str:
+    """Reduce text to lowercase letters and digits, without accents."""
+    return "".join(c for c in unicodedata.normalize("NFKD", text).lower() if c.isalnum())
+
+
+def _tokens(text: str) -> List[Tuple[str, List[int]]]:
+    """
+    Split text into whitespace-delimited tokens in normalized form.
+
+    Returns:
+        List of (normalized token, offset in text of every normalized character).
+        Tokens without letters or digits, such as a lone dash, are left out.
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        key = []
+        offsets = []
+        for offset, char in enumerate(token, match.start()):
+            # Plain ASCII, the common case, needs no Unicode normalization
+            if char.isascii():
+                normalized = char.lower() if char.isalnum() else ""
+            else:
+                normalized = _normalize(char)
+            key.extend(normalized)
+            offsets.extend([offset] * len(normalized))
+        if key:
+            tokens.append(("".join(key), offsets))
+    return tokens
+
+
+def align_words(text: str, words: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    Find the character span of the text each word stands for.
+
+    Words are matched in order, ignoring case, accents, punctuation and
+    spacing. A word may cover part of a text token ("do" and "n't" for
+    "don't"). A word the engine skipped ahead of is found within a few
+    tokens; a word that matches nothing, such as a spelled-out number, gets
+    the span of the token at the cursor without consuming it. Punctuation
+    words get the span of the word before them. Runs in time linear in the
+    length of the text and the number of words.
+
+    Args:
+        text: The text that was synthesized.
+        words: The words reported by the engine, in spoken order.
+
+    Returns:
+        List of (start, end) character offsets into text, one per word.
+    """
+    tokens = _tokens(text)
+    spans: List[Tuple[int, int]] = []
+    if not tokens:
+        return [(0, 0)] * len(words)
+
+    token_index = 0  # Token under the cursor
+    char_index = 0  # Normalized character within that token
+
+    for word in words:
+        key = _normalize(word)
+        if token_index >= len(tokens):
+            # Words past the end of the text stay on the last token
+            offsets = tokens[-1][1]
+            spans.append((offsets[0], offsets[-1] + 1))
+            continue
+
+        if not key:
+            if spans:
+                spans.append(spans[-1])
+            else:
+                offsets = tokens[token_index][1]
+                spans.append((offsets[0], offsets[0]))
+            continue
+
+        token_key, offsets = tokens[token_index]
+        if token_key.startswith(key, char_index):
+            match_index, match_char = token_index, char_index
+        else:
+            # The engine may have skipped something; look for the word at the start of a later token
+            match_index = None
+            for candidate in range(token_index + 1, min(token_index + 1 + LOOKAHEAD_TOKENS, len(tokens))):
+                if tokens[candidate][0].startswith(key):
+                    match_index, match_char = candidate, 0
+                    break
+
+        if match_index is None:
+            # No match, e.g. "nineteen" for "1990": point at the token but keep it for the next word
+            spans.append((offsets[char_index], offsets[-1] + 1))
+            continue
+
+        token_key, offsets = tokens[match_index]
+        end_char = match_char + len(key)
+        spans.append((offsets[match_char], offsets[end_char - 1] + 1))
+
+        token_index, char_index = match_index, end_char
+        if char_index >= len(token_key):
+            token_index, char_index = token_index + 1, 0
+
+    return spans
+
+
+def align_word_timings(text: str, word_timings: List[Dict[str, Union[str, float]]]) -> List[Dict[str, Union[str, float]]]:
+    """
+    Set the character span of every word timing from the text.
+
+    Args:
+        text: The text that was synthesized.
+        word_timings: Word timing dictionaries with a "word" key, updated in place.
+
+    Returns:
+        The same list, with "position" and "position_end" set on every timing.
+    """
+    spans = align_words(text, [str(timing.get("word", "")) for timing in word_timings])
+    for timing, (start, end) in zip(word_timings, spans):
+        timing["position"] = start
+        timing["position_end"] = end
+    return word_timings
@@ -0,0 +1,281 @@
+"""
+Text chunking module for the Audiobook Reader application.
+Splits page text into synthesis chunks on sentence and clause boundaries.
+The first chunk is kept short so playback can start quickly, and later
+chunks grow toward a target audio duration.
+"""
+
+import re
+from typing import List, Tuple
+
+
+# End of a sentence: terminal punctuation, optional closing quotes/brackets, then whitespace
+SENTENCE_END_PATTERN = re.compile(r'[.!?…]+["\'”’)\]]*(?=\s|$)')
+
+# A run of text without blank lines
+PARAGRAPH_PATTERN = re.compile(r'(?:[^\n]|\n(?![ \t]*\n))+')
+
+# End of a clause inside a sentence
+CLAUSE_END_PATTERN = re.compile(r'[,;:—–]["\'”’)\]]*(?=\s)|\s+[—–-]+(?=\s)')
+
+
+class TextSpan:
+    """A slice of the original text together with its character offsets."""
+
+    def __init__(self, text: str, start: int, end: int, index: int = 0):
+        """
+        Initialize a text span.
+
+        Args:
+            text: The text of the span, exactly text[start:end] of the source.
+            start: Offset of the first character in the source text.
+            end: Offset one past the last character in the source text.
+            index: Index of the span in its sequence.
+        """
+        self.text = text
+        self.start = start
+        self.end = end
+        self.index = index
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"TextSpan(index={self.index}, start={self.start}, end={self.end}, text={self.text[:30]!r})"
+
+
+def _trimmed(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Shrink a range so it does not begin or end with whitespace."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """
+    Find the sentences in a text.
+
+    Blank lines also end a sentence, so headings and list items without
+    terminal punctuation do not run into the following paragraph.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        List of (start, end) offsets, one per sentence, without surrounding whitespace.
+    """
+    ranges = []
+
+    for block in PARAGRAPH_PATTERN.finditer(text):
+        position = block.start()
+        for match in SENTENCE_END_PATTERN.finditer(text, block.start(), block.end()):
+            start, end = _trimmed(text, position, match.end())
+            if start < end:
+                ranges.append((start, end))
+            position = match.end()
+
+        start, end = _trimmed(text, position, block.end())
+        if start < end:
+            ranges.append((start, end))
+
+    return ranges
+
+
+def split_clauses(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Split one sentence into clauses.
+
+    Args:
+        text: The full source text.
+        start: Offset of the sentence start.
+        end: Offset of the sentence end.
+
+    Returns:
+        List of (start, end) offsets of the clauses.
+    """
+    ranges = []
+    position = start
+
+    for match in CLAUSE_END_PATTERN.finditer(text, start, end):
+        clause_start, clause_end = _trimmed(text, position, match.end())
+        if clause_start < clause_end:
+            ranges.append((clause_start, clause_end))
+        position = match.end()
+
+    clause_start, clause_end = _trimmed(text, position, end)
+    if clause_start < clause_end:
+        ranges.append((clause_start, clause_end))
+
+    return ranges
+
+
+def split_words(text: str, start: int, end: int, max_words: int) -> List[Tuple[int, int]]:
+    """
+    Split a range into pieces of at most max_words words.
+
+    Args:
+        text: The full source text.
+        start: Offset of the range start.
+        end: Offset of the range end.
+        max_words: Maximum number of words per piece.
+
+    Returns:
+        List of (start, end) offsets of the pieces.
+    """
+    words = [match.span() for match in re.finditer(r'\S+', text[start:end])]
+    max_words = max(1, max_words)
+
+    ranges = []
+    for i in range(0, len(words), max_words):
+        group = words[i:i + max_words]
+        ranges.append((start + group[0][0], start + group[-1][1]))
+    return ranges
+
+
+class SentenceChunker:
+    """Groups sentences into synthesis chunks of increasing duration."""
+
+    # Average speaking rate of the Kokoro voices at speed 1.0 (about 150 words per minute)
+    WORDS_PER_SECOND = 2.5
+
+    # How far the opening clause may exceed the first chunk budget before it is split on words
+    FIRST_CLAUSE_SLACK = 2.0
+
+    def __init__(self, first_chunk_seconds: float = 3.0, target_chunk_seconds: float = 20.0,
+                 growth_factor: float = 2.0, words_per_second: float = WORDS_PER_SECOND):
+        """
+        Initialize the chunker.
+
+        Args:
+            first_chunk_seconds: Estimated audio duration budget of the first chunk.
+            target_chunk_seconds: Duration budget that later chunks grow toward.
+            growth_factor: Factor by which the budget grows from one chunk to the next.
+            words_per_second: Speaking rate used to estimate durations.
+        """
+        self.first_chunk_seconds = first_chunk_seconds
+        self.target_chunk_seconds = max(target_chunk_seconds, first_chunk_seconds)
+        self.growth_factor = max(1.0, growth_factor)
+        self.words_per_second = words_per_second
+
+    def estimate_seconds(self, text: str, speed: float = 1.0) -> float:
+        """
+        Estimate how long a piece of text takes to speak.
+
+        Args:
+            text: The text.
+            speed: The speed factor.
+
+        Returns:
+            Estimated duration in seconds.
+        """
+        return len(text.split()) / (self.words_per_second * max(speed, 0.1))
+
+    def _units(self, text: str, speed: float) -> List[Tuple[int, int, bool]]:
+        """
+        Break text into the smallest pieces a chunk may end on.
+
+        Sentences that fit the target budget are kept whole. Longer ones are
+        split into clauses, and clauses that are still too long are split on
+        word boundaries.
+
+        Returns:
+            List of (start, end, ends_sentence) tuples.
+        """
+        max_words = max(1, int(self.target_chunk_seconds * self.words_per_second * speed))
+        units = []
+
+        for sentence_start, sentence_end in split_sentences(text):
+            if self.estimate_seconds(text[sentence_start:sentence_end], speed) <= self.target_chunk_seconds:
+                units.append((sentence_start, sentence_end, True))
+                continue
+
+            pieces = []
+            for clause_start, clause_end in split_clauses(text, sentence_start, sentence_end):
+                if self.estimate_seconds(text[clause_start:clause_end], speed) <= self.target_chunk_seconds:
+                    pieces.append((clause_start, clause_end))
+                else:
+                    pieces.extend(split_words(text, clause_start, clause_end, max_words))
+
+            for i, (start, end) in enumerate(pieces):
+                units.append((start, end, i == len(pieces) - 1))
+
+        return units
+
+    def _first_units(self, text: str, units: List[Tuple[int, int, bool]], speed: float) -> List[Tuple[int, int, bool]]:
+        """
+        Make sure the first unit fits the first chunk budget.
+
+        The opening sentence is split into clauses, or words as a last resort,
+        when it is too long to synthesize quickly. A clause may overshoot the
+        budget by up to FIRST_CLAUSE_SLACK rather than being cut mid-phrase.
+        """
+        start, end, ends_sentence = units[0]
+        if self.estimate_seconds(text[start:end], speed) <= self.first_chunk_seconds:
+            return units
+
+        max_words = max(1, int(self.first_chunk_seconds * self.words_per_second * speed))
+        pieces = []
+        for clause_start, clause_end in split_clauses(text, start, end):
+            if self.estimate_seconds(text[clause_start:clause_end], speed) <= self.first_chunk_seconds * self.FIRST_CLAUSE_SLACK:
+                pieces.append((clause_start, clause_end))
+            else:
+                pieces.extend(split_words(text, clause_start, clause_end, max_words))
+
+        # Only the opening piece needs to be short; the rest can rejoin later chunks
+        head = [(pieces[0][0], pieces[0][1], ends_sentence and len(pieces) == 1)]
+        if len(pieces) > 1:
+            head.append((pieces[1][0], end, ends_sentence))
+        return head + units[1:]
+
+    def chunk(self, text: str, speed: float = 1.0) -> List[TextSpan]:
+        """
+        Split text into synthesis chunks.
+
+        Args:
+            text: The text to split.
+            speed: The speed factor, used to estimate durations.
+
+        Returns:
+            List of TextSpan objects covering every word of the text in order.
+        """
+        units = self._units(text, speed)
+        if not units:
+            return []
+
+        units = self._first_units(text, units, speed)
+
+        chunks = []
+        budget = self.first_chunk_seconds
+        current = []
+        current_seconds = 0.0
+
+        def emit(count):
+            nonlocal budget
+            start = current[0][0]
+            end = current[count - 1][1]
+            chunks.append(TextSpan(text[start:end], start, end, len(chunks)))
+            del current[:count]
+            budget = min(budget * self.growth_factor, self.target_chunk_seconds)
+
+        for unit in units:
+            unit_seconds = self.estimate_seconds(text[unit[0]:unit[1]], speed)
+
+            while current and current_seconds + unit_seconds > budget:
+                # Prefer ending the chunk on a sentence boundary
+                cut = len(current)
+                for i in range(len(current) - 1, -1, -1):
+                    if current[i][2]:
+                        cut = i + 1
+                        break
+                emit(cut)
+                current_seconds = sum(self.estimate_seconds(text[s:e], speed) for s, e, _ in current)
+
+            current.append(unit)
+            current_seconds += unit_seconds
+
+        while current:
+            emit(len(current))
+
+        return chunks
@@ -0,0 +1,172 @@
+"""
+Text edits module for the Audiobook Reader application.
+Compares an edited text with the text that was synthesized, sentence by
+sentence, so only the sentences that changed have to be synthesized again
+and every other word timing can be moved to its new place.
+"""
+
+import difflib
+from typing import List, Sequence
+
+import numpy as np
+
+from core.text_chunker import split_sentences
+
+
+class TextEdit:
+    """A range of the old text replaced by a range of the new one."""
+
+    def __init__(self, old_start: int, old_end: int, new_start: int, new_end: int):
+        """
+        Initialize a text edit.
+
+        Args:
+            old_start: Offset of the first replaced character in the old text.
+            old_end: Offset one past the last replaced character in the old text.
+            new_start: Offset of the first replacing character in the new text.
+            new_end: Offset one past the last replacing character in the new text.
+        """
+        self.old_start = old_start
+        self.old_end = old_end
+        self.new_start = new_start
+        self.new_end = new_end
+
+    @property
+    def shift(self) -> int:
+        """How far the text after the edit moves, in characters."""
+        return (self.new_end - self.new_start) - (self.old_end - self.old_start)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TextEdit) and (
+            (self.old_start, self.old_end, self.new_start, self.new_end) ==
+            (other.old_start, other.old_end, other.new_start, other.new_end))
+
+    def __repr__(self) -> str:
+        return f"TextEdit(old={self.old_start}:{self.old_end}, new={self.new_start}:{self.new_end})"
+
+
+def sentence_boundaries(text: str) -> List[int]:
+    """
+    Cut a text into pieces that each start with a sentence.
+
+    Every piece runs from the start of its sentence to the start of the
+    next, so the pieces cover the text without gaps, whitespace included.
+
+    Args:
+        text: The text to cut.
+
+    Returns:
+        Sorted offsets, starting with 0 and ending with len(text).
+    """
+    boundaries = [0]
+    for start, _ in split_sentences(text):
+        if start > boundaries[-1]:
+            boundaries.append(start)
+    if len(text) > boundaries[-1]:
+        boundaries.append(len(text))
+    return boundaries
+
+
+def diff_sentences(old_text: str, new_text: str) -> List[TextEdit]:
+    """
+    Find the sentences that differ between two versions of a text.
+
+    Both texts are cut into sentences and the sentence sequences are
+    compared, which is fast on a whole page and never cuts an edit in the
+    middle of a sentence. Text outside the edits is identical in both
+    versions, character for character.
+
+    Args:
+        old_text: The text that was synthesized.
+        new_text: The edited text.
+
+    Returns:
+        The edits in text order, none of them adjacent to another.
+    """
+    old_bounds = sentence_boundaries(old_text)
+    new_bounds = sentence_boundaries(new_text)
+    old_pieces = [old_text[start:end] for start, end in zip(old_bounds, old_bounds[1:])]
+    new_pieces = [new_text[start:end] for start, end in zip(new_bounds, new_bounds[1:])]
+
+    matcher = difflib.SequenceMatcher(None, old_pieces, new_pieces, autojunk=False)
+    return [
+        TextEdit(old_bounds[i1], old_bounds[i2], new_bounds[j1], new_bounds[j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def map_positions(edits: Sequence[TextEdit], positions: np.ndarray) -> np.ndarray:
+    """
+    Move character offsets of the old text to the new text.
+
+    Offsets outside the edits move by the length change of the edits
+    before them. Offsets inside an edit have no counterpart and map to the
+    end of its replacement.
+
+    Args:
+        edits: The edits, in text order.
+        positions: Offsets into the old text.
+
+    Returns:
+        Offsets into the new text, of the same shape.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    if not edits:
+        return positions.copy()
+
+    old_starts = np.array([edit.old_start for edit in edits], dtype=np.int64)
+    old_ends = np.array([edit.old_end for edit in edits], dtype=np.int64)
+    new_ends = np.array([edit.new_end for edit in edits], dtype=np.int64)
+    shifts = np.concatenate(([0], np.cumsum([edit.shift for edit in edits]))).astype(np.int64)
+
+    # Number of edits that end at or before each offset
+    before = np.searchsorted(old_ends, positions, side="right")
+    mapped = positions + shifts[before]
+
+    # Offsets strictly inside the next edit
+    following = np.minimum(before, len(edits) - 1)
+    inside = (before < len(edits)) & (positions > old_starts[following])
+    mapped[inside] = new_ends[following[inside]]
+    return mapped
+
+
+def narrow_edit(edit: TextEdit, old_text: str, new_text: str) -> TextEdit:
+    """
+    Shrink an edit to the words that actually changed.
+
+    The text the old and new ranges share at their start and end is left
+    out of the edit, as far as whole words go, so the edit starts at the
+    start of a word and ends at the end of one.
+
+    Args:
+        edit: The edit, e.g. a sentence from diff_sentences().
+        old_text: The text that was synthesized.
+        new_text: The edited text.
+
+    Returns:
+        The narrowed edit; text outside it is still identical in both versions.
+    """
+    old_piece = old_text[edit.old_start:edit.old_end]
+    new_piece = new_text[edit.new_start:edit.new_end]
+    shortest = min(len(old_piece), len(new_piece))
+
+    prefix = 0
+    while prefix < shortest and old_piece[prefix] == new_piece[prefix]:
+        prefix += 1
+    # Back off to the start of the word the first difference is in
+    while prefix and not old_piece[prefix - 1].isspace():
+        prefix -= 1
+
+    def word_starts_at(piece: str, index: int) -> bool:
+        return index == 0 or piece[index - 1].isspace()
+
+    suffix = 0
+    while suffix < shortest - prefix and old_piece[-suffix - 1] == new_piece[-suffix - 1]:
+        suffix += 1
+    # And to the end of the word the last difference is in, in both versions
+    while suffix and not (word_starts_at(old_piece, len(old_piece) - suffix) and
+                          word_starts_at(new_piece, len(new_piece) - suffix)):
+        suffix -= 1
+
+    return TextEdit(edit.old_start + prefix, edit.old_end - suffix, edit.new_start + prefix, edit.new_end - suffix)
@@ -0,0 +1,194 @@
+"""
+Time-stretch module for the Audiobook Reader application.
+Changes the tempo of synthesized speech without changing its pitch, using a
+vectorized phase vocoder, so audio synthesized once at normal speed can be
+played at any speed. A streaming variant stretches audio hop by hop while it
+plays, so the rate can change at any moment.
+"""
+
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+N_FFT = 1024  # About 43 ms at 24 kHz, long enough to resolve the pitch of a voice
+HOP_LENGTH = 256  # Synthesis hop, a quarter of the window
+
+
+def _frames(samples: np.ndarray, n_fft: int, hop_length: int) -> np.ndarray:
+    """Cut a signal into overlapping windowed frames, shape (frames, n_fft)."""
+    count = 1 + (len(samples) - n_fft) // hop_length
+    frames = np.lib.stride_tricks.as_strided(
+        samples,
+        shape=(count, n_fft),
+        strides=(samples.strides[0] * hop_length, samples.strides[0]),
+        writeable=False
+    )
+    return frames * np.hanning(n_fft).astype(np.float32)
+
+
+def time_stretch(samples: np.ndarray, rate: float, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Change the tempo of audio while keeping its pitch.
+
+    Args:
+        samples: Mono audio samples.
+        rate: Speed factor; 2.0 plays twice as fast, 0.5 half as fast.
+        n_fft: Analysis window length in samples.
+        hop_length: Hop between frames in samples.
+
+    Returns:
+        The stretched samples, about len(samples) / rate long.
+    """
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+    if rate <= 0:
+        raise ValueError(f"Stretch rate must be positive, got {rate}")
+    if abs(rate - 1.0) < 1e-3 or len(samples) == 0:
+        return samples.copy()
+
+    target_length = int(round(len(samples) / rate))
+
+    # Pad so the first and last samples sit in the middle of a full window
+    padded = np.pad(samples, (n_fft // 2, n_fft // 2 + hop_length))
+    spectrum = np.fft.rfft(_frames(padded, n_fft, hop_length), axis=1)  # (frames, bins)
+    frame_count = spectrum.shape[0]
+    if frame_count < 2:
+        return samples.copy()
+
+    # Read positions in the analysis frames, rate frames apart
+    steps = np.arange(0, frame_count - 1, rate)
+    left = steps.astype(np.int64)
+    fraction = (steps - left)[:, None]
+
+    magnitude = np.abs(spectrum)
+    magnitude = (1 - fraction) * magnitude[left] + fraction * magnitude[left + 1]
+
+    # Phase advance between neighbouring analysis frames, minus the expected advance of each bin
+    expected = 2 * np.pi * hop_length * np.arange(spectrum.shape[1]) / n_fft
+    phase = np.angle(spectrum)
+    advance = phase[left + 1] - phase[left] - expected
+    advance -= 2 * np.pi * np.round(advance / (2 * np.pi))
+
+    # Accumulate the true advance of every output frame, starting from the first frame's phase
+    accumulated = np.cumsum(expected + advance, axis=0)
+    accumulated = np.vstack((phase[:1], phase[:1] + accumulated[:-1]))
+
+    frames = np.fft.irfft(magnitude * np.exp(1j * accumulated), n=n_fft, axis=1)
+    window = np.hanning(n_fft)
+    frames *= window
+
+    # Overlap-add the frames at the synthesis hop, normalised by the summed window power
+    output_length = n_fft + hop_length * (len(frames) - 1)
+    positions = (np.arange(len(frames)) * hop_length)[:, None] + np.arange(n_fft)
+    output = np.zeros(output_length)
+    norm = np.zeros(output_length)
+    np.add.at(output, positions, frames)
+    np.add.at(norm, positions, np.broadcast_to(window ** 2, frames.shape))
+    output /= np.maximum(norm, 1e-3)
+
+    output = output[n_fft // 2:n_fft // 2 + target_length]
+    if len(output) < target_length:
+        output = np.pad(output, (0, target_length - len(output)))
+    return output.astype(np.float32)
+
+
+class StreamingTimeStretcher:
+    """Phase vocoder producing one hop of stretched audio at a time."""
+
+    def __init__(self, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH):
+        """
+        Initialize the streaming stretcher.
+
+        Args:
+            n_fft: Analysis window length in samples.
+            hop_length: Output samples produced per hop.
+        """
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.window = np.hanning(n_fft)
+        self.expected = 2 * np.pi * hop_length * np.arange(n_fft // 2 + 1) / n_fft
+
+        # Summed window power over the frames overlapping each output sample
+        power = self.window ** 2
+        self.norm = np.maximum(sum(power[i:i + hop_length] for i in range(0, n_fft, hop_length)), 1e-3)
+
+        self.reset()
+
+    @property
+    def input_length(self) -> int:
+        """Number of source samples each hop reads."""
+        return self.n_fft + self.hop_length
+
+    def reset(self):
+        """Forget the phase and the overlap-add tail, e.g. after a seek."""
+        self._phase = None
+        self._overlap = np.zeros(self.n_fft)
+
+    @staticmethod
+    def _lock_phases(phase: np.ndarray, magnitude: np.ndarray, spectrum: np.ndarray) -> np.ndarray:
+        """
+        Tie the phase of every bin to the nearest spectral peak.
+
+        Only the peaks keep their accumulated phase; the bins around a peak
+        keep their phase offset to it from the source frame. Without this,
+        a badly started frame, such as the zero-padded one at a seek,
+        leaves the bins of one partial out of step for good, which is heard
+        as a quieter, smeared voice.
+        """
+        peaks = np.flatnonzero((magnitude[1:-1] > magnitude[:-2]) & (magnitude[1:-1] >= magnitude[2:])) + 1
+        if len(peaks) == 0:
+            return phase
+        owner = peaks[np.searchsorted((peaks[:-1] + peaks[1:]) / 2, np.arange(len(magnitude)))]
+        source_phase = np.angle(spectrum)
+        return phase[owner] + source_phase - source_phase[owner]
+
+    def hop(self, source: np.ndarray) -> np.ndarray:
+        """
+        Produce the next hop of output.
+
+        The caller advances its read position by hop_length * rate source
+        samples between calls; that step is what sets the playback rate.
+
+        Args:
+            source: input_length source samples starting at the read position.
+
+        Returns:
+            hop_length output samples.
+        """
+        current = np.fft.rfft(source[:self.n_fft] * self.window)
+        following = np.fft.rfft(source[self.hop_length:self.hop_length + self.n_fft] * self.window)
+
+        magnitude = np.abs(current)
+        phase = np.angle(current) if self._phase is None else self._lock_phases(self._phase, magnitude, current)
+
+        frame = np.fft.irfft(magnitude * np.exp(1j * phase), n=self.n_fft) * self.window
+
+        # Advance the phase by what the source actually did over one hop
+        advance = np.angle(following) - np.angle(current) - self.expected
+        advance -= 2 * np.pi * np.round(advance / (2 * np.pi))
+        self._phase = phase + self.expected + advance
+
+        self._overlap += frame
+        output = self._overlap[:self.hop_length] / self.norm
+        self._overlap = np.concatenate((self._overlap[self.hop_length:], np.zeros(self.hop_length)))
+        return output.astype(np.float32)
+
+
+def scale_word_timings(word_timings: List[Dict[str, Union[str, float]]], rate: float) -> List[Dict[str, Union[str, float]]]:
+    """
+    Scale word timings to audio stretched by time_stretch().
+
+    Args:
+        word_timings: List of word timing dictionaries.
+        rate: The speed factor the audio was stretched with.
+
+    Returns:
+        New list of word timing dictionaries with start and end divided by rate.
+    """
+    scaled = []
+    for timing in word_timings:
+        timing = dict(timing)
+        timing["start"] = timing["start"] / rate
+        timing["end"] = timing["end"] / rate
+        scaled.append(timing)
+    return scaled
@@ -0,0 +1,155 @@
+"""
+Timing estimator module for the Audiobook Reader application.
+Estimates word timings from the synthesized audio itself when the engine
+reports none: pauses found in the short-time energy of the signal anchor
+the word boundaries, and the words between two pauses share the speech in
+proportion to their length.
+"""
+
+import re
+from typing import Dict, List, Union
+
+import numpy as np
+
+FRAME_SECONDS = 0.01  # Energy frame length
+SILENCE_DB = -35.0  # Frames this far below the loud parts of the chunk count as silence
+MIN_PAUSE_SECONDS = 0.08  # Shorter gaps are stops and closures inside words
+PUNCTUATION_BONUS_SECONDS = 0.25  # How much closer a pause counts to a boundary after punctuation
+
+_PAUSE_PUNCTUATION = re.compile(r'[,.;:!?—…)\]"”]+$')
+
+
+def frame_energy_db(samples: np.ndarray, sample_rate: int, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """
+    Compute the short-time energy of a signal.
+
+    Args:
+        samples: Mono audio samples.
+        sample_rate: Sample rate of the audio.
+        frame_seconds: Frame length in seconds.
+
+    Returns:
+        Energy of every frame in dB relative to the 95th percentile frame.
+    """
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    count = len(samples) // frame_length
+    if count == 0:
+        return np.zeros(0)
+
+    frames = np.asarray(samples[:count * frame_length], dtype=np.float32).reshape(count, frame_length)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame_length
+    reference = max(float(np.percentile(energy, 95)), 1e-10)
+    return 10.0 * np.log10(np.maximum(energy, 1e-12) / reference)
+
+
+def find_pauses(samples: np.ndarray, sample_rate: int, silence_db: float = SILENCE_DB,
+                min_pause_seconds: float = MIN_PAUSE_SECONDS) -> np.ndarray:
+    """
+    Find the pauses in speech.
+
+    Args:
+        samples: Mono audio samples.
+        sample_rate: Sample rate of the audio.
+        silence_db: Energy threshold of silence, relative to the loud parts.
+        min_pause_seconds: Shortest silence that counts as a pause.
+
+    Returns:
+        Array of shape (pauses, 2) with the start and end of every pause in
+        seconds, leading and trailing silence included.
+    """
+    silent = frame_energy_db(samples, sample_rate) < silence_db
+    if not len(silent):
+        return np.zeros((0, 2))
+
+    # Runs of silent frames, from the edges of the padded mask
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # Silence at either end of the chunk counts whatever its length
+    keep = ((ends - starts) * FRAME_SECONDS >= min_pause_seconds) | (starts == 0) | (ends == len(silent))
+    return np.column_stack((starts[keep], ends[keep])) * FRAME_SECONDS
+
+
+def estimate_word_timings_from_audio(text: str, samples: np.ndarray, sample_rate: int) -> List[Dict[str, Union[str, float]]]:
+    """
+    Estimate the timings of the words of a chunk from its audio.
+
+    Word boundaries are first guessed from word lengths over the voiced part
+    of the audio. Every pause is then snapped to the nearest guessed
+    boundary, boundaries after punctuation preferred, so the words before
+    it end where the pause starts and the words after it start where it
+    ends. Between two pauses, words share the speech by length.
+
+    Args:
+        text: The chunk text.
+        samples: Mono audio samples of the chunk.
+        sample_rate: Sample rate of the audio.
+
+    Returns:
+        List of word timing dictionaries with positions relative to the chunk.
+    """
+    words = list(re.finditer(r'\S+', text))
+    if not words:
+        return []
+
+    duration = len(samples) / sample_rate
+    weights = np.array([2.0 + len(match.group()) for match in words], dtype=np.float64)
+    fractions = np.concatenate(([0.0], np.cumsum(weights) / weights.sum()))  # Boundary k precedes word k
+
+    pauses = find_pauses(samples, sample_rate)
+    speech_start, speech_end = 0.0, duration
+    if len(pauses) and pauses[0, 0] == 0.0:
+        speech_start, pauses = pauses[0, 1], pauses[1:]
+    if len(pauses) and pauses[-1, 1] >= duration - FRAME_SECONDS:
+        speech_end, pauses = pauses[-1, 0], pauses[:-1]
+    if speech_end <= speech_start:
+        speech_start, speech_end, pauses = 0.0, duration, pauses[:0]
+
+    # Guess every boundary on the voiced timeline, then move it past the pauses before it
+    pause_lengths = pauses[:, 1] - pauses[:, 0]
+    voiced_total = (speech_end - speech_start) - pause_lengths.sum()
+    voiced_pause_starts = pauses[:, 0] - speech_start - np.concatenate(([0.0], np.cumsum(pause_lengths)[:-1]))
+    voiced = fractions * voiced_total
+    shift = np.concatenate(([0.0], np.cumsum(pause_lengths)))[np.searchsorted(voiced_pause_starts, voiced, side="right")]
+    guesses = speech_start + voiced + shift
+
+    # Anchors: (boundary index, time the word before ends, time the word after starts)
+    anchor_index = [0]
+    anchor_end = [speech_start]
+    anchor_start = [speech_start]
+    if len(pauses) and len(words) > 1:
+        after_punctuation = np.array([bool(_PAUSE_PUNCTUATION.search(match.group())) for match in words[:-1]])
+        centers = pauses.mean(axis=1)
+        # Distance of every pause to every inner boundary, punctuation boundaries counted closer
+        cost = np.abs(centers[:, None] - guesses[None, 1:-1]) - PUNCTUATION_BONUS_SECONDS * after_punctuation[None, :]
+        nearest = np.argmin(cost, axis=1) + 1
+
+        # Pauses are in time order; keep the first pause claiming each boundary, and only increasing ones
+        previous = 0
+        for pause, boundary in zip(pauses, nearest):
+            if boundary > previous:
+                anchor_index.append(int(boundary))
+                anchor_end.append(float(pause[0]))
+                anchor_start.append(float(pause[1]))
+                previous = boundary
+    anchor_index.append(len(words))
+    anchor_end.append(speech_end)
+    anchor_start.append(speech_end)
+
+    starts = np.empty(len(words))
+    ends = np.empty(len(words))
+    for segment in range(len(anchor_index) - 1):
+        first, last = anchor_index[segment], anchor_index[segment + 1]
+        begin, finish = anchor_start[segment], anchor_end[segment + 1]
+        share = fractions[first:last + 1] - fractions[first]
+        share /= share[-1]
+        bounds = begin + share * (finish - begin)
+        starts[first:last] = bounds[:-1]
+        ends[first:last] = bounds[1:]
+
+    return [
+        {"word": match.group(), "start": float(start), "end": float(end),
+         "position": match.start(), "position_end": match.end()}
+        for match, start, end in zip(words, starts, ends)
+    ]
@@ -0,0 +1,277 @@
+"""
+Word timing index module for the Audiobook Reader application.
+Keeps the word timings of a text as NumPy columns, so the word playing at a
+time, or the time of the word at a character, is found by binary search,
+and grows chunk by chunk while synthesis is still running.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+
+class WordTimingIndex:
+    """Columnar index of word timings, searchable by time and by character position."""
+
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, word_timings: Optional[Iterable[Dict[str, Union[str, float]]]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            word_timings: Optional word timing dictionaries to start with, all in chunk 0.
+        """
+        self._lock = threading.Lock()
+        self._allocate(self.INITIAL_CAPACITY)
+        self._count = 0
+        self._words: List[str] = []
+        if word_timings:
+            self.append(word_timings)
+
+    def _allocate(self, capacity: int):
+        """Create empty columns, keeping the rows already stored."""
+        columns = {
+            "_start": np.zeros(capacity, dtype=np.float64),
+            "_end": np.zeros(capacity, dtype=np.float64),
+            "_char_start": np.zeros(capacity, dtype=np.int64),
+            "_char_end": np.zeros(capacity, dtype=np.int64),
+            "_chunk_id": np.zeros(capacity, dtype=np.int32),
+        }
+        count = getattr(self, "_count", 0)
+        for name, column in columns.items():
+            if count:
+                column[:count] = getattr(self, name)[:count]
+            setattr(self, name, column)
+
+    def append(self, word_timings: Iterable[Dict[str, Union[str, float]]], chunk_id: int = 0):
+        """
+        Add the word timings of a chunk to the end of the index.
+
+        Timings must already be on the timeline of the whole text and come in
+        reading order. A word without a "position" is placed at the end of the
+        word before it, so the character column stays sorted; one without a
+        "position_end" is taken to span the length of the word.
+
+        Args:
+            word_timings: Word timing dictionaries with word, start, end, position
+                          and optionally position_end.
+            chunk_id: Index of the chunk the words belong to.
+        """
+        word_timings = list(word_timings)
+        if not word_timings:
+            return
+
+        with self._lock:
+            self._append_locked(word_timings, chunk_id)
+
+    def _append_locked(self, word_timings: List[Dict[str, Union[str, float]]], chunk_id: int):
+        """Add rows to the end of the index. Must be called with the lock held."""
+        needed = self._count + len(word_timings)
+        if needed > len(self._start):
+            self._allocate(max(needed, 2 * len(self._start)))
+
+        previous_end = int(self._char_end[self._count - 1]) if self._count else 0
+        for row, timing in enumerate(word_timings, self._count):
+            word = str(timing.get("word", ""))
+            position = timing.get("position")
+            char_start = previous_end if position is None else int(position)
+
+            self._start[row] = float(timing["start"])
+            self._end[row] = float(timing["end"])
+            self._char_start[row] = char_start
+            self._char_end[row] = int(timing.get("position_end", char_start + len(word)))
+            self._chunk_id[row] = chunk_id
+            self._words.append(word)
+            previous_end = int(self._char_end[row])
+
+        self._count = needed
+
+    def replace_chunk(self, chunk_id: int, word_timings: Iterable[Dict[str, Union[str, float]]],
+                      time_shift: float = 0.0):
+        """
+        Replace the word timings of a chunk and move the words after it in time.
+
+        Used when a chunk is re-synthesized in place; the rows after it are
+        shifted with one vectorized addition, however long the text is.
+
+        Args:
+            chunk_id: Index of the chunk.
+            word_timings: The new word timings of the chunk, on the timeline of the text.
+            time_shift: Seconds by which the chunk got longer; added to every later word.
+        """
+        word_timings = list(word_timings)
+        with self._lock:
+            chunk_ids = self._chunk_id[:self._count]
+            first = int(np.searchsorted(chunk_ids, chunk_id, side="left"))
+            stop = int(np.searchsorted(chunk_ids, chunk_id, side="right"))
+
+            # Keep the rows after the chunk aside and append the new rows in its place
+            tail = {name: getattr(self, name)[stop:self._count].copy()
+                    for name in ("_start", "_end", "_char_start", "_char_end", "_chunk_id")}
+            tail_words = self._words[stop:self._count]
+            self._count = first
+            del self._words[first:]
+            self._append_locked(word_timings, chunk_id)
+
+            needed = self._count + len(tail_words)
+            if needed > len(self._start):
+                self._allocate(max(needed, 2 * len(self._start)))
+            for name, column in tail.items():
+                getattr(self, name)[self._count:needed] = column
+            self._start[self._count:needed] += time_shift
+            self._end[self._count:needed] += time_shift
+            self._words.extend(tail_words)
+            self._count = needed
+
+    def map_positions(self, mapper: Callable[[np.ndarray], np.ndarray]):
+        """
+        Move the character positions of every word, e.g. after the text was edited.
+
+        Args:
+            mapper: Function taking an array of old offsets and returning the new ones.
+        """
+        with self._lock:
+            self._char_start[:self._count] = mapper(self._char_start[:self._count])
+            self._char_end[:self._count] = mapper(self._char_end[:self._count])
+
+    def clear(self):
+        """Remove every word timing."""
+        with self._lock:
+            self._count = 0
+            self._words = []
+
+    def __len__(self) -> int:
+        """Number of words in the index."""
+        return self._count
+
+    def __getitem__(self, index: int) -> Dict[str, Union[str, float]]:
+        """Get a word timing dictionary with word, start, end, position, position_end and chunk."""
+        with self._lock:
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError(f"Word index {index} out of range")
+            return {
+                "word": self._words[index],
+                "start": float(self._start[index]),
+                "end": float(self._end[index]),
+                "position": int(self._char_start[index]),
+                "position_end": int(self._char_end[index]),
+                "chunk": int(self._chunk_id[index]),
+            }
+
+    def __iter__(self) -> Iterator[Dict[str, Union[str, float]]]:
+        """Iterate over the word timing dictionaries."""
+        for index in range(self._count):
+            yield self[index]
+
+    def to_list(self) -> List[Dict[str, Union[str, float]]]:
+        """Get all word timings as a list of dictionaries."""
+        return list(self)
+
+    def index_at_time(self, seconds: float) -> int:
+        """
+        Find the word playing at a time.
+
+        Between two words, the earlier one is returned; before the first
+        word, the first one.
+
+        Args:
+            seconds: Time on the timeline of the text.
+
+        Returns:
+            Index of the word, or -1 if the index is empty.
+        """
+        with self._lock:
+            if self._count == 0:
+                return -1
+            index = int(np.searchsorted(self._start[:self._count], seconds, side="right")) - 1
+            return max(0, index)
+
+    def index_at_char(self, position: int) -> int:
+        """
+        Find the word at a character position of the text.
+
+        Between two words, the earlier one is returned; before the first
+        word, the first one.
+
+        Args:
+            position: Character offset into the text.
+
+        Returns:
+            Index of the word, or -1 if the index is empty.
+        """
+        with self._lock:
+            if self._count == 0:
+                return -1
+            index = int(np.searchsorted(self._char_start[:self._count], position, side="right")) - 1
+            return max(0, index)
+
+    def time_at_char(self, position: int) -> Optional[float]:
+        """
+        Get the start time of the word at a character position.
+
+        Args:
+            position: Character offset into the text.
+
+        Returns:
+            The start time in seconds, or None if the index is empty.
+        """
+        index = self.index_at_char(position)
+        return None if index < 0 else float(self._start[index])
+
+    def char_at_time(self, seconds: float) -> Optional[int]:
+        """
+        Get the character position of the word playing at a time.
+
+        Args:
+            seconds: Time on the timeline of the text.
+
+        Returns:
+            The character offset of the word, or None if the index is empty.
+        """
+        index = self.index_at_time(seconds)
+        return None if index < 0 else int(self._char_start[index])
+
+    def chunk_first_index(self, chunk_id: int) -> int:
+        """
+        Find the first word of a chunk.
+
+        Args:
+            chunk_id: Index of the chunk.
+
+        Returns:
+            Index of the first word of the chunk, or -1 if it has no words.
+        """
+        with self._lock:
+            index = int(np.searchsorted(self._chunk_id[:self._count], chunk_id, side="left"))
+            if index < self._count and self._chunk_id[index] == chunk_id:
+                return index
+            return -1
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Start time of every word in seconds."""
+        return self._start[:self._count]
+
+    @property
+    def ends(self) -> np.ndarray:
+        """End time of every word in seconds."""
+        return self._end[:self._count]
+
+    @property
+    def char_starts(self) -> np.ndarray:
+        """Character offset of the start of every word."""
+        return self._char_start[:self._count]
+
+    @property
+    def char_ends(self) -> np.ndarray:
+        """Character offset just past the end of every word."""
+        return self._char_end[:self._count]
+
+    @property
+    def chunk_ids(self) -> np.ndarray:
+        """Chunk index of every word."""
+        return self._chunk_id[:self._count]
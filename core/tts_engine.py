@@ -15,6 +15,9 @@ from collections import deque
 import numpy as np
 import soundfile as sf
 
+from core.timing_estimator import estimate_word_timings_from_audio
+from core.timing_index import WordTimingIndex
+
 # Try to import torch and transformers, but handle import errors gracefully
 try:
     import torch
@@ -103,6 +106,7 @@ class TTSEngine:
         self.chunk_cache = deque(maxlen=self.MAX_CACHE_CHUNKS)
         self.current_text = ""
         self.chunks = []
+        self.timing_index = WordTimingIndex()  # Word timings of all chunks, on the timeline of the text
         self.combined_audio_path = None
 
     def load_model(self):
@@ -276,6 +280,8 @@ class TTSEngine:
             all_audio_paths.append(audio_path)
             all_word_timings.extend(chunk.word_timings)
 
+        self._rebuild_timing_index()
+
         # Combine all audio files into one
         combined_audio_path = self._combine_audio_files(all_audio_paths)
         self.combined_audio_path = combined_audio_path
@@ -321,6 +327,7 @@ class TTSEngine:
         # Store as a single chunk for consistency
         self.chunks = [TextChunk(text, 0)]
         self.chunks[0].set_audio_data(temp_file.name, word_timings, duration)
+        self._rebuild_timing_index()
 
         return temp_file.name, word_timings
 
@@ -370,8 +377,8 @@ class TTSEngine:
         # Calculate duration
         duration = len(audio) / sample_rate
 
-        # Extract word timings
-        word_timings = self._extract_word_timings(text, duration)
+        # Estimate word timings from the pauses in the audio
+        word_timings = estimate_word_timings_from_audio(text, audio, sample_rate)
 
         return temp_file.name, word_timings, duration
 
@@ -572,6 +579,8 @@ class TTSEngine:
             chunk.adjust_timings(current_time)
             current_time += chunk.duration
 
+        self._rebuild_timing_index()
+
     def get_chunk_for_position(self, position: float) -> Optional[TextChunk]:
         """
         Get the chunk that contains the given position in the audio.
@@ -597,22 +606,18 @@ class TTSEngine:
         Returns:
             The word timing dictionary or None if not found.
         """
-        for timing in self._get_all_word_timings():
-            if timing["start"] <= position <= timing["end"]:
-                return timing
-        return None
-
-    def _get_all_word_timings(self) -> List[Dict[str, Union[str, float]]]:
-        """
-        Get all word timings from all chunks.
+        index = self.timing_index.index_at_time(position)
+        if index < 0:
+            return None
+        timing = self.timing_index[index]
+        return timing if timing["start"] <= position <= timing["end"] else None
 
-        Returns:
-            List of all word timing dictionaries.
-        """
-        all_timings = []
+    def _rebuild_timing_index(self):
+        """Rebuild the word timing index from the word timings of all chunks."""
+        timing_index = WordTimingIndex()
         for chunk in self.chunks:
-            all_timings.extend(chunk.word_timings)
-        return all_timings
+            timing_index.append(chunk.word_timings, chunk.chunk_id)
+        self.timing_index = timing_index
 
     def unload_model(self):
         """Unload the model to free memory."""
@@ -0,0 +1,149 @@
+"""
+Voice bank module for the Audiobook Reader application.
+Converts the Kokoro voices.json file into an uncompressed .npz voice bank
+once, and opens that bank memory-mapped so only the style vectors of the
+voices actually used are read from disk.
+"""
+
+import os
+import json
+import struct
+import zipfile
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+
+def default_voice_bank_path(voices_path: str) -> str:
+    """
+    Get the path of the voice bank converted from a voices file.
+
+    Args:
+        voices_path: Path to the voices.json file.
+
+    Returns:
+        Path of the .npz voice bank next to it.
+    """
+    return os.path.splitext(voices_path)[0] + ".npz"
+
+
+def convert_voices(voices_path: str, bank_path: Optional[str] = None) -> str:
+    """
+    Convert a voices file to an uncompressed .npz voice bank.
+
+    Each voice is stored as its own float32 array, so it can be memory-mapped
+    without touching the others. The bank is written under a temporary name
+    and moved into place, so a crash never leaves a truncated bank behind.
+
+    Args:
+        voices_path: Path to a voices.json file, or to an existing .npz/.bin bank.
+        bank_path: Path of the bank to write. If None, uses default_voice_bank_path().
+
+    Returns:
+        Path of the written bank.
+    """
+    bank_path = bank_path or default_voice_bank_path(voices_path)
+
+    if voices_path.lower().endswith(".json"):
+        with open(voices_path, "r", encoding="utf-8") as f:
+            voices = {name: np.asarray(style, dtype=np.float32) for name, style in json.load(f).items()}
+    else:
+        with np.load(voices_path) as bank:
+            voices = {name: np.asarray(bank[name], dtype=np.float32) for name in bank.files}
+
+    temp_path = f"{bank_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **voices)
+    os.replace(temp_path, bank_path)
+
+    print(f"Converted {len(voices)} voices from {voices_path} to {bank_path}")
+    return bank_path
+
+
+def ensure_voice_bank(voices_path: str) -> str:
+    """
+    Get a voice bank for a voices file, converting it on first use.
+
+    Args:
+        voices_path: Path to a voices.json file or a voice bank.
+
+    Returns:
+        Path of the voice bank.
+    """
+    if not voices_path.lower().endswith(".json"):
+        return voices_path
+
+    bank_path = default_voice_bank_path(voices_path)
+    if not os.path.exists(bank_path) or os.path.getmtime(bank_path) < os.path.getmtime(voices_path):
+        convert_voices(voices_path, bank_path)
+    return bank_path
+
+
+class VoiceBank(Mapping):
+    """Read-only mapping of voice name to style vectors, memory-mapped from an .npz bank."""
+
+    def __init__(self, bank_path: str):
+        """
+        Open a voice bank.
+
+        Only the zip directory is read here; the style vectors of a voice are
+        mapped on first access and paged in by the OS as the model uses them.
+
+        Args:
+            bank_path: Path to the .npz voice bank.
+        """
+        self.bank_path = bank_path
+        self._lock = threading.Lock()
+        self._styles: Dict[str, np.ndarray] = {}
+
+        with zipfile.ZipFile(bank_path) as archive:
+            self._members = {
+                info.filename[:-len(".npy")]: info
+                for info in archive.infolist() if info.filename.endswith(".npy")
+            }
+
+    def _map(self, info: zipfile.ZipInfo) -> np.ndarray:
+        """Memory-map one stored member of the bank, or read it if it is compressed."""
+        if info.compress_type != zipfile.ZIP_STORED:
+            with np.load(self.bank_path) as bank:
+                return bank[info.filename[:-len(".npy")]]
+
+        with open(self.bank_path, "rb") as f:
+            # The member data follows its local file header, whose name and extra fields vary in length
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+
+        return np.memmap(self.bank_path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                         order="F" if fortran_order else "C")
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Get the style vectors of a voice."""
+        with self._lock:
+            style = self._styles.get(name)
+            if style is None:
+                style = self._map(self._members[name])
+                self._styles[name] = style
+            return style
+
+    def __contains__(self, name) -> bool:
+        """Whether the bank holds a voice."""
+        return name in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the voice names."""
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        """Number of voices in the bank."""
+        return len(self._members)
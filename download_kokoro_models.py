@@ -6,6 +6,8 @@ import os
 import urllib.request
 import sys
 
+from core.voice_bank import ensure_voice_bank
+
 def download_file(url, destination):
     """
     Download a file from a URL to a destination.
@@ -53,6 +55,13 @@ def main():
     
     if success:
         print("All model files downloaded successfully")
+
+        # Convert the voices once, so the reader can memory-map them instead of parsing JSON
+        try:
+            ensure_voice_bank(os.path.join(dest_dir, "voices.json"))
+        except Exception as e:
+            print(f"Failed to convert voices: {str(e)}")
+            return 1
         return 0
     else:
         print("Failed to download some model files")
@@ -4,6 +4,7 @@ Audiobook Reader application entry point.
 
 import sys
 import os
+import logging
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
@@ -13,6 +14,9 @@ from ui.main_window import MainWindow
 
 def main():
     """Main entry point for the application."""
+    # Diagnostics go to the console; set AUDIOBOOK_LOG_LEVEL=DEBUG for per-chunk messages
+    logging.basicConfig(level=os.environ.get("AUDIOBOOK_LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
     # Create the application
     app = QApplication(sys.argv)
     app.setApplicationName("Audiobook Reader")
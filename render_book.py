@@ -0,0 +1,109 @@
+"""
+Pre-render a whole book with Kokoro on all CPU cores.
+
+The rendered chunks go into the synthesis cache used by the reader, so
+playback of the book starts from cached audio. Optionally the whole book is
+also written to a single audio file.
+
+Example:
+    python render_book.py book.md --workers 8 --threads 1 --output book.wav
+"""
+
+import os
+import sys
+import argparse
+
+from core.book_renderer import BookRenderer, KOKORO_AVAILABLE
+from core.synthesis_cache import SynthesisCache
+from core.text_processor import TextProcessor
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Pre-render a book with Kokoro TTS.")
+    parser.add_argument("input", help="Book to render (any format the reader can open)")
+    parser.add_argument("--voice", default="af_sarah", help="Voice to use (default: af_sarah)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Speed factor of the output file; cached chunks are rendered at normal speed, "
+                             "which the reader uses at every speed (default: 1.0)")
+    parser.add_argument("--no-time-stretch", action="store_true",
+                        help="Synthesize at --speed instead of time-stretching, for a reader that does the same")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU cores / threads)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="ONNX Runtime intra-op threads per worker (default: 1)")
+    parser.add_argument("--page-size", type=int, default=5000,
+                        help="Characters per page, as configured in the reader (default: 5000)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Pack short chunks into shared model calls for higher throughput")
+    parser.add_argument("--chunks-per-job", type=int, default=4,
+                        help="Consecutive chunks sent to a worker at once; larger jobs batch better (default: 4)")
+    parser.add_argument("--output", default=None, help="Also write the whole book to this audio file")
+    parser.add_argument("--no-cache", action="store_true", help="Do not store the chunks in the synthesis cache")
+    parser.add_argument("--cache-dir", default=os.path.join(base_dir, "temp", "synthesis_cache"),
+                        help="Synthesis cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=SynthesisCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Size budget of the synthesis cache in MB; a long book needs more than the default")
+    parser.add_argument("--onnx-cache-dir", default=os.path.join(base_dir, "temp", "onnx_cache"),
+                        help="Directory of the optimized model graph shared with the reader")
+    parser.add_argument("--model", default=os.path.join(base_dir, "models", "kokoro", "kokoro-v0_19.onnx"),
+                        help="Path to the Kokoro model file")
+    parser.add_argument("--voices", default=os.path.join(base_dir, "models", "kokoro", "voices.json"),
+                        help="Path to the voices file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function."""
+    args = parse_args(argv)
+
+    if not KOKORO_AVAILABLE:
+        print("kokoro_onnx is not installed, cannot render")
+        return 1
+
+    for path in (args.input, args.model, args.voices):
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+            return 1
+
+    if args.no_cache and not args.output:
+        print("Nothing to do: --no-cache requires --output")
+        return 1
+
+    try:
+        text, _ = TextProcessor().load_file(args.input)
+    except ValueError as e:
+        print(f"Failed to load {args.input}: {str(e)}")
+        return 1
+
+    cache = None if args.no_cache else SynthesisCache(args.cache_dir, args.cache_max_mb * 1024 * 1024, args.model)
+
+    renderer = BookRenderer(
+        args.model, args.voices,
+        workers=args.workers,
+        intra_op_threads=args.threads,
+        page_size=args.page_size,
+        chunks_per_job=args.chunks_per_job,
+        optimized_model_dir=args.onnx_cache_dir,
+        batch=args.batch,
+        time_stretch_speed=not args.no_time_stretch
+    )
+
+    def report_progress(done, total):
+        print(f"\r{done}/{total} chunks", end="", flush=True)
+        if done == total:
+            print()
+
+    stats = renderer.render(text, args.voice, args.speed, cache=cache, output_path=args.output,
+                            progress_callback=report_progress)
+
+    if args.output:
+        print(f"Wrote {args.output}")
+    print(f"Throughput: {stats.realtime_factor:.2f} audio-sec/wall-sec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
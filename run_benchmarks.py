@@ -0,0 +1,85 @@
+"""
+Run the offline benchmarks and write the results as JSON.
+
+Uses generated books and a fake Kokoro model, so no model files, sound
+device or network are needed. Compare the results with an earlier run to
+find regressions.
+
+Example:
+    python run_benchmarks.py --output bench.json --label v0.4
+    python run_benchmarks.py --sizes 10000 --compare bench.json
+"""
+
+import sys
+import json
+import argparse
+import contextlib
+
+from benchmarks.suite import (
+    DEFAULT_PLAYBACK_WORDS, DEFAULT_REPEAT, DEFAULT_SEEKS, DEFAULT_SIZES, compare, run_suite
+)
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the text, timing and synthesis hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Words per generated book (default: 10000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Runs per text benchmark; the best counts (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--playback-words", type=int, default=DEFAULT_PLAYBACK_WORDS,
+                        help=f"Words played by the engine benchmarks (default: {DEFAULT_PLAYBACK_WORDS})")
+    parser.add_argument("--speedup", type=float, default=200.0,
+                        help="How many times faster than real time the null audio output plays (default: 200)")
+    parser.add_argument("--seeks", type=int, default=DEFAULT_SEEKS,
+                        help=f"Seeks in the seek benchmark (default: {DEFAULT_SEEKS})")
+    parser.add_argument("--seconds-per-char", type=float, default=0.0001,
+                        help="Synthesis time of the fake model per character (default: 0.0001)")
+    parser.add_argument("--no-engine", action="store_true", help="Skip the playback and seek benchmarks")
+    parser.add_argument("--label", default=None, help="Name of the version being measured")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Earlier results to report regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Slowdown ignored as noise when comparing, as a fraction (default: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main function."""
+    args = parse_args(argv)
+
+    # The engine's own messages go to stderr, so the results on stdout stay valid JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_suite(
+            sizes=args.sizes,
+            repeat=args.repeat,
+            playback_words=args.playback_words,
+            speedup=args.speedup,
+            seeks=args.seeks,
+            fake_settings={"seconds_per_char": args.seconds_per_char},
+            engine=not args.no_engine,
+            label=args.label,
+            progress=lambda name: print(f"Benchmarking {name}...")
+        )
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Tests for the batch synthesis module.
+"""
+
+import unittest
+
+import numpy as np
+
+from core.batch_synthesis import plan_batches, split_points
+
+
+class TestBatchSynthesis(unittest.TestCase):
+    """Tests for batch planning and splitting."""
+
+    def test_plan_batches(self):
+        """Test that short texts share batches and long ones run alone."""
+        lengths = [300, 50, 60, 500, 10, 200]
+        batches = plan_batches(lengths, max_tokens=400)
+
+        self.assertEqual(sorted(i for batch in batches for i in batch), list(range(len(lengths))))
+        self.assertIn([3], batches)
+        for batch in batches:
+            self.assertEqual(batch, sorted(batch))
+            if len(batch) > 1:
+                self.assertLessEqual(sum(lengths[i] for i in batch) + len(batch) - 1, 400)
+        self.assertLess(len(batches), len(lengths))
+
+    def test_split_points(self):
+        """Test that packed audio is cut in the middle of each separator."""
+        # Tokens: "ab" + separator + "c", 10 samples per token, pads included
+        edges = np.arange(0, 70, 10)
+        ranges = split_points([(0, 2), (3, 4)], edges, 60)
+
+        self.assertEqual(ranges, [(0, 35), (35, 60)])
+
+
+if __name__ == '__main__':
+    unittest.main()
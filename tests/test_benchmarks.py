@@ -0,0 +1,66 @@
+"""
+Tests for the benchmark suite.
+"""
+
+import asyncio
+import unittest
+
+from benchmarks.fakes import FakeKokoro, synthetic_book
+from benchmarks.suite import bench_book, bench_engine, compare
+
+
+class TestFakes(unittest.TestCase):
+    """Tests for the benchmark stand-ins."""
+
+    def test_synthetic_book_is_deterministic(self):
+        """Test that a book has the requested words and the same seed gives the same book."""
+        book = synthetic_book(1000, seed=3)
+        self.assertEqual(len(book.split()), 1000)
+        self.assertEqual(book, synthetic_book(1000, seed=3))
+        self.assertNotEqual(book, synthetic_book(1000, seed=4))
+        self.assertIn("\n\n", book)
+
+    def test_fake_kokoro_stream(self):
+        """Test that the stream's timings cover every word and match its audio."""
+        fake = FakeKokoro(seconds_per_char=0.0, segment_chars=40)
+        text = synthetic_book(60)
+
+        async def collect():
+            return [item async for item in fake.create_stream(text)]
+
+        results = asyncio.run(collect())
+        self.assertGreater(len(results), 1)
+        timings = [timing for _, _, segment_timings in results for timing in segment_timings]
+        self.assertEqual([timing["word"] for timing in timings], text.split())
+
+        duration = sum(len(samples) for samples, _, _ in results) / fake.sample_rate
+        self.assertLessEqual(timings[-1]["end"], duration)
+        self.assertTrue(all(a["end"] <= b["start"] for a, b in zip(timings, timings[1:])))
+
+
+class TestSuite(unittest.TestCase):
+    """Tests for the benchmarks."""
+
+    def test_bench_book(self):
+        """Test that the text benchmarks run on a small book."""
+        results = bench_book(2000, repeat=1, lookups=100)
+        self.assertGreater(results["split_text_into_pages"]["pages"], 1)
+        self.assertEqual(results["highlight_lookup"]["build"]["words"], 2000)
+        self.assertIn("best", results["process_direct_timings"])
+
+    def test_bench_engine(self):
+        """Test that a short text plays to the end, the second time from the cache."""
+        results = bench_engine(synthetic_book(60), {"seconds_per_char": 0.0}, speedup=1000.0, seeks=3)
+        self.assertTrue(results["playback_cold"]["finished"])
+        self.assertGreater(results["playback_cold"]["audio_seconds"], 0)
+        self.assertEqual(results["playback_cached"]["cache_hit_rate"], 1.0)
+
+    def test_compare(self):
+        """Test that only slowdowns beyond the tolerance are reported."""
+        old = {"books": {"10": {"pages": {"best": 1.0}, "chunks": {"best": 1.0}}}}
+        new = {"books": {"10": {"pages": {"best": 1.1}, "chunks": {"best": 2.0}}}}
+        self.assertEqual(compare(old, new, 0.2), ["books.10.chunks: 2.00x slower"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for the cancellation module.
+"""
+
+import threading
+import time
+import unittest
+
+from core.cancellation import CancellationToken, OperationCancelled
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Tests for cancellation tokens."""
+
+    def test_cancel_once(self):
+        """Test that a token is cancelled once, keeping the first reason."""
+        token = CancellationToken()
+        self.assertFalse(token.is_cancelled)
+        self.assertIsNone(token.elapsed())
+
+        self.assertTrue(token.cancel("stop"))
+        self.assertFalse(token.cancel("replaced"))
+        self.assertTrue(token.is_cancelled)
+        self.assertEqual(token.reason, "stop")
+        self.assertGreaterEqual(token.elapsed(), 0.0)
+        with self.assertRaises(OperationCancelled):
+            token.raise_if_cancelled()
+
+    def test_callbacks(self):
+        """Test that callbacks run on cancellation, at once if already cancelled, and not once removed."""
+        token = CancellationToken()
+        calls = []
+        removed = lambda: calls.append("removed")
+        token.add_callback(lambda: calls.append("first"))
+        token.add_callback(removed)
+        token.remove_callback(removed)
+
+        token.cancel()
+        token.add_callback(lambda: calls.append("late"))
+        self.assertEqual(calls, ["first", "late"])
+
+    def test_child(self):
+        """Test that cancelling a parent cancels its children, but not the other way round."""
+        parent = CancellationToken()
+        child = parent.child()
+        other = parent.child()
+
+        other.cancel("own")
+        self.assertFalse(parent.is_cancelled)
+
+        parent.cancel("parent")
+        self.assertTrue(child.is_cancelled)
+        self.assertEqual(child.reason, "parent")
+        self.assertEqual(other.reason, "own")
+
+    def test_wait_wakes_on_cancel(self):
+        """Test that a waiting thread wakes as soon as the token is cancelled."""
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+
+        start = time.perf_counter()
+        self.assertTrue(token.wait(5.0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertFalse(CancellationToken().wait(0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for the Kokoro ONNX engine, run on the fake model of the benchmarks.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+
+from benchmarks.fakes import FakeBackendEngine, FakeKokoro, synthetic_book
+
+
+class TestKokoroOnnxEngine(unittest.TestCase):
+    """Tests for the engine's playback session."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.engine = FakeBackendEngine(FakeKokoro(seconds_per_char=0.0), self.temp_dir.name, speedup=1.0)
+
+    def tearDown(self):
+        self.engine.stop_all_tasks()
+        self.engine.synthesis_loop.stop()
+        self.engine.io_executor.shutdown()
+        self.engine.phoneme_cache.close()
+        self.temp_dir.cleanup()
+
+    def _wait_for_synthesis(self, timeout: float = 10.0):
+        deadline = time.perf_counter() + timeout
+        while not self.engine.synthesis_complete and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(self.engine.synthesis_complete)
+
+    def _wait_for_chunks(self, count: int, timeout: float = 10.0):
+        deadline = time.perf_counter() + timeout
+        while len(self.engine.chunk_start_times) < count and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(len(self.engine.chunk_start_times), count)
+
+    def test_background_synthesis_leaves_session_alone(self):
+        """Test that synthesizing a neighbouring page keeps the playing page's text and timings."""
+        page = synthetic_book(150, seed=1)
+        self.engine.synthesize_and_play_progressively(page)
+        self._wait_for_synthesis()
+        timing_index = self.engine.timing_index
+        words = len(timing_index)
+
+        _, word_timings = self.engine.synthesize(synthetic_book(200, seed=2))
+
+        self.assertEqual(len(word_timings), 200)
+        self.assertIs(self.engine.timing_index, timing_index)
+        self.assertEqual(len(self.engine.timing_index), words)
+        self.assertEqual(self.engine.current_text, page)
+
+    def test_synthesize_renders_at_synthesis_speed(self):
+        """Test that a page synthesized for 1.5x is rendered and cached once, at normal speed."""
+        page = synthetic_book(40, seed=3)
+        audio_path, _ = self.engine.synthesize(page, speed=1.5)
+
+        self.assertAlmostEqual(self.engine.playback_rate(audio_path, 1.5), 1.5)
+        self.assertIsNotNone(self.engine.synthesis_cache.get(page, "af_sarah", 1.0))
+        calls = self.engine.fake.calls
+        self.engine.synthesize(page, speed=2.0)
+        self.assertEqual(self.engine.fake.calls, calls)
+
+    def test_speed_change_on_preprocessed_page(self):
+        """Test that a played page file and a later speed change are heard at the requested speed."""
+        page = synthetic_book(40, seed=4)
+        audio_path, word_timings = self.engine.synthesize(page, speed=1.5)
+        self.engine.play_audio_file(audio_path, word_timings, speed=1.5)
+        self.assertAlmostEqual(self.engine.audio_output.rate, 1.5)
+        self.assertTrue(self.engine.set_speed(2.0))
+        self.assertAlmostEqual(self.engine.audio_output.rate, 2.0)
+
+        # A page rendered at 1.5 is not sped up a second time
+        self.engine.stop_all_tasks()
+        self.engine.time_stretch_speed = False
+        audio_path, word_timings = self.engine.synthesize(page, speed=1.5)
+        self.engine.time_stretch_speed = True
+        self.engine.play_audio_file(audio_path, word_timings, speed=1.5)
+        self.assertAlmostEqual(self.engine.audio_output.rate, 1.0)
+        self.assertTrue(self.engine.set_speed(1.5))
+        self.assertAlmostEqual(self.engine.audio_output.rate, 1.0)
+
+    def test_continuous_reading_releases_played_texts(self):
+        """Test that the audio and timings of pages played a while ago are released, keeping the timeline."""
+        pages = [synthetic_book(60, seed=seed) for seed in range(5, 9)]
+        self.engine.REWIND_SECONDS = 1.0
+        self.engine.audio_output.speedup = 50.0
+        self.engine.synthesize_and_play_progressively(
+            pages[0], next_text=lambda n: pages[n] if n < len(pages) else None)
+
+        deadline = time.perf_counter() + 20.0
+        while self.engine.audio_output.released_chunks == 0 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        output = self.engine.audio_output
+        first_chunks = self.engine.text_first_chunks
+        self.assertGreaterEqual(output.released_chunks, first_chunks[1])
+        self.assertEqual(len(output.chunk_samples(0)), 0)
+        self.assertGreater(output.chunk_length(0), 0)
+        self.assertEqual(len(self.engine.text_timing_index(0)), 0)
+        self.assertEqual(output.chunk_start_frame(first_chunks[1]),
+                         round(self.engine.text_start_times[1] * output.sample_rate))
+
+        # Rewinding past the released audio lands on the first audio still kept
+        self.engine.seek(0.0)
+        self.assertGreaterEqual(output.cursor()[0], output.released_chunks)
+
+    def test_edit_during_background_synthesis(self):
+        """Test that an edit inside a sentence the chunker cut is spliced while another page is synthesized."""
+        page = synthetic_book(400, seed=1)
+        self.engine.synthesize_and_play_progressively(page)
+        self._wait_for_chunks(2)
+        # The first sentence runs past the end of the first chunk
+        self.assertLess(self.engine.chunk_spans[0].end, page.index("?"))
+
+        at = page.index(" ", 48)
+        new_text = page[:at] + " quietly" + page[at:]
+        neighbour = threading.Thread(target=self.engine.synthesize, args=(synthetic_book(300, seed=2),))
+        neighbour.start()
+        applied = self.engine.apply_edit(new_text)
+        neighbour.join()
+
+        self.assertTrue(applied)
+        self.assertEqual(self.engine.current_text, new_text)
+        timing_index = self.engine.timing_index
+        words = [timing_index[i] for i in range(len(timing_index))]
+        self.assertGreater(len(words), 10)
+        self.assertEqual([timing["word"] for timing in words], new_text.split()[:len(words)])
+        for timing in words:
+            self.assertEqual(new_text[timing["position"]:timing["position"] + len(timing["word"])], timing["word"])
+        self.assertTrue((timing_index.starts[1:] >= timing_index.starts[:-1]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+Tests for the Kokoro pipeline engine module.
+"""
+
+import unittest
+
+from core.kokoro_pipeline_engine import MAX_PHONEME_TOKENS, split_phonemes
+
+
+class TestSplitPhonemes(unittest.TestCase):
+    """Tests for cutting phonemes to the pipeline's token limit."""
+
+    def test_short_phonemes_stay_whole(self):
+        """Test that phonemes within the limit are one piece."""
+        self.assertEqual(split_phonemes("ðə kˈæt sˈæt"), ["ðə kˈæt sˈæt"])
+        self.assertEqual(split_phonemes("  "), [])
+
+    def test_long_phonemes_are_cut_between_words(self):
+        """Test that every piece is within the limit and the words stay in order."""
+        phonemes = " ".join(f"wˈɜːd{i}" for i in range(300))
+        pieces = split_phonemes(phonemes)
+
+        self.assertGreater(len(pieces), 1)
+        self.assertTrue(all(len(piece) <= MAX_PHONEME_TOKENS for piece in pieces))
+        self.assertEqual(" ".join(pieces), phonemes)
+
+    def test_overlong_word_is_cut(self):
+        """Test that a word longer than the limit is cut into pieces within it."""
+        pieces = split_phonemes("a " + "x" * 25 + " b", max_tokens=10)
+        self.assertEqual(pieces, ["a", "x" * 10, "x" * 10, "x" * 5 + " b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
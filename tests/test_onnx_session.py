@@ -0,0 +1,58 @@
+"""
+Tests for the ONNX session module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from onnxruntime.datasets import get_example
+
+from core.onnx_session import DEFAULT_SESSION_SETTINGS, create_session, normalize_session_settings
+
+
+class TestOnnxSession(unittest.TestCase):
+    """Tests for the session settings."""
+
+    def test_defaults(self):
+        """Test that missing settings fall back to the defaults."""
+        self.assertEqual(normalize_session_settings(None), DEFAULT_SESSION_SETTINGS)
+        self.assertEqual(normalize_session_settings({"intra_op_threads": 4})["intra_op_threads"], 4)
+
+    def test_invalid_values(self):
+        """Test that invalid values are replaced by the defaults."""
+        settings = normalize_session_settings({
+            "intra_op_threads": "many",
+            "inter_op_threads": -2,
+            "graph_optimization": "maximum",
+            "execution_mode": "random"
+        })
+
+        self.assertEqual(settings["intra_op_threads"], DEFAULT_SESSION_SETTINGS["intra_op_threads"])
+        self.assertEqual(settings["inter_op_threads"], 0)
+        self.assertEqual(settings["graph_optimization"], DEFAULT_SESSION_SETTINGS["graph_optimization"])
+        self.assertEqual(settings["execution_mode"], DEFAULT_SESSION_SETTINGS["execution_mode"])
+
+    def test_optimized_sidecar(self):
+        """Test that the optimized graph is saved, reused, and replaced when unreadable."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_path = os.path.join(temp_dir, "model.onnx")
+            shutil.copy(get_example("logreg_iris.onnx"), model_path)
+            optimized_dir = os.path.join(temp_dir, "optimized")
+
+            create_session(model_path, None, optimized_dir)
+            sidecars = os.listdir(optimized_dir)
+            self.assertEqual(len(sidecars), 1)
+
+            # A corrupt sidecar falls back to the original model and is written again
+            sidecar_path = os.path.join(optimized_dir, sidecars[0])
+            with open(sidecar_path, "wb") as f:
+                f.write(b"not a model")
+            session = create_session(model_path, None, optimized_dir)
+            self.assertTrue(session.get_inputs())
+            self.assertGreater(os.path.getsize(sidecar_path), len(b"not a model"))
+
+
+if __name__ == '__main__':
+    unittest.main()
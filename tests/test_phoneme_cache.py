@@ -0,0 +1,66 @@
+"""
+Tests for the phoneme cache module.
+"""
+
+import os
+import unittest
+import tempfile
+
+from core.phoneme_cache import PhonemeCache
+
+
+class TestPhonemeCache(unittest.TestCase):
+    """Tests for the PhonemeCache class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.calls = []
+
+    def tearDown(self):
+        """Clean up the test environment."""
+        self.temp_dir.cleanup()
+
+    def phonemizer(self, text, lang):
+        """Fake phonemizer that records every sentence it is asked for."""
+        self.calls.append(text)
+        return text.upper()
+
+    def test_repeated_sentences(self):
+        """Test that a repeated sentence is phonemized once."""
+        cache = PhonemeCache()
+        text = "He said. She said.  He   said."
+
+        self.assertEqual(cache.phonemize(text, "en-us", self.phonemizer), "HE SAID. SHE SAID. HE SAID.")
+        self.assertEqual(self.calls, ["He said.", "She said."])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+    def test_lru_bound(self):
+        """Test that the least recently used segment is evicted."""
+        cache = PhonemeCache(max_entries=2)
+        cache.put("one", "en-us", "1")
+        cache.put("two", "en-us", "2")
+        cache.get("one", "en-us")
+        cache.put("three", "en-us", "3")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("one", "en-us"), "1")
+        self.assertIsNone(cache.get("two", "en-us"))
+
+    def test_disk_store(self):
+        """Test that phonemes survive a restart through the disk store."""
+        db_path = os.path.join(self.temp_dir.name, "phonemes.sqlite")
+        cache = PhonemeCache(db_path=db_path)
+        cache.phonemize("Chapter One.", "en-us", self.phonemizer)
+        cache.close()
+
+        cache = PhonemeCache(db_path=db_path)
+        self.assertEqual(cache.phonemize("Chapter  One.", "en-us", self.phonemizer), "CHAPTER ONE.")
+        self.assertIsNone(cache.get("Chapter One.", "en-gb"))
+        self.assertEqual(len(self.calls), 1)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for the reorder buffer module.
+"""
+
+import threading
+import time
+import unittest
+
+from core.cancellation import CancellationToken
+from core.reorder_buffer import ReorderBuffer
+
+
+class TestReorderBuffer(unittest.TestCase):
+    """Tests for the reorder buffer."""
+
+    def test_items_come_out_in_order(self):
+        """Test that items put out of order are taken in sequence order."""
+        buffer = ReorderBuffer()
+        for sequence in (2, 0, 1):
+            self.assertTrue(buffer.put(sequence, f"chunk {sequence}", 1.0))
+
+        self.assertEqual([buffer.get(0.1) for _ in range(3)], ["chunk 0", "chunk 1", "chunk 2"])
+        self.assertIsNone(buffer.get(0.01))
+
+    def test_consumer_waits_for_next_item(self):
+        """Test that a later item does not satisfy a consumer waiting for the next one."""
+        buffer = ReorderBuffer()
+        buffer.put(1, "chunk 1", 1.0)
+        self.assertIsNone(buffer.get(0.05))
+
+        threading.Timer(0.05, buffer.put, args=(0, "chunk 0", 1.0)).start()
+        self.assertEqual(buffer.get(2.0), "chunk 0")
+        self.assertEqual(buffer.get(0.1), "chunk 1")
+
+    def test_backpressure(self):
+        """Test that producers wait once the buffer holds enough audio, except for the next item."""
+        buffer = ReorderBuffer(ahead_seconds=2.0)
+        self.assertTrue(buffer.put(1, "chunk 1", 1.5))
+        self.assertTrue(buffer.put(2, "chunk 2", 1.5))
+        self.assertFalse(buffer.put(3, "chunk 3", 1.5, timeout=0.05))
+
+        # The item the consumer needs is never held back
+        self.assertTrue(buffer.put(0, "chunk 0", 1.5, timeout=0.05))
+        self.assertEqual(buffer.buffered_seconds, 4.5)
+
+        threading.Timer(0.05, lambda: [buffer.get(), buffer.get()]).start()
+        start = time.perf_counter()
+        self.assertTrue(buffer.put(3, "chunk 3", 1.5, timeout=2.0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_finish_and_close(self):
+        """Test that the end of the sequence is detected and closing wakes waiters."""
+        buffer = ReorderBuffer()
+        buffer.put(0, "chunk 0", 1.0)
+        buffer.finish(1)
+        self.assertFalse(buffer.is_done)
+        buffer.get()
+        self.assertTrue(buffer.is_done)
+        self.assertIsNone(buffer.get())  # Returns at once once done
+
+        waiting = ReorderBuffer()
+        threading.Timer(0.05, waiting.close).start()
+        self.assertIsNone(waiting.get(2.0))
+        self.assertFalse(waiting.put(0, "chunk 0", 1.0))
+
+    def test_replace_and_cancel(self):
+        """Test that waiting items can be swapped and that a producer's token ends its wait."""
+        buffer = ReorderBuffer(ahead_seconds=2.0)
+        buffer.put(0, "chunk 0", 1.5)
+        self.assertEqual(buffer.peek(0), "chunk 0")
+        self.assertTrue(buffer.replace(0, "chunk 0 edited", 2.5))
+        self.assertFalse(buffer.replace(1, "chunk 1", 1.0))
+        self.assertEqual(buffer.buffered_seconds, 2.5)
+
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        start = time.perf_counter()
+        self.assertFalse(buffer.put(1, "chunk 1", 1.0, token=token))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(buffer.get(), "chunk 0 edited")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for the scheduler module.
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+import unittest
+
+from core.cancellation import CancellationToken
+from core.scheduler import Priority, PriorityScheduler, set_job_context
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    """Tests for the priority scheduler."""
+
+    def setUp(self):
+        """Set up a scheduler whose worker is held busy until released."""
+        self.scheduler = PriorityScheduler()
+        self.release = threading.Event()
+        self.blocker = self.scheduler.submit_job(Priority.PLAYING, None, self.release.wait)
+        self.order = []
+
+    def tearDown(self):
+        """Release the worker and stop the scheduler."""
+        self.release.set()
+        self.scheduler.shutdown()
+
+    def test_most_urgent_first(self):
+        """Test that queued jobs run by priority class, oldest first within a class."""
+        futures = [self.scheduler.submit_job(priority, None, self.order.append, name)
+                   for priority, name in [(Priority.OFFLINE, "offline"), (Priority.PREFETCH, "prefetch 1"),
+                                          (Priority.PLAYING, "playing"), (Priority.PREFETCH, "prefetch 2"),
+                                          (Priority.SEEK, "seek")]]
+        self.release.set()
+        for future in futures:
+            future.result(timeout=2.0)
+
+        self.assertEqual(self.order, ["playing", "seek", "prefetch 1", "prefetch 2", "offline"])
+
+    def test_cancelled_jobs_are_dropped(self):
+        """Test that jobs of a cancelled token give up their place without running."""
+        token = CancellationToken()
+        stale = self.scheduler.submit_job(Priority.PREFETCH, token, self.order.append, "stale")
+        fresh = self.scheduler.submit_job(Priority.PREFETCH, None, self.order.append, "fresh")
+
+        token.cancel("navigated away")
+        self.assertTrue(stale.cancelled())
+        self.release.set()
+        fresh.result(timeout=2.0)
+
+        self.assertEqual(self.order, ["fresh"])
+        self.assertEqual(self.scheduler.dropped[Priority.PREFETCH], 1)
+
+    def test_reservation_holds_back_less_urgent_jobs(self):
+        """Test that a reserved stream keeps prefetch jobs out of the gaps between its segments."""
+        with self.scheduler.reserve(Priority.PLAYING):
+            prefetch = self.scheduler.submit_job(Priority.PREFETCH, None, self.order.append, "prefetch")
+            self.release.set()
+            self.blocker.result(timeout=2.0)
+            with self.assertRaises(concurrent.futures.TimeoutError):
+                prefetch.result(timeout=0.1)
+
+            self.scheduler.submit_job(Priority.PLAYING, None, self.order.append, "segment").result(timeout=2.0)
+            self.assertEqual(self.order, ["segment"])
+
+        prefetch.result(timeout=2.0)
+        self.assertEqual(self.order, ["segment", "prefetch"])
+
+    def test_context_priority(self):
+        """Test that executor jobs started from a coroutine take the priority of its context."""
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(self.scheduler)
+
+        async def job(priority, name):
+            set_job_context(priority)
+            await asyncio.get_running_loop().run_in_executor(None, self.order.append, name)
+
+        async def main():
+            tasks = [asyncio.ensure_future(job(Priority.PREFETCH, "prefetch")),
+                     asyncio.ensure_future(job(Priority.PLAYING, "playing"))]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            await asyncio.gather(*tasks)
+
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        self.assertEqual(self.order, ["playing", "prefetch"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the synthesis cache module.
+"""
+
+import os
+import unittest
+import tempfile
+
+import numpy as np
+
+from core.synthesis_cache import SynthesisCache
+
+
+class TestSynthesisCache(unittest.TestCase):
+    """Tests for the SynthesisCache class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SynthesisCache(self.temp_dir.name)
+        self.samples = np.linspace(-1.0, 1.0, 2400, dtype=np.float32)
+        self.word_timings = [
+            {"word": "Hello", "start": 0.0, "end": 0.4, "position": 0},
+            {"word": "world.", "start": 0.4, "end": 0.9, "position": 6}
+        ]
+
+    def tearDown(self):
+        """Clean up the test environment."""
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that stored audio and timings come back unchanged."""
+        self.cache.put("Hello world.", "af_sarah", 1.0, self.samples, 24000, self.word_timings)
+
+        cached = self.cache.get("Hello world.", "af_sarah", 1.0)
+        self.assertIsNotNone(cached)
+
+        samples, sample_rate, word_timings = cached
+        np.testing.assert_array_equal(samples, self.samples)
+        self.assertEqual(sample_rate, 24000)
+        self.assertEqual(word_timings, self.word_timings)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_key_depends_on_voice_speed_and_whitespace(self):
+        """Test which request parameters distinguish cache entries."""
+        self.cache.put("Hello world.", "af_sarah", 1.0, self.samples, 24000, self.word_timings)
+
+        # Whitespace differences are normalized away
+        self.assertIsNotNone(self.cache.get("Hello \n world.", "af_sarah", 1.0))
+
+        # Voice and speed are part of the key
+        self.assertIsNone(self.cache.get("Hello world.", "am_adam", 1.0))
+        self.assertIsNone(self.cache.get("Hello world.", "af_sarah", 1.5))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_positions_follow_the_requesting_text(self):
+        """Test that a hit for differently spaced text gets word positions in that text."""
+        self.cache.put("Hello world.", "af_sarah", 1.0, self.samples, 24000, self.word_timings)
+
+        _, _, word_timings = self.cache.get("Hello \n world.", "af_sarah", 1.0)
+        self.assertEqual([timing["position"] for timing in word_timings], [0, 8])
+        self.assertEqual([timing["start"] for timing in word_timings], [0.0, 0.4])
+
+        _, _, word_timings = self.cache.get("Hello world.", "af_sarah", 1.0)
+        self.assertEqual(word_timings, self.word_timings)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        self.cache.put("first", "af_sarah", 1.0, self.samples, 24000, [])
+        entry_size = self.cache.size_bytes
+        self.cache.max_bytes = entry_size * 2
+
+        self.cache.put("second", "af_sarah", 1.0, self.samples, 24000, [])
+
+        # Touch the first entry so the second one becomes the oldest
+        self.assertIsNotNone(self.cache.get("first", "af_sarah", 1.0))
+
+        self.cache.put("third", "af_sarah", 1.0, self.samples, 24000, [])
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get("first", "af_sarah", 1.0))
+        self.assertIsNone(self.cache.get("second", "af_sarah", 1.0))
+        self.assertIsNotNone(self.cache.get("third", "af_sarah", 1.0))
+        self.assertLessEqual(self.cache.size_bytes, self.cache.max_bytes)
+
+    def test_persists_across_instances(self):
+        """Test that a new cache instance finds existing entries on disk."""
+        self.cache.put("Hello world.", "af_sarah", 1.0, self.samples, 24000, self.word_timings)
+
+        reopened = SynthesisCache(self.temp_dir.name)
+        self.assertEqual(len(reopened), 1)
+        self.assertIsNotNone(reopened.get("Hello world.", "af_sarah", 1.0))
+
+    def test_clear(self):
+        """Test clearing the cache removes the files."""
+        self.cache.put("Hello world.", "af_sarah", 1.0, self.samples, 24000, self.word_timings)
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size_bytes, 0)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
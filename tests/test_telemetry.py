@@ -0,0 +1,92 @@
+"""
+Tests for the telemetry module.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from core.telemetry import PipelineMetrics, RateLimitFilter
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    """Tests for the pipeline metrics."""
+
+    def test_time_to_first_audio_counts_once(self):
+        """Test that only the first audio of a request is measured."""
+        metrics = PipelineMetrics()
+        request_id = metrics.start_request()
+
+        self.assertIsNotNone(metrics.first_audio(request_id))
+        self.assertIsNone(metrics.first_audio(request_id))
+        self.assertEqual(metrics.summary("time_to_first_audio")["count"], 1)
+
+    def test_replaced_request_is_abandoned(self):
+        """Test that a request replaced before its first audio is counted as abandoned."""
+        metrics = PipelineMetrics()
+        first = metrics.start_request()
+        metrics.start_request()
+
+        self.assertIsNone(metrics.first_audio(first))
+        self.assertEqual(metrics.snapshot()["counters"]["requests_abandoned"], 1)
+
+    def test_chunks(self):
+        """Test cache counts, latency and real-time factor of chunks."""
+        metrics = PipelineMetrics()
+        metrics.record_chunk(1, audio_seconds=4.0, latency=1.0, cached=False)
+        metrics.record_chunk(1, audio_seconds=2.0, latency=0.5, cached=False)
+        metrics.record_chunk(1, audio_seconds=3.0, latency=0.01, cached=True)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["cache_hits"], 1)
+        self.assertEqual(snapshot["counters"]["cache_misses"], 2)
+        self.assertAlmostEqual(snapshot["cache_hit_rate"], 1 / 3)
+        # Cached chunks do not count towards synthesis speed
+        self.assertEqual(snapshot["series"]["synthesis_latency"]["count"], 2)
+        self.assertAlmostEqual(snapshot["series"]["real_time_factor"]["max"], 0.25)
+
+    def test_buffer_and_log(self):
+        """Test that underruns are counted and buffer events are written at a limited rate."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, "metrics.jsonl")
+            metrics = PipelineMetrics(log_path, buffer_event_interval=60.0)
+            metrics.record_buffer(5.0, 2, 1, underruns=0)
+            metrics.record_buffer(4.0, 2, 1, underruns=0)
+            metrics.record_buffer(0.0, 0, 3, underruns=2)
+            metrics.close()
+
+            with open(log_path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+
+        # The second sample came too soon; the underrun is always written
+        self.assertEqual([event["ahead_seconds"] for event in events], [5.0, 0.0])
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["underruns"], 2)
+        self.assertEqual(snapshot["gauges"]["scheduler_depth"], 3)
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    """Tests for the rate limit filter."""
+
+    def _record(self, level: int, msg: str, *args) -> logging.LogRecord:
+        return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+    def test_repeats_are_held_back(self):
+        """Test that repeats of a message are held back and counted."""
+        rate_filter = RateLimitFilter(interval=60.0)
+        self.assertTrue(rate_filter.filter(self._record(logging.DEBUG, "Chunk %d", 1)))
+        self.assertFalse(rate_filter.filter(self._record(logging.DEBUG, "Chunk %d", 2)))
+        self.assertTrue(rate_filter.filter(self._record(logging.DEBUG, "Other %d", 2)))
+        self.assertTrue(rate_filter.filter(self._record(logging.ERROR, "Failed %d", 1)))
+        self.assertTrue(rate_filter.filter(self._record(logging.ERROR, "Failed %d", 2)))
+
+        rate_filter.interval = 0.0
+        record = self._record(logging.DEBUG, "Chunk %d", 3)
+        self.assertTrue(rate_filter.filter(record))
+        self.assertEqual(record.getMessage(), "Chunk 3 (1 similar messages suppressed)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Tests for the text aligner module.
+"""
+
+import unittest
+
+from core.text_aligner import align_word_timings, align_words
+
+
+class TestTextAligner(unittest.TestCase):
+    """Tests for aligning engine words to the text."""
+
+    def spans_text(self, text, words):
+        """Get the text covered by each aligned word."""
+        return [text[start:end] for start, end in align_words(text, words)]
+
+    def test_repeated_words(self):
+        """Test that every occurrence of a repeated word gets its own span."""
+        text = "The cat and the dog and the bird."
+        spans = align_words(text, text.replace(".", "").split())
+
+        self.assertEqual([start for start, _ in spans], [0, 4, 8, 12, 16, 20, 24, 28])
+        self.assertEqual(text[spans[-1][0]:spans[-1][1]], "bird")
+
+    def test_punctuation_and_spacing(self):
+        """Test that quotes, case, accents and line breaks do not break alignment."""
+        text = "“Hello,” she said.\n\n  Café time!"
+        self.assertEqual(self.spans_text(text, ["hello", "She", "said", ".", "cafe", "time"]),
+                         ["Hello", "she", "said", "said", "Café", "time"])
+
+    def test_split_and_unmatched_words(self):
+        """Test words covering part of a token, and words that match nothing in the text."""
+        text = "I don't know 1990 was good."
+        words = ["I", "do", "n't", "know", "nineteen", "ninety", "was", "good"]
+
+        self.assertEqual(self.spans_text(text, words),
+                         ["I", "do", "n't", "know", "1990", "1990", "was", "good"])
+
+    def test_skipped_words(self):
+        """Test that alignment recovers when the engine skips a word of the text."""
+        text = "Chapter IV. The storm began at night."
+        self.assertEqual(self.spans_text(text, ["chapter", "the", "storm", "began"]),
+                         ["Chapter", "The", "storm", "began"])
+
+    def test_align_word_timings(self):
+        """Test that timings get position and position_end from the text."""
+        timings = align_word_timings("Go  go", [{"word": "go", "start": 0.0, "end": 0.2},
+                                                {"word": "go", "start": 0.2, "end": 0.4}])
+
+        self.assertEqual([(t["position"], t["position_end"]) for t in timings], [(0, 2), (4, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
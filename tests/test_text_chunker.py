@@ -0,0 +1,86 @@
+"""
+Tests for the text chunker module.
+"""
+
+import unittest
+
+from core.text_chunker import SentenceChunker, split_sentences, split_clauses
+
+
+class TestTextChunker(unittest.TestCase):
+    """Tests for the sentence-aware chunker."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.chunker = SentenceChunker(first_chunk_seconds=3.0, target_chunk_seconds=12.0)
+        self.text = (
+            "Chapter One\n\n"
+            "It was a bright cold day in April, and the clocks were striking thirteen.  "
+            "Winston Smith, his chin nuzzled into his breast in an effort to escape the vile wind, "
+            "slipped quickly through the glass doors of Victory Mansions. "
+            "The hallway smelt of boiled cabbage and old rag mats! "
+            "At one end of it a coloured poster, too large for indoor display, had been tacked to the wall. "
+        ) * 4
+
+    def test_split_sentences(self):
+        """Test sentence boundaries, including blank-line breaks."""
+        text = "Heading\n\nFirst one. \"Second one!\" Third?"
+        sentences = [text[start:end] for start, end in split_sentences(text)]
+        self.assertEqual(sentences, ["Heading", "First one.", "\"Second one!\"", "Third?"])
+
+    def test_split_clauses(self):
+        """Test clause boundaries inside a sentence."""
+        text = "Slowly, very slowly; then all at once."
+        clauses = [text[start:end] for start, end in split_clauses(text, 0, len(text))]
+        self.assertEqual(clauses, ["Slowly,", "very slowly;", "then all at once."])
+
+    def test_offsets_match_text(self):
+        """Test that every chunk is an exact slice of the source text."""
+        chunks = self.chunker.chunk(self.text)
+        self.assertGreater(len(chunks), 1)
+
+        for index, chunk in enumerate(chunks):
+            self.assertEqual(chunk.index, index)
+            self.assertEqual(chunk.text, self.text[chunk.start:chunk.end])
+
+        # Chunks are ordered, do not overlap, and together cover every word
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertLessEqual(previous.end, current.start)
+        self.assertEqual(" ".join(" ".join(chunk.text.split()) for chunk in chunks), " ".join(self.text.split()))
+
+    def test_first_chunk_is_short(self):
+        """Test that a long opening sentence is cut down to its first clause."""
+        text = ("The first sentence of this book goes on, and on, and on, well past any "
+                "reasonable length, without ever reaching its end. Then a second one follows.")
+        chunks = self.chunker.chunk(text)
+
+        self.assertLessEqual(self.chunker.estimate_seconds(chunks[0].text),
+                             self.chunker.first_chunk_seconds * self.chunker.FIRST_CLAUSE_SLACK)
+        self.assertEqual(chunks[0].text, "The first sentence of this book goes on,")
+
+    def test_chunks_grow_and_end_on_sentences(self):
+        """Test that chunk sizes grow toward the target and end on sentence boundaries."""
+        chunks = self.chunker.chunk(self.text)
+        durations = [self.chunker.estimate_seconds(chunk.text) for chunk in chunks]
+
+        self.assertLess(durations[0], max(durations))
+        for duration in durations:
+            self.assertLessEqual(duration, self.chunker.target_chunk_seconds)
+        for chunk in chunks[1:]:
+            self.assertIn(chunk.text[-1], ".!?")
+
+    def test_text_without_punctuation(self):
+        """Test that text without any punctuation is still split."""
+        text = " ".join(["word"] * 200)
+        chunks = self.chunker.chunk(text)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(len(chunk.text.split()) for chunk in chunks), 200)
+
+    def test_empty_text(self):
+        """Test that empty text produces no chunks."""
+        self.assertEqual(self.chunker.chunk("   \n "), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
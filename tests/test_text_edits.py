@@ -0,0 +1,73 @@
+"""
+Tests for the text edits module.
+"""
+
+import unittest
+
+import numpy as np
+
+from core.text_edits import TextEdit, diff_sentences, map_positions, narrow_edit, sentence_boundaries
+
+
+class TestTextEdits(unittest.TestCase):
+    """Tests for sentence-level text diffs."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.old_text = "The cat sat. It was a tset. Then it left.\n\nThe end."
+
+    def test_sentence_boundaries(self):
+        """Test that the pieces start with the sentences and cover the whole text."""
+        self.assertEqual(sentence_boundaries(self.old_text), [0, 13, 28, 43, 51])
+        self.assertEqual(sentence_boundaries(""), [0])
+
+    def test_typo_changes_one_sentence(self):
+        """Test that fixing a typo replaces only the sentence containing it."""
+        new_text = self.old_text.replace("tset", "test")
+        edits = diff_sentences(self.old_text, new_text)
+
+        self.assertEqual(edits, [TextEdit(13, 28, 13, 28)])
+        self.assertEqual(new_text[edits[0].new_start:edits[0].new_end], "It was a test. ")
+
+    def test_insert_and_delete(self):
+        """Test that inserted and deleted sentences become separate edits."""
+        new_text = self.old_text.replace("The cat sat. ", "").replace("Then it left.", "Then it left. Quickly.")
+        edits = diff_sentences(self.old_text, new_text)
+
+        self.assertEqual(len(edits), 2)
+        self.assertEqual(self.old_text[edits[0].old_start:edits[0].old_end], "The cat sat. ")
+        self.assertEqual(edits[0].new_start, edits[0].new_end)
+        self.assertEqual(new_text[edits[1].new_start:edits[1].new_end], "Then it left. Quickly.\n\n")
+        self.assertEqual(diff_sentences(self.old_text, self.old_text), [])
+
+    def test_map_positions(self):
+        """Test that offsets move with the edits and offsets inside one go to its end."""
+        new_text = self.old_text.replace("It was a tset.", "It was, in fact, a test.")
+        edits = diff_sentences(self.old_text, new_text)
+        old_positions = np.array([4, 13, 20, 28, 47])
+        new_positions = map_positions(edits, old_positions)
+
+        self.assertEqual(new_text[new_positions[0]:new_positions[0] + 3], "cat")
+        self.assertEqual(new_positions[1], 13)
+        self.assertEqual(new_positions[2], edits[0].new_end)
+        self.assertEqual(new_text[new_positions[3]:new_positions[3] + 4], "Then")
+        self.assertEqual(new_text[new_positions[4]:new_positions[4] + 3], "end")
+
+    def test_narrow_edit(self):
+        """Test that a sentence edit shrinks to the whole words that changed."""
+        new_text = self.old_text.replace("a tset", "a big test")
+        edit = narrow_edit(diff_sentences(self.old_text, new_text)[0], self.old_text, new_text)
+
+        self.assertEqual(self.old_text[edit.old_start:edit.old_end], "tset. ")
+        self.assertEqual(new_text[edit.new_start:edit.new_end], "big test. ")
+        self.assertEqual(self.old_text[:edit.old_start], new_text[:edit.new_start])
+        self.assertEqual(self.old_text[edit.old_end:], new_text[edit.new_end:])
+
+        inserted = self.old_text.replace("cat sat", "cat quietly sat")
+        edit = narrow_edit(diff_sentences(self.old_text, inserted)[0], self.old_text, inserted)
+        self.assertEqual((edit.old_start, edit.old_end), (8, 8))
+        self.assertEqual(inserted[edit.new_start:edit.new_end], "quietly ")
+
+
+if __name__ == '__main__':
+    unittest.main()
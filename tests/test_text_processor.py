@@ -15,8 +15,10 @@ class TestTextProcessor(unittest.TestCase):
     
     def setUp(self):
         """Set up the test environment."""
-        self.text_processor = TextProcessor()
         self.temp_dir = tempfile.TemporaryDirectory()
+        # Keep converted and saved files out of the repository's own directories
+        self.text_processor = TextProcessor(markdown_dir=os.path.join(self.temp_dir.name, "markdown"),
+                                            temp_dir=self.temp_dir.name)
     
     def tearDown(self):
         """Clean up the test environment."""
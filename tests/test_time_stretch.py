@@ -0,0 +1,65 @@
+"""
+Tests for the time-stretch module.
+"""
+
+import unittest
+
+import numpy as np
+
+from core.time_stretch import StreamingTimeStretcher, scale_word_timings, time_stretch
+
+
+class TestTimeStretch(unittest.TestCase):
+    """Tests for the phase vocoder time-stretch."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.sample_rate = 24000
+        t = np.arange(self.sample_rate * 2) / self.sample_rate
+        self.tone = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def dominant_frequency(self, samples):
+        """Get the strongest frequency in the middle of a signal."""
+        middle = samples[len(samples) // 4:-len(samples) // 4]
+        spectrum = np.abs(np.fft.rfft(middle * np.hanning(len(middle))))
+        return np.argmax(spectrum) * self.sample_rate / len(middle)
+
+    def test_length_and_pitch(self):
+        """Test that stretching changes the duration but not the pitch."""
+        for rate in (0.5, 1.5, 2.0):
+            stretched = time_stretch(self.tone, rate)
+            self.assertEqual(len(stretched), round(len(self.tone) / rate))
+            self.assertAlmostEqual(self.dominant_frequency(stretched), 220, delta=2)
+
+    def test_unit_rate(self):
+        """Test that a rate of 1.0 returns the audio unchanged."""
+        np.testing.assert_array_equal(time_stretch(self.tone, 1.0), self.tone)
+
+    def test_streaming_stretch(self):
+        """Test that the streaming stretcher keeps the pitch and loudness at any step."""
+        stretcher = StreamingTimeStretcher()
+        for rate in (0.5, 2.0):
+            stretcher.reset()
+            position = 0.0
+            hops = []
+            while position + stretcher.input_length <= len(self.tone):
+                start = int(round(position))
+                hops.append(stretcher.hop(self.tone[start:start + stretcher.input_length]))
+                position += stretcher.hop_length * rate
+            stretched = np.concatenate(hops)
+
+            self.assertAlmostEqual(self.dominant_frequency(stretched), 220, delta=2)
+            middle = stretched[len(stretched) // 4:-len(stretched) // 4]
+            self.assertAlmostEqual(np.sqrt(np.mean(middle ** 2)), np.sqrt(np.mean(self.tone ** 2)), delta=0.02)
+
+    def test_scale_word_timings(self):
+        """Test that timings are scaled without changing the input."""
+        timings = [{"word": "hello", "start": 1.0, "end": 2.0, "position": 0}]
+        scaled = scale_word_timings(timings, 2.0)
+
+        self.assertEqual(scaled, [{"word": "hello", "start": 0.5, "end": 1.0, "position": 0}])
+        self.assertEqual(timings[0]["start"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the timing estimator module.
+"""
+
+import unittest
+
+import numpy as np
+
+from core.timing_estimator import estimate_word_timings_from_audio, find_pauses
+
+SAMPLE_RATE = 24000
+
+
+def speech(*parts):
+    """Build audio from (seconds, voiced) parts, voiced parts being a tone."""
+    audio = []
+    for seconds, voiced in parts:
+        samples = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+        if voiced:
+            t = np.arange(len(samples)) / SAMPLE_RATE
+            samples = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        audio.append(samples)
+    return np.concatenate(audio)
+
+
+class TestTimingEstimator(unittest.TestCase):
+    """Tests for estimating word timings from audio."""
+
+    def test_find_pauses(self):
+        """Test that silences are found and short gaps inside words are ignored."""
+        audio = speech((0.2, False), (0.5, True), (0.03, False), (0.5, True), (0.3, False), (0.5, True))
+        pauses = find_pauses(audio, SAMPLE_RATE)
+
+        self.assertEqual(len(pauses), 2)
+        self.assertAlmostEqual(pauses[0, 1], 0.2, places=2)
+        self.assertAlmostEqual(pauses[1, 0], 1.23, places=2)
+        self.assertAlmostEqual(pauses[1, 1], 1.53, places=2)
+
+    def test_pause_snaps_to_punctuation(self):
+        """Test that a pause ends the sentence before it, not the word nearest by length."""
+        text = "Stop now. Then we all go home"
+        audio = speech((0.1, False), (0.6, True), (0.4, False), (1.4, True), (0.1, False))
+        timings = estimate_word_timings_from_audio(text, audio, SAMPLE_RATE)
+
+        self.assertEqual([t["word"] for t in timings], text.split())
+        self.assertAlmostEqual(timings[0]["start"], 0.1, places=2)
+        self.assertAlmostEqual(timings[1]["end"], 0.7, places=2)
+        self.assertAlmostEqual(timings[2]["start"], 1.1, places=2)
+        self.assertAlmostEqual(timings[-1]["end"], 2.5, places=2)
+        self.assertEqual((timings[2]["position"], timings[2]["position_end"]), (10, 14))
+
+    def test_silent_audio(self):
+        """Test that silent or empty input still gives ordered timings."""
+        timings = estimate_word_timings_from_audio("one two", np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+        self.assertEqual(len(timings), 2)
+        self.assertLessEqual(timings[0]["end"], timings[1]["start"])
+        self.assertEqual(estimate_word_timings_from_audio("", np.zeros(10), SAMPLE_RATE), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for the word timing index module.
+"""
+
+import unittest
+
+from core.timing_index import WordTimingIndex
+
+
+class TestWordTimingIndex(unittest.TestCase):
+    """Tests for the word timing index."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        # "Hello world. Good morning."
+        self.first_chunk = [
+            {"word": "Hello", "start": 0.0, "end": 0.4, "position": 0},
+            {"word": "world.", "start": 0.5, "end": 1.0, "position": 6},
+        ]
+        self.second_chunk = [
+            {"word": "Good", "start": 1.2, "end": 1.5, "position": 13},
+            {"word": "morning.", "start": 1.6, "end": 2.2, "position": 18},
+        ]
+
+    def test_lookup_by_time(self):
+        """Test that a time finds the word playing, or the last one started."""
+        index = WordTimingIndex(self.first_chunk)
+        index.append(self.second_chunk, 1)
+
+        self.assertEqual(index.index_at_time(0.2), 0)
+        self.assertEqual(index.index_at_time(1.1), 1)  # In the pause after "world."
+        self.assertEqual(index.index_at_time(-1.0), 0)
+        self.assertEqual(index.index_at_time(10.0), 3)
+        self.assertEqual(index.char_at_time(1.3), 13)
+
+    def test_lookup_by_character(self):
+        """Test that a character position finds the word containing or preceding it."""
+        index = WordTimingIndex(self.first_chunk + self.second_chunk)
+
+        self.assertEqual(index.index_at_char(8), 1)
+        self.assertEqual(index.index_at_char(12), 1)
+        self.assertEqual(index.time_at_char(20), 1.6)
+        self.assertEqual(index[2]["word"], "Good")
+
+    def test_incremental_append(self):
+        """Test that chunks appended one by one grow the index past its initial capacity."""
+        index = WordTimingIndex()
+        self.assertEqual(index.index_at_time(1.0), -1)
+        self.assertIsNone(index.time_at_char(0))
+
+        for chunk_id in range(300):
+            index.append([{"word": "word", "start": float(chunk_id), "end": chunk_id + 0.5, "position": chunk_id * 5}], chunk_id)
+
+        self.assertEqual(len(index), 300)
+        self.assertEqual(index.index_at_time(250.7), 250)
+        self.assertEqual(index.chunk_first_index(120), 120)
+        self.assertEqual(index.chunk_first_index(301), -1)
+
+    def test_missing_positions(self):
+        """Test that words without a position follow the word before them."""
+        index = WordTimingIndex([{"word": "one", "start": 0.0, "end": 0.3},
+                                 {"word": "two", "start": 0.3, "end": 0.6}])
+
+        self.assertEqual(list(index.char_starts), [0, 3])
+        self.assertEqual(index.index_at_char(4), 1)
+
+    def test_replace_chunk(self):
+        """Test that replacing a chunk moves the words after it in time and keeps their order."""
+        index = WordTimingIndex(self.first_chunk)
+        index.append(self.second_chunk, 1)
+        index.append([{"word": "Bye.", "start": 2.5, "end": 2.9, "position": 27}], 2)
+
+        # "Good morning." became "Good morning, everyone." and got 0.8 s longer
+        index.replace_chunk(1, [
+            {"word": "Good", "start": 1.2, "end": 1.5, "position": 13},
+            {"word": "morning,", "start": 1.6, "end": 2.2, "position": 18},
+            {"word": "everyone.", "start": 2.3, "end": 3.0, "position": 27},
+        ], 0.8)
+        index.map_positions(lambda positions: positions + (positions >= 27) * 10)
+
+        self.assertEqual([timing["word"] for timing in index], ["Hello", "world.", "Good", "morning,", "everyone.", "Bye."])
+        self.assertEqual(index[5]["start"], 3.3)
+        self.assertEqual(index[5]["position"], 37)
+        self.assertEqual(index[4]["position"], 37)  # Mapped as well; the caller keeps the two apart
+        self.assertEqual(index.chunk_first_index(2), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the voice bank module.
+"""
+
+import os
+import json
+import unittest
+import tempfile
+
+import numpy as np
+
+from core.voice_bank import VoiceBank, ensure_voice_bank
+
+
+class TestVoiceBank(unittest.TestCase):
+    """Tests for the VoiceBank class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.voices_path = os.path.join(self.temp_dir.name, "voices.json")
+
+        rng = np.random.default_rng(0)
+        self.voices = {name: rng.random((4, 1, 8), dtype=np.float32) for name in ("af_sarah", "am_adam")}
+        with open(self.voices_path, "w") as f:
+            json.dump({name: style.tolist() for name, style in self.voices.items()}, f)
+
+    def tearDown(self):
+        """Clean up the test environment."""
+        self.temp_dir.cleanup()
+
+    def test_convert_and_map(self):
+        """Test that converted voices are memory-mapped with their original values."""
+        bank = VoiceBank(ensure_voice_bank(self.voices_path))
+
+        self.assertEqual(sorted(bank), sorted(self.voices))
+        self.assertIn("af_sarah", bank)
+        self.assertNotIn("missing", bank)
+        for name, style in self.voices.items():
+            self.assertIsInstance(bank[name], np.memmap)
+            np.testing.assert_array_equal(bank[name], style)
+
+    def test_convert_once(self):
+        """Test that an up-to-date bank is reused instead of converted again."""
+        bank_path = ensure_voice_bank(self.voices_path)
+        mtime = os.path.getmtime(bank_path)
+
+        self.assertEqual(ensure_voice_bank(self.voices_path), bank_path)
+        self.assertEqual(os.path.getmtime(bank_path), mtime)
+
+    def test_compressed_bank(self):
+        """Test that a compressed bank still loads, without memory-mapping."""
+        bank_path = os.path.join(self.temp_dir.name, "voices.npz")
+        np.savez_compressed(bank_path, **self.voices)
+
+        bank = VoiceBank(bank_path)
+        np.testing.assert_array_equal(bank["am_adam"], self.voices["am_adam"])
+
+
+if __name__ == '__main__':
+    unittest.main()
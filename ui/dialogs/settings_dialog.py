@@ -5,10 +5,11 @@ Settings dialog module for the Audiobook Reader application.
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QComboBox, QDialogButtonBox, QSlider, QGroupBox,
-    QFormLayout
+    QFormLayout, QSpinBox, QCheckBox
 )
 from PyQt6.QtCore import Qt
 
+from core.onnx_session import normalize_session_settings
 from core.state_manager import StateManager
 
 
@@ -28,7 +29,7 @@ class SettingsDialog(QDialog):
         self.state_manager = state_manager
 
         self.setWindowTitle("Settings")
-        self.resize(400, 300)
+        self.resize(400, 450)
 
         self.setup_ui()
         self.load_settings()
@@ -66,6 +67,10 @@ class SettingsDialog(QDialog):
         speed_layout.addWidget(self.speed_label)
         tts_layout.addRow("Speed:", speed_layout)
 
+        # Continuous reading
+        self.continuous_check = QCheckBox("Continue reading on the next page without stopping")
+        tts_layout.addRow(self.continuous_check)
+
         tts_group.setLayout(tts_layout)
         layout.addWidget(tts_group)
 
@@ -93,6 +98,46 @@ class SettingsDialog(QDialog):
         stt_group.setLayout(stt_layout)
         layout.addWidget(stt_group)
 
+        # ONNX Runtime performance settings group
+        performance_group = QGroupBox("Performance")
+        performance_layout = QFormLayout()
+
+        # Thread counts, 0 lets ONNX Runtime decide
+        self.intra_threads_spin = QSpinBox()
+        self.intra_threads_spin.setRange(0, 64)
+        self.intra_threads_spin.setSpecialValueText("Auto")
+        performance_layout.addRow("Intra-op threads:", self.intra_threads_spin)
+
+        self.inter_threads_spin = QSpinBox()
+        self.inter_threads_spin.setRange(0, 64)
+        self.inter_threads_spin.setSpecialValueText("Auto")
+        performance_layout.addRow("Inter-op threads:", self.inter_threads_spin)
+
+        # Graph optimization level
+        self.optimization_combo = QComboBox()
+        self.optimization_combo.addItem("All", "all")
+        self.optimization_combo.addItem("Extended", "extended")
+        self.optimization_combo.addItem("Basic", "basic")
+        self.optimization_combo.addItem("Disabled", "disabled")
+        performance_layout.addRow("Graph optimization:", self.optimization_combo)
+
+        # Execution mode
+        self.execution_mode_combo = QComboBox()
+        self.execution_mode_combo.addItem("Sequential", "sequential")
+        self.execution_mode_combo.addItem("Parallel", "parallel")
+        performance_layout.addRow("Execution mode:", self.execution_mode_combo)
+
+        # Start-up warm-up
+        self.warm_up_check = QCheckBox("Load and warm up the voice model at start-up")
+        performance_layout.addRow(self.warm_up_check)
+
+        # Batched background rendering
+        self.batch_background_check = QCheckBox("Pre-render nearby pages in batches (higher throughput)")
+        performance_layout.addRow(self.batch_background_check)
+
+        performance_group.setLayout(performance_layout)
+        layout.addWidget(performance_group)
+
         # Add buttons
         button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -116,6 +161,9 @@ class SettingsDialog(QDialog):
         # Set speed
         self.speed_slider.setValue(int(speed * 100))
 
+        # Set continuous reading
+        self.continuous_check.setChecked(tts_settings.get("continuous", False))
+
         # Load STT settings
         stt_settings = self.state_manager.get("stt_settings", {})
         model = stt_settings.get("model", "base")
@@ -131,6 +179,19 @@ class SettingsDialog(QDialog):
         if index >= 0:
             self.language_combo.setCurrentIndex(index)
 
+        # Load performance settings
+        onnx_settings = normalize_session_settings(self.state_manager.get("onnx_settings"))
+        self.intra_threads_spin.setValue(onnx_settings["intra_op_threads"])
+        self.inter_threads_spin.setValue(onnx_settings["inter_op_threads"])
+        index = self.optimization_combo.findData(onnx_settings["graph_optimization"])
+        if index >= 0:
+            self.optimization_combo.setCurrentIndex(index)
+        index = self.execution_mode_combo.findData(onnx_settings["execution_mode"])
+        if index >= 0:
+            self.execution_mode_combo.setCurrentIndex(index)
+        self.warm_up_check.setChecked(onnx_settings["warm_up"])
+        self.batch_background_check.setChecked(onnx_settings["batch_background"])
+
     def update_speed_label(self, value):
         """
         Update the speed label.
@@ -146,7 +207,8 @@ class SettingsDialog(QDialog):
         # Save TTS settings
         tts_settings = {
             "voice": self.voice_combo.currentData(),
-            "speed": self.speed_slider.value() / 100.0
+            "speed": self.speed_slider.value() / 100.0,
+            "continuous": self.continuous_check.isChecked()
         }
         self.state_manager.set("tts_settings", tts_settings)
 
@@ -157,6 +219,17 @@ class SettingsDialog(QDialog):
         }
         self.state_manager.set("stt_settings", stt_settings)
 
+        # Save performance settings
+        onnx_settings = {
+            "intra_op_threads": self.intra_threads_spin.value(),
+            "inter_op_threads": self.inter_threads_spin.value(),
+            "graph_optimization": self.optimization_combo.currentData(),
+            "execution_mode": self.execution_mode_combo.currentData(),
+            "warm_up": self.warm_up_check.isChecked(),
+            "batch_background": self.batch_background_check.isChecked()
+        }
+        self.state_manager.set("onnx_settings", onnx_settings)
+
         # Save state
         self.state_manager.save_state()
 
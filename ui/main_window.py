@@ -35,14 +35,20 @@ from core.text_processor import TextProcessor
 from core.stt_engine import STTEngine
 from core.kokoro_onnx_engine import KokoroOnnxEngine
 from core.state_manager import StateManager
+from core.timing_index import WordTimingIndex
+from core.scheduler import Priority
+from core.telemetry import get_logger
 from ui.dialogs.transcription_dialog import TranscriptionDialog
 from ui.dialogs.settings_dialog import SettingsDialog
 from ui.bookmarks_dialog import BookmarksDialog
 from utils.helpers import (
     validate_file_path, get_supported_audio_extensions,
-    get_supported_text_extensions, format_time
+    get_supported_text_extensions, format_time, split_text_into_pages
 )
 from utils.threads import ThreadManager
+from utils.playback_signals import PlaybackClock
+
+logger = get_logger(__name__)
 
 
 class MainWindow(QMainWindow):
@@ -56,8 +62,9 @@ class MainWindow(QMainWindow):
         self.audio_processor = AudioProcessor()
         self.text_processor = TextProcessor()
         self.stt_engine = STTEngine()
-        self.tts_engine = KokoroOnnxEngine()
         self.state_manager = StateManager()
+        self.tts_engine = KokoroOnnxEngine(session_settings=self.state_manager.get("onnx_settings"),
+                                           metrics_log_path=self.state_manager.get("metrics_log"))
         self.thread_manager = ThreadManager()
 
         # Initialize bookmark
@@ -69,12 +76,14 @@ class MainWindow(QMainWindow):
         self.pages = []  # List of text pages
         self.current_page_index = 0
         self.page_size = 5000  # Characters per page (adjustable)
+        self.playback_first_page = 0  # Page the engine started playing from; continuous reading moves past it
 
         # Initialize background processor
         self.background_processor = BackgroundProcessor()
 
         # Track pre-processed pages
         self.preprocessed_pages = set()
+        self.preprocess_tokens = {}  # Cancellation token of the preprocessing of each page
 
         # Initialize media player
         self.media_player = QMediaPlayer()
@@ -85,7 +94,7 @@ class MainWindow(QMainWindow):
         self.current_file_path = None
         self.current_audio_path = None
         self.current_text = ""
-        self.word_timings = []
+        self.timing_index = WordTimingIndex()  # Word timings of the current page's audio
         self.is_playing = False
         self.auto_play = False  # Don't auto-play when loading files
         self.last_playback_position = 0  # Track the last playback position
@@ -95,6 +104,11 @@ class MainWindow(QMainWindow):
         self.highlight_timer = QTimer()
         self.highlight_timer.timeout.connect(self.update_highlight)
 
+        # Position updates for audio played by the TTS engine
+        self.playback_clock = PlaybackClock(self.tts_engine, parent=self)
+        self.playback_clock.position_changed.connect(self.engine_position_changed)
+        self.playback_clock.start()
+
         # Timer for delayed re-synthesis after text edits
         self.edit_timer = QTimer()
         self.edit_timer.setSingleShot(True)
@@ -113,6 +127,12 @@ class MainWindow(QMainWindow):
         # Load saved state
         self.load_state()
 
+        # Build and warm the ONNX session now, so the first Play runs at full speed
+        if self.tts_engine.session_settings["warm_up"]:
+            tts_settings = self.state_manager.get("tts_settings", {})
+            self.tts_engine.warm_up_in_background(tts_settings.get("voice", "af_sarah"),
+                                                  tts_settings.get("speed", 1.0))
+
     def setup_ui(self):
         """Set up the user interface."""
         self.setWindowTitle("Audiobook Reader")
@@ -353,17 +373,32 @@ class MainWindow(QMainWindow):
         # Accept the close event
         event.accept()
 
+    def _using_engine_playback(self) -> bool:
+        """Whether the current page is played by the TTS engine rather than the media player."""
+        return self.tts_engine.is_playback_active()
+
+    def _word_timing_index(self) -> WordTimingIndex:
+        """Word timings of the audio that is playing: the engine's while it plays, otherwise the page's."""
+        if self._using_engine_playback():
+            # In continuous reading the engine keeps one index per page it has played into
+            page_offset = self.current_page_index - self.playback_first_page
+            if page_offset:
+                return self.tts_engine.text_timing_index(page_offset)
+            return self.tts_engine.timing_index
+        return self.timing_index
+
     def _save_current_position(self):
         """Save the current playback position for the current file."""
         if not self.current_file_path:
             return
 
-        # Get current position
+        # Get current position and page
         current_position = 0
+        current_page = self.current_page_index
         if self.is_playing:
-            if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
+            if self._using_engine_playback():
                 # For progressive playback, use the TTS engine's current position
-                current_position = self.tts_engine.current_position
+                current_position = self.tts_engine.position()
             else:
                 # For media player, get position in milliseconds and convert to seconds
                 current_position = self.media_player.position() / 1000.0
@@ -371,8 +406,13 @@ class MainWindow(QMainWindow):
             # Use the stored position if we have one
             current_position = self.last_playback_position
 
-        # Get current page
-        current_page = self.current_page_index
+        if self._using_engine_playback():
+            # In continuous reading the engine's timeline runs across pages, also while paused;
+            # save the offset into the page that is playing
+            text_index = self.tts_engine.text_at_time(current_position)
+            if text_index < len(self.tts_engine.text_start_times):
+                current_position -= self.tts_engine.text_start_times[text_index]
+            current_page = self.playback_first_page + text_index
 
         # Get cursor position - use the last highlighted position if available and playing
         cursor_position = self.text_display.textCursor().position()
@@ -648,23 +688,33 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("No text to synthesize on this page.")
             return
 
+        # Get TTS settings
+        tts_settings = self.state_manager.get("tts_settings", {})
+        voice = tts_settings.get("voice", "af_sarah")
+        speed = tts_settings.get("speed", 1.0)
+        continuous = tts_settings.get("continuous", False)
+        self.playback_first_page = self.current_page_index
+
         # Check if this page has been preprocessed
         task_id = f"page_{self.current_page_index}"
         preprocessed_result = self.background_processor.get_result(task_id)
 
-        if preprocessed_result:
+        # A preprocessed page file holds only that page; continuous reading synthesizes
+        # progressively instead, which reuses the cached chunks of preprocessed pages
+        if preprocessed_result and not continuous:
             print(f"Using preprocessed content for synthesis of page {self.current_page_index}")
             # We have preprocessed content, use it
             self.current_audio_path = preprocessed_result.get("audio_path")
-            self.word_timings = preprocessed_result.get("word_timings")
+            word_timings = preprocessed_result.get("word_timings") or []
+            self.timing_index = WordTimingIndex(word_timings)
 
             # If we have a valid audio path, we can skip synthesis and just play
             if self.current_audio_path and os.path.exists(self.current_audio_path):
                 print(f"Using cached audio: {self.current_audio_path}")
-                # Convert the file path to a QUrl
-                file_url = QUrl.fromLocalFile(self.current_audio_path)
-                self.media_player.setSource(file_url)
-                self.media_player.play()
+                # Play through the engine's output stream, like freshly synthesized audio
+                self.media_player.stop()
+                self.synthesis_thread = None
+                self.playback_thread = self.tts_engine.play_audio_file(self.current_audio_path, word_timings, speed)
 
                 # Update UI
                 self.play_button.setIcon(self.pause_icon)
@@ -674,11 +724,6 @@ class MainWindow(QMainWindow):
                 self.status_bar.showMessage(f"Playing page {self.current_page_index + 1} (using cached audio)")
                 return
 
-        # Get TTS settings
-        tts_settings = self.state_manager.get("tts_settings", {})
-        voice = tts_settings.get("voice", "af_sarah")
-        speed = tts_settings.get("speed", 1.0)
-
         # Stop any existing playback
         if self.is_playing:
             # Stop media player
@@ -741,45 +786,37 @@ class MainWindow(QMainWindow):
                         self.last_cursor_position = start_position
                         print(f"Stored cursor position: {start_position}")
 
-                        # Try to find the corresponding time position if we have word timings
-                        if word_timings:
-                            try:
-                                # Convert keys to integers for comparison
-                                positions = []
-                                for pos_key in word_timings.keys():
-                                    try:
-                                        positions.append(int(float(pos_key)))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                                if positions:
-                                    closest_pos = min(positions, key=lambda x: abs(x - start_position))
-                                    closest_pos_key = str(closest_pos)
-
-                                    if closest_pos_key in word_timings:
-                                        time_sec = float(word_timings[closest_pos_key])
-                                        print(f"Setting initial playback position to {time_sec}s based on cursor at position {start_position}")
-
-                                        # Set the position in the TTS engine
-                                        self.tts_engine.set_position(time_sec)
-                                        self.last_playback_position = time_sec
-                            except Exception as e:
-                                print(f"Error setting initial position: {str(e)}")
+                        # Find the corresponding time position if the first chunk reaches it
+                        timing_index = self.tts_engine.timing_index
+                        if len(timing_index) and timing_index.char_ends[-1] >= start_position:
+                            time_sec = timing_index.time_at_char(start_position)
+                            print(f"Setting initial playback position to {time_sec}s based on cursor at position {start_position}")
+
+                            # Start playback at this position
+                            self.tts_engine.seek(time_sec)
+                            self.last_playback_position = time_sec
             except RuntimeError as e:
                 # The UI is being destroyed, just log and return
                 print(f"UI component error in callback: {str(e)} - UI may be shutting down")
                 return
 
-        try:
-            # Clear the cache first to avoid any conflicts
-            self.tts_engine.clear_all_cache()
+        # In continuous reading the engine asks for the following pages as it nears the end of each one
+        next_text = None
+        if continuous:
+            first_page = self.current_page_index
+
+            def next_text(n):
+                page_index = first_page + n
+                return self.pages[page_index] if page_index < len(self.pages) else None
 
-            # Start progressive synthesis and playback for the current page only
+        try:
+            # Start progressive synthesis and playback from the current page
             self.synthesis_thread, self.playback_thread = self.tts_engine.synthesize_and_play_progressively(
                 current_page_text,
                 voice=voice,
                 speed=speed,
-                callback=chunk_callback
+                callback=chunk_callback,
+                next_text=next_text
             )
 
             # Update UI state
@@ -814,16 +851,9 @@ class MainWindow(QMainWindow):
         # Store the audio path and word timings
         self.current_audio_path = audio_path
 
-        # Store both the list and dictionary versions of word timings
-        # The list version is used for highlighting
-        if hasattr(self.tts_engine, 'word_timings_list'):
-            print(f"Using word_timings_list from TTS engine with {len(self.tts_engine.word_timings_list)} entries")
-        else:
-            print("No word_timings_list available from TTS engine")
-
-        # The dictionary version is used for cursor position lookup
-        self.word_timings = word_timings
-        print(f"Stored word_timings dictionary with {len(self.word_timings) if self.word_timings else 0} entries")
+        # The engine's index grows as chunks arrive; it is used for highlighting and cursor lookup
+        self.timing_index = self.tts_engine.timing_index
+        print(f"Using word timing index from TTS engine with {len(self.timing_index)} entries")
 
         # Update status
         self.status_bar.showMessage("Starting playback...")
@@ -922,16 +952,9 @@ class MainWindow(QMainWindow):
 
         self.current_audio_path = audio_path
 
-        # Store both the list and dictionary versions of word timings
-        # The list version is used for highlighting
-        if hasattr(self.tts_engine, 'word_timings_list'):
-            print(f"Using word_timings_list from TTS engine with {len(self.tts_engine.word_timings_list)} entries")
-        else:
-            print("No word_timings_list available from TTS engine")
-
-        # The dictionary version is used for cursor position lookup
-        self.word_timings = word_timings
-        print(f"Stored word_timings dictionary with {len(self.word_timings) if self.word_timings else 0} entries")
+        # The timings of this page's audio, used for highlighting and cursor lookup
+        self.timing_index = WordTimingIndex(word_timings)
+        print(f"Using word timing index with {len(self.timing_index)} entries")
 
         # Load the audio into the media player
         print(f"Setting media source to: {audio_path}")
@@ -1008,6 +1031,22 @@ class MainWindow(QMainWindow):
         total_time = format_time(self.media_player.duration() / 1000)
         self.time_label.setText(f"{current_time} / {total_time}")
 
+    def engine_position_changed(self, position):
+        """
+        Handle playback position changes of the TTS engine.
+
+        Args:
+            position: The new position in seconds.
+        """
+        if not self._using_engine_playback():
+            return
+
+        # Update time label; the total is what has been synthesized so far
+        total = self.tts_engine.audio_output.total_frames / self.tts_engine.audio_output.sample_rate
+        self.time_label.setText(f"{format_time(position)} / {format_time(total)}")
+        if total > 0:
+            self.position_slider.setValue(int(position / total * 100))
+
     def duration_changed(self, duration):
         """
         Handle media player duration changes.
@@ -1038,9 +1077,9 @@ class MainWindow(QMainWindow):
                 return
 
             # Get current time - either from media player or from TTS engine
-            if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
+            if self._using_engine_playback():
                 # For progressive playback, use the TTS engine's current position
-                current_time = self.tts_engine.current_position
+                current_time = self.tts_engine.position()
             else:
                 # For media player playback, convert from milliseconds to seconds
                 current_time = self.media_player.position() / 1000
@@ -1048,6 +1087,12 @@ class MainWindow(QMainWindow):
             # Store the current playback position for resuming later
             self.last_playback_position = current_time
 
+            # In continuous reading, show the page that has started playing
+            if self._using_engine_playback():
+                playing_page = self.playback_first_page + self.tts_engine.text_at_time(current_time)
+                if playing_page != self.current_page_index and playing_page < len(self.pages):
+                    self._advance_page_view(playing_page)
+
             # Get the current text
             current_text = self.text_display.toPlainText()
 
@@ -1063,33 +1108,13 @@ class MainWindow(QMainWindow):
 
             # Determine which chunk to highlight based on time
             # If we have word timings, use them to find the approximate position
-            if hasattr(self.tts_engine, 'word_timings_list') and self.tts_engine.word_timings_list:
-                word_timings_list = self.tts_engine.word_timings_list
-
-                # Find the current word based on time
-                current_word_index = -1
-                for i, timing in enumerate(word_timings_list):
-                    if timing["start"] <= current_time <= timing["end"]:
-                        current_word_index = i
-                        break
-
-                # If we didn't find an exact match, find the closest word
-                if current_word_index == -1:
-                    for i, timing in enumerate(word_timings_list):
-                        if timing["start"] > current_time:
-                            if i > 0:
-                                current_word_index = i - 1
-                            else:
-                                current_word_index = 0
-                            break
-
-                # If we still don't have a word, use the last word
-                if current_word_index == -1 and word_timings_list:
-                    current_word_index = len(word_timings_list) - 1
-
-                # If we have a valid word index, get its position
-                if current_word_index >= 0 and current_word_index < len(word_timings_list):
-                    word_info = word_timings_list[current_word_index]
+            timing_index = self._word_timing_index()
+            if len(timing_index):
+                # The word playing now, or the last one started before now
+                current_word_index = timing_index.index_at_time(current_time)
+
+                if current_word_index >= 0:
+                    word_info = timing_index[current_word_index]
                     if "position" in word_info:
                         # Store the position for resuming playback
                         self.last_highlighted_position = word_info["position"]
@@ -1117,10 +1142,9 @@ class MainWindow(QMainWindow):
                         self.text_display.setTextCursor(scroll_cursor)
                         self.text_display.ensureCursorVisible()
 
-                        # Print debug info occasionally
-                        if current_word_index % 10 == 0:
-                            print(f"Highlighting word at index {current_word_index}, position {self.last_highlighted_position}, time {current_time:.2f}s")
-                            print(f"Sentence: '{current_text[sentence_start:sentence_end]}'")
+                        logger.debug("Highlighting word at index %d, position %d, time %.2fs: %r",
+                                     current_word_index, self.last_highlighted_position, current_time,
+                                     current_text[sentence_start:sentence_end])
             else:
                 # If no word timings, use a simpler approach based on playback progress
                 total_duration = self.media_player.duration() / 1000.0
@@ -1154,13 +1178,11 @@ class MainWindow(QMainWindow):
                     self.text_display.setTextCursor(scroll_cursor)
                     self.text_display.ensureCursorVisible()
 
-                    # Print debug info occasionally
-                    if int(current_time) % 5 == 0:
-                        print(f"Highlighting at estimated position {estimated_position}, time {current_time:.2f}s")
-                        print(f"Sentence: '{current_text[sentence_start:sentence_end]}'")
+                    logger.debug("Highlighting at estimated position %d, time %.2fs: %r", estimated_position,
+                                 current_time, current_text[sentence_start:sentence_end])
 
         except Exception as e:
-            print(f"Error in update_highlight: {str(e)}")
+            logger.warning("Error in update_highlight: %s", e)
             # Don't let highlighting errors crash the application
 
     def on_text_changed(self):
@@ -1207,14 +1229,23 @@ class MainWindow(QMainWindow):
         current_index = self.current_page_index
 
         # Define a function to preprocess a page
-        def preprocess_page(page_text, voice, speed):
+        def preprocess_page(page_text, voice, speed, priority, token):
             """Preprocess a page of text."""
             try:
+                if self.tts_engine.session_settings["batch_background"]:
+                    # Fill the synthesis cache; playing the page then reads every chunk from it
+                    self.tts_engine.prerender(page_text, voice=voice, speed=speed, token=token, priority=priority)
+                    return {
+                        "audio_path": None,
+                        "word_timings": []
+                    }
+
                 # Synthesize the page
                 audio_path, word_timings = self.tts_engine.synthesize(
                     page_text,
                     voice=voice,
-                    speed=speed
+                    speed=speed,
+                    priority=priority
                 )
                 return {
                     "audio_path": audio_path,
@@ -1229,20 +1260,31 @@ class MainWindow(QMainWindow):
         voice = tts_settings.get("voice", "af_sarah")
         speed = tts_settings.get("speed", 1.0)
 
+        # Work on pages the reader has moved away from is stale
+        for page_index in list(self.preprocess_tokens):
+            if abs(page_index - current_index) > 1:
+                self.preprocess_tokens.pop(page_index).cancel("navigated away")
+                self.preprocessed_pages.discard(page_index)
+
         # Preprocess the next page if available
         if current_index + 1 < len(self.pages) and current_index + 1 not in self.preprocessed_pages:
             next_page = self.pages[current_index + 1]
             task_id = f"page_{current_index + 1}"
 
-            # Add the task to the background processor
+            # Add the task to the background processor; a new text cancels it
+            token = self.background_processor.new_token()
+            self.preprocess_tokens[current_index + 1] = token
             self.background_processor.add_task(
                 task_id,
                 preprocess_page,
-                1,  # priority (higher priority for the next page)
+                Priority.NEXT_PAGE,
                 self.handle_preprocessed_page,  # callback
                 next_page,
                 voice,
-                speed
+                speed,
+                Priority.NEXT_PAGE,
+                token,
+                token=token
             )
 
             # Mark the page as being preprocessed
@@ -1254,15 +1296,20 @@ class MainWindow(QMainWindow):
             prev_page = self.pages[current_index - 1]
             task_id = f"page_{current_index - 1}"
 
-            # Add the task to the background processor
+            # Add the task to the background processor; a new text cancels it
+            token = self.background_processor.new_token()
+            self.preprocess_tokens[current_index - 1] = token
             self.background_processor.add_task(
                 task_id,
                 preprocess_page,
-                2,  # priority (lower priority for the previous page)
+                Priority.PREFETCH,
                 self.handle_preprocessed_page,  # callback
                 prev_page,
                 voice,
-                speed
+                speed,
+                Priority.PREFETCH,
+                token,
+                token=token
             )
 
             # Mark the page as being preprocessed
@@ -1305,6 +1352,15 @@ class MainWindow(QMainWindow):
                 else:
                     self.status_bar.showMessage("Text edited. Will re-synthesize on play.")
 
+                # Splice only the edited sentences into the paused audio when the engine can
+                if self._using_engine_playback() and self.current_page_index == self.playback_first_page:
+                    tts_settings = self.state_manager.get("tts_settings", {})
+                    if self.tts_engine.apply_edit(new_text, tts_settings.get("voice", "af_sarah"),
+                                                  tts_settings.get("speed", 1.0)):
+                        self.text_edited = False
+                        self.status_bar.showMessage("Text edited. Re-synthesized the changed sentences.")
+                        return
+
                 # Stop any existing progressive playback
                 if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
                     self.tts_engine.stop_requested = True
@@ -1327,7 +1383,7 @@ class MainWindow(QMainWindow):
             print("Pausing playback")
             try:
                 # Check if we're using progressive playback
-                using_progressive = hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive()
+                using_progressive = self._using_engine_playback()
 
                 if using_progressive:
                     # Directly set pause flag in the TTS engine for progressive playback
@@ -1359,7 +1415,7 @@ class MainWindow(QMainWindow):
                 # Store the current playback position
                 if using_progressive:
                     # For progressive playback, get position from TTS engine
-                    self.last_playback_position = self.tts_engine.current_position
+                    self.last_playback_position = self.tts_engine.position()
                     print(f"Stored progressive playback position: {self.last_playback_position}s")
                 else:
                     # For media player, get position in milliseconds and convert to seconds
@@ -1380,6 +1436,11 @@ class MainWindow(QMainWindow):
             # Check if the cursor was moved (rewind requested)
             cursor_moved = hasattr(self, 'last_cursor_position') and current_cursor_position != self.last_cursor_position
 
+            # Apply a pending edit now rather than when its timer fires
+            if self.text_edited and self.edit_timer.isActive():
+                self.edit_timer.stop()
+                self.handle_text_edit()
+
             # Check if text was edited
             if self.text_edited:
                 print("Text was edited, re-synthesizing")
@@ -1406,116 +1467,37 @@ class MainWindow(QMainWindow):
                 if word_at_cursor:
                     print(f"Word at cursor: '{word_at_cursor}'")
 
-                    # Find the position of this word in the text
-                    text_up_to_cursor = self.current_text[:current_cursor_position]
-                    word_index = len(text_up_to_cursor.split())
-
-                    # Find the corresponding time in the word timings
-                    # Check if we have word_timings_list from the TTS engine
-                    if hasattr(self.tts_engine, 'word_timings_list') and self.tts_engine.word_timings_list:
-                        if word_index < len(self.tts_engine.word_timings_list):
-                            # Use the list version for direct index access
-                            target_time = self.tts_engine.word_timings_list[word_index]["start"]
-                            print(f"Rewinding to time: {target_time:.2f}s (using word_timings_list at index {word_index})")
-                        else:
-                            # Try to find the closest word by position
-                            print(f"Word index {word_index} out of range, trying to find closest word by position")
-                            closest_word = None
-                            closest_distance = float('inf')
-
-                            for timing in self.tts_engine.word_timings_list:
-                                if "position" in timing:
-                                    distance = abs(timing["position"] - current_cursor_position)
-                                    if distance < closest_distance:
-                                        closest_distance = distance
-                                        closest_word = timing
-
-                            if closest_word:
-                                target_time = closest_word["start"]
-                                print(f"Found closest word at position {closest_word.get('position')}, time: {target_time:.2f}s")
-                            else:
-                                # If no word with position found, use the last word
-                                if self.tts_engine.word_timings_list:
-                                    target_time = self.tts_engine.word_timings_list[-1]["start"]
-                                    print(f"Using last word timing, time: {target_time:.2f}s")
-                                else:
-                                    print("No word timings available, starting from beginning")
-                                    target_time = 0.0
-                    # Otherwise try to find the closest position in the dictionary
-                    elif self.word_timings:
-                        try:
-                            # Get the position of this word in the text
-                            text_up_to_cursor = self.current_text[:current_cursor_position]
-                            print(f"Looking for position close to {current_cursor_position} in word_timings with {len(self.word_timings)} entries")
-
-                            # Get all positions as integers, ensuring they're valid
-                            try:
-                                positions = [int(float(pos)) for pos in self.word_timings.keys() if str(pos).strip()]
-                                print(f"Found {len(positions)} valid positions in word_timings")
-
-                                # Print some sample positions for debugging
-                                if positions:
-                                    sample_positions = positions[:5] if len(positions) > 5 else positions
-                                    print(f"Sample positions: {sample_positions}")
-                            except Exception as e:
-                                print(f"Error converting positions to integers: {str(e)}")
-                                positions = []
-
-                            # Find the closest position
-                            if positions:
-                                closest_pos = min(positions, key=lambda x: abs(x - current_cursor_position))
-                                # Convert to string to look up in the dictionary
-                                closest_pos_key = str(closest_pos)
-                                if closest_pos_key in self.word_timings:
-                                    target_time = float(self.word_timings[closest_pos_key])
-                                    print(f"Rewinding to time: {target_time:.2f}s (using closest position {closest_pos})")
-                                else:
-                                    # Try with float key
-                                    closest_pos_key = float(closest_pos)
-                                    if closest_pos_key in self.word_timings:
-                                        target_time = float(self.word_timings[closest_pos_key])
-                                        print(f"Rewinding to time: {target_time:.2f}s (using closest position {closest_pos})")
-                                    else:
-                                        print(f"Closest position {closest_pos} not found in word_timings, starting from beginning")
-                                        target_time = 0.0
-                            else:
-                                print("No positions available in word_timings, starting from beginning")
-                                target_time = 0.0
-                        except Exception as e:
-                            print(f"Error finding time for cursor position: {str(e)}")
-                            target_time = 0.0
-                    else:
+                    # Find the start time of the word under the cursor
+                    target_time = self._word_timing_index().time_at_char(current_cursor_position)
+                    if target_time is None:
                         print("No word timings available, starting from beginning")
                         target_time = 0.0
-
-                        # For progressive playback
-                        if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
-                            # Set the current position in the TTS engine
-                            self.tts_engine.current_position = target_time
-
-                            # Find the chunk containing this position
-                            chunk_index = self.tts_engine.find_chunk_for_position(target_time)
-                            if chunk_index >= 0:
-                                print(f"Rewinding to chunk {chunk_index}")
-                                self.tts_engine.rewind_to_chunk(chunk_index)
-
-                            # Resume playback
-                            self.tts_engine.pause_requested = False
-                            self.play_button.setIcon(self.pause_icon)
-                            self.text_display.setReadOnly(True)
-                            self.highlight_timer.start(250)  # Slower highlighting
-                            self.is_playing = True
-                            self.status_bar.showMessage(f"Rewound to position {format_time(target_time)}")
-                        else:
-                            # For media player playback
-                            position_ms = int(target_time * 1000)
-                            self.media_player.setPosition(position_ms)
-                            self.media_player.play()
-                            self.play_button.setIcon(self.pause_icon)
-                            self.text_display.setReadOnly(True)
-                            self.highlight_timer.start(250)  # Slower highlighting
-                            self.is_playing = True
-                            self.status_bar.showMessage(f"Rewound to position {format_time(target_time)}")
+                    else:
+                        print(f"Rewinding to time: {target_time:.2f}s (word at position {current_cursor_position})")
+
+                    # For progressive playback
+                    if self._using_engine_playback():
+                        # Continue from the exact sample at this position
+                        print(f"Seeking to {target_time}s")
+                        self.tts_engine.seek(target_time)
+
+                        # Resume playback
+                        self.tts_engine.pause_requested = False
+                        self.play_button.setIcon(self.pause_icon)
+                        self.text_display.setReadOnly(True)
+                        self.highlight_timer.start(250)  # Slower highlighting
+                        self.is_playing = True
+                        self.status_bar.showMessage(f"Rewound to position {format_time(target_time)}")
+                    else:
+                        # For media player playback
+                        position_ms = int(target_time * 1000)
+                        self.media_player.setPosition(position_ms)
+                        self.media_player.play()
+                        self.play_button.setIcon(self.pause_icon)
+                        self.text_display.setReadOnly(True)
+                        self.highlight_timer.start(250)  # Slower highlighting
+                        self.is_playing = True
+                        self.status_bar.showMessage(f"Rewound to position {format_time(target_time)}")
                 else:
                     print("Could not find word timing for rewind position")
                     # Just start normal playback
@@ -1562,7 +1544,7 @@ class MainWindow(QMainWindow):
                 # We'll convert this to a time position later in the method
 
             # If we're using progressive playback
-            if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
+            if self._using_engine_playback():
                 print("Resuming progressive playback")
 
                 # Determine which position to use - prioritize cursor position if available
@@ -1573,74 +1555,19 @@ class MainWindow(QMainWindow):
                     cursor_pos = self.text_display.textCursor().position()
                     print(f"Using cursor position for progressive playback: {cursor_pos}")
 
-                    # Try to find the corresponding time position if we have word timings
-                    if self.word_timings:
-                        try:
-                            # Handle different types of word_timings
-                            if isinstance(self.word_timings, dict):
-                                # Convert keys to integers for comparison
-                                positions = []
-                                for pos_key in self.word_timings.keys():
-                                    try:
-                                        positions.append(int(float(pos_key)))
-                                    except (ValueError, TypeError):
-                                        pass
-
-                                if positions:
-                                    closest_pos = min(positions, key=lambda x: abs(x - cursor_pos))
-                                    closest_pos_key = str(closest_pos)
-
-                                    if closest_pos_key in self.word_timings:
-                                        time_sec = float(self.word_timings[closest_pos_key])
-                                        print(f"Setting playback position to {time_sec}s based on cursor at position {cursor_pos}")
-
-                                        # Set the position in the TTS engine
-                                        self.tts_engine.set_position(time_sec)
-                                        self.last_playback_position = time_sec
-
-                                        # Find the chunk containing this position
-                                        chunk_index = self.tts_engine.find_chunk_for_position(time_sec)
-                                        if chunk_index >= 0:
-                                            print(f"Resuming from chunk {chunk_index}")
-                                            self.tts_engine.rewind_to_chunk(chunk_index)
-                            elif isinstance(self.word_timings, list):
-                                # Find the closest position in the list
-                                closest_timing = None
-                                closest_distance = float('inf')
-
-                                for timing in self.word_timings:
-                                    if isinstance(timing, dict) and "position" in timing:
-                                        distance = abs(timing["position"] - cursor_pos)
-                                        if distance < closest_distance:
-                                            closest_distance = distance
-                                            closest_timing = timing
-
-                                if closest_timing and "start" in closest_timing:
-                                    time_sec = closest_timing["start"]
-                                    print(f"Setting playback position to {time_sec}s based on cursor at position {cursor_pos}")
-
-                                    # Set the position in the TTS engine
-                                    self.tts_engine.set_position(time_sec)
-                                    self.last_playback_position = time_sec
-
-                                    # Find the chunk containing this position
-                                    chunk_index = self.tts_engine.find_chunk_for_position(time_sec)
-                                    if chunk_index >= 0:
-                                        print(f"Resuming from chunk {chunk_index}")
-                                        self.tts_engine.rewind_to_chunk(chunk_index)
-                        except Exception as e:
-                            print(f"Error setting position from cursor: {str(e)}")
+                    # Find the corresponding time position if we have word timings
+                    time_sec = self._word_timing_index().time_at_char(cursor_pos)
+                    if time_sec is not None:
+                        print(f"Setting playback position to {time_sec}s based on cursor at position {cursor_pos}")
+
+                        # Continue from the exact sample at this position
+                        self.tts_engine.seek(time_sec)
+                        self.last_playback_position = time_sec
                 # Otherwise, check if we have a saved playback position
                 elif hasattr(self, 'last_playback_position') and self.last_playback_position > 0:
-                    # Set the position in the TTS engine
+                    # Continue from the exact sample at this position
                     print(f"Resuming from saved position: {self.last_playback_position}s")
-                    self.tts_engine.set_position(self.last_playback_position)
-
-                    # Find the chunk containing this position
-                    chunk_index = self.tts_engine.find_chunk_for_position(self.last_playback_position)
-                    if chunk_index >= 0:
-                        print(f"Resuming from chunk {chunk_index}")
-                        self.tts_engine.rewind_to_chunk(chunk_index)
+                    self.tts_engine.seek(self.last_playback_position)
 
                 # Resume the paused playback
                 self.tts_engine.pause_requested = False  # Directly set to False to ensure it's not paused
@@ -1668,43 +1595,10 @@ class MainWindow(QMainWindow):
                     elif hasattr(self, 'last_playback_position') and self.last_playback_position > 0:
                         print(f"Using saved position for synthesis: {self.last_playback_position}s")
                         # Find the cursor position corresponding to this time
-                        if self.word_timings:
-                            # Check if word_timings is a dictionary or a list
-                            if isinstance(self.word_timings, dict):
-                                print(f"Word timings is a dictionary with {len(self.word_timings)} entries")
-                                # Try to find the position closest to the saved time
-                                closest_time = None
-                                closest_pos = None
-                                for pos, time in self.word_timings.items():
-                                    try:
-                                        time_val = float(time)
-                                        if closest_time is None or abs(time_val - self.last_playback_position) < abs(closest_time - self.last_playback_position):
-                                            closest_time = time_val
-                                            closest_pos = int(float(pos))
-                                    except (ValueError, TypeError):
-                                        continue
-
-                                if closest_pos is not None:
-                                    start_pos = closest_pos
-                                    print(f"Found cursor position {start_pos} for time {closest_time}s")
-                            elif isinstance(self.word_timings, list):
-                                print(f"Word timings is a list with {len(self.word_timings)} entries")
-                                # Handle list-type word timings
-                                closest_time = None
-                                closest_pos = None
-                                for item in self.word_timings:
-                                    if isinstance(item, dict) and "start" in item and "position" in item:
-                                        time_val = item["start"]
-                                        pos = item["position"]
-                                        if closest_time is None or abs(time_val - self.last_playback_position) < abs(closest_time - self.last_playback_position):
-                                            closest_time = time_val
-                                            closest_pos = pos
-
-                                if closest_pos is not None:
-                                    start_pos = closest_pos
-                                    print(f"Found cursor position {start_pos} for time {closest_time}s")
-                            else:
-                                print(f"Word timings is of unsupported type: {type(self.word_timings)}")
+                        position = self.timing_index.char_at_time(self.last_playback_position)
+                        if position is not None:
+                            start_pos = position
+                            print(f"Found cursor position {start_pos} for time {self.last_playback_position}s")
 
                     self.synthesize_speech(start_position=start_pos)
                 else:
@@ -1713,7 +1607,7 @@ class MainWindow(QMainWindow):
                     # Determine which position to use - prioritize cursor position if available
                     use_cursor_position = (self.last_playback_position == 0 or self.cursor_manually_moved)
 
-                    if use_cursor_position and self.word_timings and cursor_pos > 0:
+                    if use_cursor_position and len(self.timing_index) and cursor_pos > 0:
                         print(f"Using cursor position for media playback: {cursor_pos}")
                         # Reset the flag
                         self.cursor_manually_moved = False
@@ -1725,95 +1619,11 @@ class MainWindow(QMainWindow):
                         print(f"Resuming from saved position: {self.last_playback_position}s ({time_ms}ms)")
                         self.media_player.setPosition(time_ms)
                     # Otherwise, set the position based on the cursor position if possible
-                    elif self.word_timings and cursor_pos > 0:
-                        try:
-                            # Find the closest word timing to the cursor position
-                            print(f"Looking for closest position to cursor position {cursor_pos} in word_timings with {len(self.word_timings)} entries")
-
-                            # Check if word_timings is a dictionary or a list
-                            positions = []
-                            if isinstance(self.word_timings, dict):
-                                # Get all positions as integers, ensuring they're valid
-                                try:
-                                    positions = [int(float(pos)) for pos in self.word_timings.keys() if str(pos).strip()]
-                                    print(f"Found {len(positions)} valid positions in word_timings dictionary")
-
-                                    # Print some sample positions for debugging
-                                    if positions:
-                                        sample_positions = positions[:5] if len(positions) > 5 else positions
-                                        print(f"Sample positions: {sample_positions}")
-                                except Exception as e:
-                                    print(f"Error converting positions to integers: {str(e)}")
-                                    positions = []
-                            elif isinstance(self.word_timings, list):
-                                # Handle list-type word timings
-                                try:
-                                    positions = []
-                                    for item in self.word_timings:
-                                        if isinstance(item, dict) and "position" in item:
-                                            positions.append(item["position"])
-
-                                    print(f"Found {len(positions)} valid positions in word_timings list")
-
-                                    # Print some sample positions for debugging
-                                    if positions:
-                                        sample_positions = positions[:5] if len(positions) > 5 else positions
-                                        print(f"Sample positions: {sample_positions}")
-                                except Exception as e:
-                                    print(f"Error extracting positions from list: {str(e)}")
-                                    positions = []
-                            else:
-                                print(f"Word timings is of unsupported type: {type(self.word_timings)}")
-                                positions = []
-
-                            # Find the closest position
-                            if positions:
-                                closest_pos = min(positions, key=lambda x: abs(x - cursor_pos))
-                                time_ms = 0
-
-                                # Handle different types of word_timings
-                                if isinstance(self.word_timings, dict):
-                                    # Convert to string to look up in the dictionary
-                                    closest_pos_key = str(closest_pos)
-                                    if closest_pos_key in self.word_timings:
-                                        time_ms = int(float(self.word_timings[closest_pos_key]) * 1000)
-                                        print(f"Setting playback position to {time_ms}ms based on cursor at position {cursor_pos} (closest position: {closest_pos})")
-                                    else:
-                                        # Try with float key
-                                        closest_pos_key = float(closest_pos)
-                                        if closest_pos_key in self.word_timings:
-                                            time_ms = int(float(self.word_timings[closest_pos_key]) * 1000)
-                                            print(f"Setting playback position to {time_ms}ms based on cursor at position {cursor_pos} (closest position: {closest_pos})")
-                                        else:
-                                            print(f"Closest position {closest_pos} not found in word_timings dictionary")
-                                            # Start from the beginning
-                                            time_ms = 0
-                                elif isinstance(self.word_timings, list):
-                                    # Find the item with the matching position
-                                    for item in self.word_timings:
-                                        if isinstance(item, dict) and "position" in item and item["position"] == closest_pos:
-                                            if "start" in item:
-                                                time_ms = int(float(item["start"]) * 1000)
-                                                print(f"Setting playback position to {time_ms}ms based on cursor at position {cursor_pos} (closest position: {closest_pos})")
-                                                break
-
-                                    if time_ms == 0:
-                                        print(f"Closest position {closest_pos} not found in word_timings list")
-
-                                # Set the position
-                                if time_ms > 0:
-                                    self.media_player.setPosition(time_ms)
-                                else:
-                                    # Start from the beginning
-                                    self.media_player.setPosition(0)
-                            else:
-                                print("No valid positions available in word_timings")
-                                # Start from the beginning
-                                self.media_player.setPosition(0)
-                        except Exception as e:
-                            print(f"Error finding closest position: {str(e)}")
-                            # Start from the beginning if there's an error
-                            self.media_player.setPosition(0)
+                    elif len(self.timing_index) and cursor_pos > 0:
+                        # Start from the word at the cursor position
+                        time_ms = int(self.timing_index.time_at_char(cursor_pos) * 1000)
+                        print(f"Setting playback position to {time_ms}ms based on cursor at position {cursor_pos}")
+                        self.media_player.setPosition(time_ms)
 
                     # Check if the audio file exists and is valid
                     if self.current_audio_path and os.path.exists(self.current_audio_path):
@@ -1840,8 +1650,11 @@ class MainWindow(QMainWindow):
                         self.status_bar.showMessage("Error: Audio file not found")
                         return
 
-                    # Use the media player for non-progressive playback
+                    # Use the media player for non-progressive playback; the engine renders at
+                    # normal speed when it time-stretches, so play the file at the set speed
                     print("Starting media player playback...")
+                    speed = self.state_manager.get("tts_settings", {}).get("speed", 1.0)
+                    self.media_player.setPlaybackRate(self.tts_engine.playback_rate(self.current_audio_path, speed))
                     self.media_player.play()
 
                     # Give it a moment to start
@@ -1897,9 +1710,9 @@ class MainWindow(QMainWindow):
             return
 
         # Get current position
-        if hasattr(self, 'synthesis_thread') and self.synthesis_thread and self.synthesis_thread.is_alive():
+        if self._using_engine_playback():
             # For progressive playback, use the TTS engine's current position
-            current_position = self.tts_engine.current_position
+            current_position = self.tts_engine.position()
         else:
             # For media player playback, convert from milliseconds to seconds
             current_position = self.media_player.position() / 1000
@@ -2064,6 +1877,12 @@ class MainWindow(QMainWindow):
         # Clear audio path
         self.current_audio_path = None
 
+        # Drop pending page preprocessing, and allow it to run again
+        self.background_processor.cancel_all("cache cleared")
+        self.background_processor.clear_cache()
+        self.preprocessed_pages.clear()
+        self.preprocess_tokens.clear()
+
         # Clear the TTS engine's cache
         self.tts_engine.clear_all_cache()
 
@@ -2086,31 +1905,8 @@ class MainWindow(QMainWindow):
         # Store the full text in the virtual text display
         self.text_display.full_text = text
 
-        # Split into pages
-        self.pages = []
-
-        # Try to split at paragraph boundaries
-        paragraphs = text.split('\n\n')
-        current_page = ""
-
-        for paragraph in paragraphs:
-            # If adding this paragraph would exceed the page size, start a new page
-            if len(current_page) + len(paragraph) + 2 > self.page_size and current_page:
-                self.pages.append(current_page)
-                current_page = paragraph
-            else:
-                if current_page:
-                    current_page += '\n\n' + paragraph
-                else:
-                    current_page = paragraph
-
-        # Add the last page if it's not empty
-        if current_page:
-            self.pages.append(current_page)
-
-        # If no pages were created, create at least one
-        if not self.pages:
-            self.pages = [text]
+        # Split into pages at paragraph boundaries
+        self.pages = split_text_into_pages(text, self.page_size)
 
         # Reset current page index
         self.current_page_index = 0
@@ -2121,8 +1917,11 @@ class MainWindow(QMainWindow):
         # Update navigation buttons
         self.update_navigation_buttons()
 
-        # Clear the preprocessed pages set
+        # Pages of the previous text are no longer needed
+        self.background_processor.cancel_all("new text")
+        self.background_processor.clear_cache()
         self.preprocessed_pages.clear()
+        self.preprocess_tokens.clear()
 
         # Start preprocessing nearby pages
         self.preprocess_nearby_pages()
@@ -2147,6 +1946,38 @@ class MainWindow(QMainWindow):
         self.last_playback_position = 0
         print("Playback position reset")
 
+    def _advance_page_view(self, page_index):
+        """
+        Show another page while playback continues on it.
+
+        Args:
+            page_index: Index of the page that is playing.
+        """
+        self.current_page_index = page_index
+
+        # Calculate the start position of this page in the full text
+        page_start = 0
+        for i in range(self.current_page_index):
+            page_start += len(self.pages[i])
+
+        # Set the page text with position information
+        self.text_display.set_page_text(self.pages[page_index], page_start)
+
+        # Highlighting starts over on the new page
+        self.last_highlighted_position = 0
+        if hasattr(self, 'last_highlighted_index'):
+            delattr(self, 'last_highlighted_index')
+
+        # Update page label and navigation buttons
+        self.update_page_label()
+        self.update_navigation_buttons()
+
+        # Trigger preprocessing of nearby pages
+        self.preprocess_nearby_pages()
+
+        # Update status
+        self.status_bar.showMessage(f"Reading page {self.current_page_index + 1} of {len(self.pages)}")
+
     def go_to_previous_page(self):
         """Go to the previous page."""
         if self.current_page_index > 0:
@@ -2185,7 +2016,7 @@ class MainWindow(QMainWindow):
                 print(f"Using preprocessed content for page {self.current_page_index}")
                 # We have preprocessed content, use it
                 self.current_audio_path = preprocessed_result.get("audio_path")
-                self.word_timings = preprocessed_result.get("word_timings")
+                self.timing_index = WordTimingIndex(preprocessed_result.get("word_timings") or [])
 
             # Update text display with the page content
             page_text = self.pages[self.current_page_index]
@@ -2246,7 +2077,7 @@ class MainWindow(QMainWindow):
                 print(f"Using preprocessed content for page {self.current_page_index}")
                 # We have preprocessed content, use it
                 self.current_audio_path = preprocessed_result.get("audio_path")
-                self.word_timings = preprocessed_result.get("word_timings")
+                self.timing_index = WordTimingIndex(preprocessed_result.get("word_timings") or [])
 
             # Update text display with the page content
             page_text = self.pages[self.current_page_index]
@@ -2271,7 +2102,17 @@ class MainWindow(QMainWindow):
 
     def show_settings(self):
         """Show the settings dialog."""
+        old_tts_settings = dict(self.state_manager.get("tts_settings", {}))
         dialog = SettingsDialog(self.state_manager, self)
         if dialog.exec():
+            self.tts_engine.set_session_settings(self.state_manager.get("onnx_settings"))
+
+            # A new speed alone is applied to the audio already playing
+            tts_settings = self.state_manager.get("tts_settings", {})
+            speed_only = {k: v for k, v in tts_settings.items() if k != "speed"} == \
+                {k: v for k, v in old_tts_settings.items() if k != "speed"}
+            if speed_only and self._using_engine_playback() and self.tts_engine.set_speed(tts_settings.get("speed", 1.0)):
+                return
+
             # Settings were changed, update as needed
             self.synthesize_speech()
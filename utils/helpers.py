@@ -91,3 +91,37 @@ def split_text_into_chunks(text: str, max_length: int = 1000) -> List[str]:
         chunks.append(current_chunk)
     
     return chunks
+
+
+def split_text_into_pages(text: str, page_size: int = 5000) -> List[str]:
+    """
+    Split text into pages at paragraph boundaries, the way the reader pages a book.
+    
+    Args:
+        text: The text to split.
+        page_size: Maximum number of characters per page, unless a single
+                   paragraph is longer.
+        
+    Returns:
+        List of text pages. Always contains at least one page.
+    """
+    pages = []
+    current_page = ""
+    
+    for paragraph in text.split('\n\n'):
+        # If adding this paragraph would exceed the page size, start a new page
+        if len(current_page) + len(paragraph) + 2 > page_size and current_page:
+            pages.append(current_page)
+            current_page = paragraph
+        else:
+            if current_page:
+                current_page += '\n\n' + paragraph
+            else:
+                current_page = paragraph
+    
+    # Add the last page if it's not empty
+    if current_page:
+        pages.append(current_page)
+    
+    # If no pages were created, create at least one
+    return pages or [text]
@@ -0,0 +1,46 @@
+"""
+Playback signal utilities for the Audiobook Reader application.
+Exposes the TTS engine's playback clock as a Qt signal.
+"""
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class PlaybackClock(QObject):
+    """
+    Polls the TTS engine's playback clock on the Qt event loop and emits
+    the position whenever it changes.
+    """
+    position_changed = pyqtSignal(float)
+
+    def __init__(self, tts_engine, interval_ms: int = 100, parent: QObject = None):
+        """
+        Initialize the playback clock.
+
+        Args:
+            tts_engine: Engine providing a thread-safe position() method.
+            interval_ms: Polling interval in milliseconds.
+            parent: Parent object.
+        """
+        super().__init__(parent)
+        self.tts_engine = tts_engine
+        self.last_position = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        """Start emitting position updates."""
+        self.timer.start()
+
+    def stop(self):
+        """Stop emitting position updates."""
+        self.timer.stop()
+
+    def poll(self):
+        """Read the engine clock and emit the position if it moved."""
+        position = self.tts_engine.position()
+        if position != self.last_position:
+            self.last_position = position
+            self.position_changed.emit(position)